@@ -0,0 +1,138 @@
+"""
+Solves saved .mv projects without the GUI and writes one summary row per
+project, as JSON lines or CSV.
+
+    python -m batch designs/ other.mv --format csv --output results.csv
+
+Directories are searched for .mv files. Projects are solved in parallel and
+the rows are written in the order the projects were given. The exit code is
+1 if any project couldn't be solved.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import project
+from sweep import SUMMARY_FIELDS, evaluate
+
+JSON_LINES = 'jsonl'
+CSV = 'csv'
+
+HEADER = ('file', 'drive') + SUMMARY_FIELDS + ('error',)
+
+
+def find_projects(paths):
+    """
+    :param list[str] paths: .mv files and directories of them.
+    :return: A list of the .mv files, with each directory's in name order.
+    """
+
+    projects = []
+    for path in paths:
+        if os.path.isdir(path):
+            projects.extend(sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.mv')))
+        else:
+            projects.append(path)
+
+    return projects
+
+
+def evaluate_project(path, plot_steps=16):
+    """
+    Solves a project. Runs in a worker process.
+
+    :param str path: The .mv file.
+    :param int plot_steps: The steps of the grid the rig is solved on.
+    :return: A dict of the file, its drive, the summary values and an error
+    message, which is empty if the project solved.
+    """
+
+    row = {'file': path, 'drive': ''}
+    try:
+        info = project.load(path)
+        row['drive'] = project.project_drive(info)
+        kwargs = project.rig_kwargs(info)
+    except (OSError, ValueError, KeyError) as e:
+        row.update({field: math.nan for field in SUMMARY_FIELDS})
+        row['error'] = f'{type(e).__name__}: {e}'
+        return row
+
+    kwargs['plot_steps'] = plot_steps
+    row.update(evaluate(kwargs, {}))
+
+    return row
+
+
+def run(paths, output, output_format=JSON_LINES, workers=None, plot_steps=16):
+    """
+    Solves projects and writes their rows as each one finishes, in order.
+
+    :param list[str] paths: .mv files and directories of them.
+    :param file output: The text file to write to.
+    :param str output_format: JSON_LINES or CSV.
+    :param int workers: The number of processes. Defaults to one per CPU.
+    1 solves everything in this process.
+    :param int plot_steps: The steps of the grid each rig is solved on.
+    :return: The number of projects that couldn't be solved.
+    """
+
+    if output_format not in (JSON_LINES, CSV):
+        raise ValueError(f'Unknown format {output_format!r}.')
+
+    projects = find_projects(paths)
+
+    if output_format == CSV:
+        writer = csv.writer(output)
+        writer.writerow(HEADER)
+
+    workers = min(workers or os.cpu_count() or 1, max(len(projects), 1))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    failed = 0
+    try:
+        if executor is None:
+            rows = (evaluate_project(path, plot_steps) for path in projects)
+        else:
+            # a few chunks per process, so hundreds of small projects don't each pay for a round trip
+            chunksize = max(1, len(projects) // (4 * workers))
+            rows = executor.map(evaluate_project, projects, [plot_steps] * len(projects), chunksize=chunksize)
+
+        for row in rows:
+            failed += bool(row['error'])
+            if output_format == CSV:
+                writer.writerow([row[field] for field in HEADER])
+            else:
+                # NaN isn't valid JSON
+                output.write(json.dumps({field: None if isinstance(row[field], float) and math.isnan(row[field])
+                                         else row[field] for field in HEADER}) + '\n')
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m batch', description='Solves saved MotionVisualizer projects.')
+    parser.add_argument('paths', nargs='+', help='.mv files and directories of them')
+    parser.add_argument('--format', choices=(JSON_LINES, CSV), default=JSON_LINES, dest='output_format')
+    parser.add_argument('--output', '-o', help='the file to write, instead of stdout')
+    parser.add_argument('--workers', '-j', type=int, help='the number of processes, one per CPU by default')
+    parser.add_argument('--plot-steps', type=int, default=16, help='the steps of the grid, must be even')
+    args = parser.parse_args(argv)
+
+    if args.output is None:
+        failed = run(args.paths, sys.stdout, args.output_format, args.workers, args.plot_steps)
+    else:
+        with open(args.output, 'w', newline='') as f:
+            failed = run(args.paths, f, args.output_format, args.workers, args.plot_steps)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
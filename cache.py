@@ -0,0 +1,163 @@
+"""
+A cache, on disk, of solved Rig kinematics.
+
+Each entry is keyed by a hash of the Rig's geometry and the solver version,
+and is stored as a folder of .npy files that are memory mapped when loaded.
+The least recently used entries are deleted once the cache gets too big.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from rig import RigKinematics
+
+SOLVER_VERSION = 1  # bump whenever a change to the solver changes its results
+
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+
+ARRAYS = ('positions1', 'positions2',
+          'rod_mounts1', 'rod_mounts2',
+          'pitch_ratios', 'roll_ratios',
+          'pitch', 'roll', 'pushrod_arms')
+
+
+def user_cache_dir():
+    """
+    Gets the folder the cache goes in by default.
+
+    :return: The path.
+    """
+
+    if os.name == 'nt':
+        root = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    else:
+        root = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+
+    return os.path.join(root, 'MotionVisualizer')
+
+
+def geometry_key(geometry):
+    """
+    Hashes a Rig's geometry.
+
+    :param dict geometry: Rig.geometry.
+    :return: A hex string that's the same for equal geometries and solver versions.
+    """
+
+    text = json.dumps({'solver_version': SOLVER_VERSION, 'geometry': geometry},
+                      sort_keys=True, separators=(',', ':'))
+
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class KinematicsCache:
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param str path: The folder to keep the cache in. Defaults to user_cache_dir().
+        :param int max_bytes: The most space the entries can take up.
+        """
+
+        self.root = path or user_cache_dir()
+        self.path = os.path.join(self.root, f'kinematics_v{SOLVER_VERSION}')
+        self.max_bytes = max_bytes
+
+    def load(self, geometry):
+        """
+        Gets the solved kinematics of a geometry, if they're cached.
+
+        The arrays are read only memory maps.
+
+        :param dict geometry: Rig.geometry.
+        :return: A RigKinematics, or None if the geometry isn't cached.
+        """
+
+        entry = os.path.join(self.path, geometry_key(geometry))
+        try:
+            with open(os.path.join(entry, 'meta.json')) as f:
+                meta = json.load(f)
+            arrays = {name: np.load(os.path.join(entry, f'{name}.npy'), mmap_mode='r') for name in ARRAYS}
+            os.utime(entry)  # marks it as recently used
+        except (OSError, ValueError):
+            # including when another thread or process evicts it part way through
+            return None
+
+        shape = tuple(meta['shape']) if meta['shape'] is not None else None
+        end_stop_angles = meta.get('end_stop_angles')
+        end_stop_angles = tuple(end_stop_angles) if end_stop_angles is not None else None
+        return RigKinematics(shape=shape, end_stop_angles=end_stop_angles, **arrays)
+
+    def store(self, geometry, kinematics):
+        """
+        Adds solved kinematics to the cache, then deletes the least recently
+        used entries if the cache is too big.
+
+        :param dict geometry: Rig.geometry.
+        :param RigKinematics kinematics: The solution.
+        :return: None
+        """
+
+        os.makedirs(self.path, exist_ok=True)
+        entry = os.path.join(self.path, geometry_key(geometry))
+        if os.path.isdir(entry):
+            return
+
+        # written to the side and renamed so a half written entry is never loaded
+        temp = tempfile.mkdtemp(dir=self.path, prefix='.tmp')
+        try:
+            for name in ARRAYS:
+                np.save(os.path.join(temp, f'{name}.npy'), np.asarray(getattr(kinematics, name)))
+            with open(os.path.join(temp, 'meta.json'), 'w') as f:
+                json.dump({'solver_version': SOLVER_VERSION, 'geometry': geometry, 'shape': kinematics.shape,
+                           'end_stop_angles': kinematics.end_stop_angles}, f)
+            os.rename(temp, entry)
+        except OSError:
+            shutil.rmtree(temp, ignore_errors=True)
+            return
+
+        self._evict()
+
+    def _evict(self):
+        """
+        Deletes entries from older solver versions, and the least recently
+        used entries until the cache fits in self.max_bytes.
+
+        :return: None
+        """
+
+        for name in os.listdir(self.root):
+            if name.startswith('kinematics_v') and os.path.join(self.root, name) != self.path:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+        entries = []
+        for name in os.listdir(self.path):
+            entry = os.path.join(self.path, name)
+            if name.startswith('.') or not os.path.isdir(entry):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(entry))
+                entries.append((os.stat(entry).st_mtime, size, entry))
+            except OSError:
+                continue  # evicted by another process meanwhile
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            # an entry that's still memory mapped can't be deleted on Windows, so it still counts
+            shutil.rmtree(entry, ignore_errors=True)
+            if not os.path.exists(entry):
+                total -= size
+
+    def clear(self):
+        """
+        Deletes every entry.
+
+        :return: None
+        """
+
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,196 @@
+"""
+Writes the per point results of a Rig, every field of RigResults as a column,
+for analysis elsewhere.
+
+Formats:
+CSV: text, written in chunks of rows.
+COLUMNAR: one binary file of a JSON header followed by each column's raw
+float64 values, aligned so that read_columnar can memory map them.
+NPY: a folder with one .npy file per column, which np.load can memory map.
+ARROW: an Arrow IPC file, for pyarrow, polars or pandas. Needs pyarrow.
+
+Every format is written straight from RigResults.data, where each field is
+already a contiguous row, so nothing is done a point at a time in Python.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from rig import RigResults
+
+CSV = 'csv'
+COLUMNAR = 'columnar'
+NPY = 'npy'
+ARROW = 'arrow'
+
+EXTENSIONS = {'.csv': CSV, '.mvcol': COLUMNAR, '.arrow': ARROW, '.feather': ARROW}
+
+CSV_CHUNK = 65536  # rows formatted at a time
+CSV_FORMAT = '%.17g'  # enough digits to read back the same float
+
+COLUMNAR_MAGIC = b'MVCOL\x01\n'
+COLUMNAR_ALIGNMENT = 64
+
+
+def _metadata(results):
+    return {'fields': list(RigResults.FIELDS), 'rows': len(results), 'dtype': '<f8',
+            'shape': list(results.shape) if results.shape is not None else None}
+
+
+def write_csv(results, path, chunk=CSV_CHUNK):
+    """
+    Writes the results as CSV with a header row.
+
+    Each chunk of rows is formatted with a single % operation.
+
+    :param RigResults results: The results.
+    :param str path: The file.
+    :param int chunk: The number of rows formatted at a time.
+    :return: None
+    """
+
+    line = ','.join([CSV_FORMAT] * len(RigResults.FIELDS)) + '\n'
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(RigResults.FIELDS) + '\n')
+        for start in range(0, len(results), chunk):
+            block = results.data[:, start:start + chunk]
+            f.write((line * block.shape[1]) % tuple(block.T.ravel().tolist()))
+
+
+def _align(size):
+    return -(-size // COLUMNAR_ALIGNMENT) * COLUMNAR_ALIGNMENT
+
+
+def write_columnar(results, path):
+    """
+    Writes the results as one binary file of columns.
+
+    The file is COLUMNAR_MAGIC, the header's length as a little endian
+    uint32, and the JSON header, with the fields, number of rows, dtype and
+    grid shape. Then each column follows in turn, the first starting at the
+    next multiple of COLUMNAR_ALIGNMENT bytes and each one padded to a
+    multiple of it.
+
+    :param RigResults results: The results.
+    :param str path: The file.
+    :return: None
+    """
+
+    data = np.ascontiguousarray(results.data, dtype='<f8')
+    header = json.dumps(dict(_metadata(results), alignment=COLUMNAR_ALIGNMENT)).encode()
+    padding = b'\0' * (_align(data.shape[1] * data.itemsize) - data.shape[1] * data.itemsize)
+
+    with open(path, 'wb') as f:
+        f.write(COLUMNAR_MAGIC)
+        f.write(len(header).to_bytes(4, 'little'))
+        f.write(header)
+        f.write(b'\0' * (_align(f.tell()) - f.tell()))
+        for column in data:
+            f.write(column.data)
+            f.write(padding)
+
+
+def read_columnar(path):
+    """
+    :param str path: A file written by write_columnar.
+    :return: A dict of each field's values, as read only memory maps, and the
+    grid shape, or None, under 'shape'.
+    """
+
+    with open(path, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f'{path} is not a columnar results file.')
+        header = json.loads(f.read(int.from_bytes(f.read(4), 'little')))
+        start = f.tell()
+
+    alignment = header['alignment']
+    start = -(-start // alignment) * alignment
+    stride = -(-header['rows'] * np.dtype(header['dtype']).itemsize // alignment) * alignment
+
+    columns = {name: np.memmap(path, dtype=header['dtype'], mode='r', offset=start + i * stride,
+                               shape=(header['rows'],))
+               for i, name in enumerate(header['fields'])}
+    columns['shape'] = tuple(header['shape']) if header['shape'] is not None else None
+
+    return columns
+
+
+def write_npy(results, path):
+    """
+    Writes the results as a folder with a .npy file for each field and a
+    meta.json with the fields and grid shape.
+
+    :param RigResults results: The results.
+    :param str path: The folder. It's made if it doesn't exist.
+    :return: None
+    """
+
+    os.makedirs(path, exist_ok=True)
+    for name in RigResults.FIELDS:
+        np.save(os.path.join(path, f'{name}.npy'), results[name])
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(_metadata(results), f)
+
+
+def read_npy(path):
+    """
+    :param str path: A folder written by write_npy.
+    :return: A dict of each field's values, as read only memory maps, and the
+    grid shape, or None, under 'shape'.
+    """
+
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+
+    columns = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in meta['fields']}
+    columns['shape'] = tuple(meta['shape']) if meta['shape'] is not None else None
+
+    return columns
+
+
+def write_arrow(results, path):
+    """
+    Writes the results as an Arrow IPC file. The grid shape is kept in the
+    schema's metadata.
+
+    The Arrow columns share the results' memory rather than copying it.
+
+    :param RigResults results: The results.
+    :param str path: The file.
+    :return: None
+    """
+
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError('Arrow export needs pyarrow, pip install pyarrow, or use the NPY format.') from None
+
+    table = pa.table({name: pa.array(results[name]) for name in RigResults.FIELDS})
+    table = table.replace_schema_metadata({'shape': json.dumps(results.shape)})
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+WRITERS = {CSV: write_csv, COLUMNAR: write_columnar, NPY: write_npy, ARROW: write_arrow}
+
+
+def export(results, path, output_format=None):
+    """
+    Writes the results in any format.
+
+    :param RigResults results: The results.
+    :param str path: The file, or folder for NPY.
+    :param str output_format: CSV, COLUMNAR, NPY or ARROW. Defaults to the
+    format of the path's extension, or NPY if it doesn't have one of
+    EXTENSIONS.
+    :return: None
+    """
+
+    if output_format is None:
+        output_format = EXTENSIONS.get(os.path.splitext(path)[1].lower(), NPY)
+    if output_format not in WRITERS:
+        raise ValueError(f'Unknown format {output_format!r}.')
+
+    WRITERS[output_format](results, path)
@@ -0,0 +1,269 @@
+"""
+A light renderer for the output plots that draws them straight into a QImage,
+as a faster alternative to matplotlib.
+
+The points are coloured with a viridis lookup table and stamped into the
+image's pixels with NumPy, and the axes, ticks, titles and colorbars are
+drawn over them with QPainter.
+"""
+
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QFont, QImage, QPainter
+
+# viridis at 33 evenly spaced points, interpolated to the full table below
+VIRIDIS = np.array([(68, 1, 84), (71, 13, 96), (72, 24, 106), (72, 35, 116),
+                    (71, 45, 123), (69, 55, 129), (66, 64, 134), (62, 73, 137),
+                    (59, 82, 139), (55, 91, 141), (51, 99, 141), (47, 107, 142),
+                    (44, 114, 142), (41, 122, 142), (38, 130, 142), (35, 137, 142),
+                    (33, 145, 140), (31, 152, 139), (31, 160, 136), (34, 167, 133),
+                    (40, 174, 128), (50, 182, 122), (63, 188, 115), (78, 195, 107),
+                    (94, 201, 98), (112, 207, 87), (132, 212, 75), (152, 216, 62),
+                    (173, 220, 48), (194, 223, 35), (216, 226, 25), (236, 229, 27),
+                    (253, 231, 37)])
+
+LUT_SIZE = 256
+_lut = np.column_stack([np.interp(np.linspace(0, 1, LUT_SIZE), np.linspace(0, 1, len(VIRIDIS)), channel)
+                        for channel in VIRIDIS.T]).round().astype(np.uint32)
+LUT = 0xFF000000 | (_lut[:, 0] << 16) | (_lut[:, 1] << 8) | _lut[:, 2]  # as QImage.Format_RGB32 pixels
+
+WHITE = 0xFFFFFFFF
+POINT_RADIUS = 5  # pixels, the most, points are drawn smaller when they're dense
+
+WIDTH = 600
+HEIGHT = 500
+TOP = 40  # room for the figure's title
+MARGIN_LEFT = 70
+MARGIN_RIGHT = 110  # room for the colorbar
+PANEL_TITLE = 22
+PANEL_BOTTOM = 40
+COLORBAR_GAP = 15
+COLORBAR_WIDTH = 14
+
+
+def colormap(values, low, high):
+    """
+    Looks up the colours of values.
+
+    :param array[float] values: The values.
+    :param float low: The value at the bottom of the colormap.
+    :param float high: The value at the top of the colormap.
+    :return: An array of QImage.Format_RGB32 pixels.
+    """
+
+    span = high - low if high > low else 1
+    index = ((np.asarray(values) - low) * ((LUT_SIZE - 1) / span)).round()
+    return LUT[np.clip(index, 0, LUT_SIZE - 1).astype(np.intp)]
+
+
+def nice_ticks(low, high, count=5):
+    """
+    Gets round numbered ticks that fall within a range.
+
+    :param float low: The bottom of the range.
+    :param float high: The top of the range.
+    :param int count: About how many ticks there should be.
+    :return: An array of tick values.
+    """
+
+    if not high > low:
+        return np.array([low])
+
+    raw = (high - low) / count
+    magnitude = 10 ** np.floor(np.log10(raw))
+    step = magnitude * min((1, 2, 2.5, 5, 10), key=lambda m: abs(m * magnitude - raw))
+    return np.arange(np.ceil(low / step), np.floor(high / step) + 1) * step
+
+
+def _disc(radius):
+    """
+    :param int radius: In pixels.
+    :return: The row and column offsets of the pixels in a disc, as an N x 2 array.
+    """
+
+    return np.array([(dy, dx) for dy in range(-radius, radius + 1) for dx in range(-radius, radius + 1)
+                     if dx * dx + dy * dy <= radius * radius + radius])
+
+
+DISCS = [_disc(radius) for radius in range(POINT_RADIUS + 1)]
+
+
+def _format_tick(value):
+    return f'{value:.6g}' if value != 0 else '0'
+
+
+class HeatMapFigure:
+    """
+    Two plots of values over the rocker's roll and pitch, one above the
+    other, each with a colorbar, drawn without matplotlib.
+
+    Has the same update method as plots.ResultFigure, and draws itself with
+    render rather than on a canvas.
+    """
+
+    def __init__(self, title1, title2, figure_title):
+        """
+        :param str title1: The title of the upper plot.
+        :param str title2: The title of the lower plot.
+        :param str figure_title: The title of the whole figure.
+        """
+
+        self.titles = (title1, title2)
+        self.figure_title = figure_title
+        self.points = None
+
+    def update(self, roll, pitch, data1, data2):
+        """
+        Replaces the plotted points.
+
+        :param array[float] roll: The roll of each point, in degrees.
+        :param array[float] pitch: The pitch of each point, in degrees.
+        :param array[float] data1: The upper plot's value at each point.
+        :param array[float] data2: The lower plot's value at each point.
+        :return: None
+        """
+
+        self.points = (np.asarray(roll), np.asarray(pitch), np.asarray(data1), np.asarray(data2))
+
+    def render(self):
+        """
+        Draws the figure.
+
+        :return: The figure as a QImage, only valid until the figure is
+        drawn again.
+        """
+
+        self._pixels = np.full((HEIGHT, WIDTH), WHITE, dtype=np.uint32)
+        image = QImage(self._pixels, WIDTH, HEIGHT, WIDTH * 4, QImage.Format_RGB32)
+
+        panel_height = (HEIGHT - TOP) // 2
+        panels = [QRectF(MARGIN_LEFT, TOP + i * panel_height + PANEL_TITLE,
+                         WIDTH - MARGIN_LEFT - MARGIN_RIGHT, panel_height - PANEL_TITLE - PANEL_BOTTOM)
+                  for i in range(2)]
+
+        layouts = []
+        for panel, data in zip(panels, self.points[2:] if self.points is not None else (None, None)):
+            layouts.append(self._draw_points(panel, data))
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setPen(Qt.black)
+
+        font = QFont()
+        font.setPixelSize(16)
+        painter.setFont(font)
+        painter.drawText(QRectF(0, 0, WIDTH, TOP), Qt.AlignCenter, self.figure_title)
+
+        for panel, title, layout in zip(panels, self.titles, layouts):
+            self._draw_axes(painter, panel, title, layout)
+
+        painter.end()
+        return image
+
+    def _draw_points(self, panel, data):
+        """
+        Stamps the points into self._pixels, keeping the plot's aspect ratio
+        equal, and fills in the colorbar.
+
+        :param QRectF panel: The area for the plot.
+        :param array[float] data: The value at each point.
+        :return: The plot's area, its x and y limits, and its colour limits,
+        or None if there's nothing to plot.
+        """
+
+        if data is None:
+            return None
+
+        roll, pitch = self.points[:2]
+        finite = np.isfinite(roll) & np.isfinite(pitch) & np.isfinite(data)
+        if not finite.any():
+            return None
+        roll, pitch, data = roll[finite], pitch[finite], data[finite]
+
+        pad = POINT_RADIUS + 2
+        x_low, x_high = roll.min(), roll.max()
+        y_low, y_high = pitch.min(), pitch.max()
+        x_span, y_span = max(x_high - x_low, 1e-9), max(y_high - y_low, 1e-9)
+        scale = min((panel.width() - 2 * pad) / x_span, (panel.height() - 2 * pad) / y_span)
+
+        # the box is shrunk to the data's aspect ratio, as matplotlib's 'equal', 'box' does
+        width, height = x_span * scale + 2 * pad, y_span * scale + 2 * pad
+        box = QRectF(panel.center().x() - width / 2, panel.center().y() - height / 2, width, height)
+        limits = (x_low - pad / scale, x_high + pad / scale, y_low - pad / scale, y_high + pad / scale)
+
+        x = np.round(box.left() + (roll - limits[0]) * scale).astype(np.intp)
+        y = np.round(box.bottom() - (pitch - limits[2]) * scale).astype(np.intp)
+        colours = colormap(data, data.min(), data.max())
+        left, right = int(box.left()) + 1, int(box.right())
+        top, bottom = int(box.top()) + 1, int(box.bottom())
+        radius = int(np.clip(0.6 * np.sqrt(width * height / len(data)), 1, POINT_RADIUS))
+        for dy, dx in DISCS[radius]:
+            xs, ys = x + dx, y + dy
+            inside = (xs >= left) & (xs < right) & (ys >= top) & (ys < bottom)
+            self._pixels[ys[inside], xs[inside]] = colours[inside]
+
+        bar = QRectF(box.right() + COLORBAR_GAP, box.top(), COLORBAR_WIDTH, box.height())
+        rows = int(bar.bottom()) - int(bar.top())
+        gradient = LUT[(np.arange(rows - 1, -1, -1) * ((LUT_SIZE - 1) / max(rows - 1, 1))).round().astype(np.intp)]
+        self._pixels[int(bar.top()):int(bar.bottom()), int(bar.left()):int(bar.right())] = gradient[:, None]
+
+        return box, limits, bar, (data.min(), data.max())
+
+    def _draw_axes(self, painter, panel, title, layout):
+        """
+        Draws a plot's frame, ticks, labels, title and colorbar.
+
+        :param QPainter painter: The painter.
+        :param QRectF panel: The area for the plot.
+        :param str title: The plot's title.
+        :param tuple layout: What _draw_points returned.
+        :return: None
+        """
+
+        font = QFont()
+        font.setPixelSize(12)
+        painter.setFont(font)
+
+        if layout is None:
+            box = panel
+        else:
+            box = layout[0]
+        painter.drawText(QRectF(box.left(), box.top() - PANEL_TITLE, box.width(), PANEL_TITLE),
+                         Qt.AlignCenter, title)
+        painter.drawRect(box)
+
+        font.setPixelSize(10)
+        painter.setFont(font)
+        painter.drawText(QRectF(box.left(), box.bottom() + 18, box.width(), 16), Qt.AlignCenter, 'Degrees of Roll')
+        painter.save()
+        painter.translate(box.left() - 48, box.center().y())
+        painter.rotate(-90)
+        painter.drawText(QRectF(-box.height() / 2, -8, box.height(), 16), Qt.AlignCenter, 'Degrees of Pitch')
+        painter.restore()
+
+        if layout is None:
+            return
+
+        box, (x_low, x_high, y_low, y_high), bar, (c_low, c_high) = layout
+        for tick in nice_ticks(x_low, x_high):
+            x = box.left() + (tick - x_low) / (x_high - x_low) * box.width()
+            painter.drawLine(QPointF(x, box.bottom()), QPointF(x, box.bottom() + 4))
+            painter.drawText(QRectF(x - 30, box.bottom() + 4, 60, 14), Qt.AlignHCenter | Qt.AlignTop,
+                             _format_tick(tick))
+        for tick in nice_ticks(y_low, y_high):
+            y = box.bottom() - (tick - y_low) / (y_high - y_low) * box.height()
+            painter.drawLine(QPointF(box.left() - 4, y), QPointF(box.left(), y))
+            painter.drawText(QRectF(box.left() - 40, y - 7, 34, 14), Qt.AlignRight | Qt.AlignVCenter,
+                             _format_tick(tick))
+
+        painter.drawRect(bar)
+        if c_high > c_low:
+            for tick in nice_ticks(c_low, c_high):
+                y = bar.bottom() - (tick - c_low) / (c_high - c_low) * bar.height()
+                painter.drawLine(QPointF(bar.right(), y), QPointF(bar.right() + 4, y))
+                painter.drawText(QRectF(bar.right() + 6, y - 7, 80, 14), Qt.AlignLeft | Qt.AlignVCenter,
+                                 _format_tick(tick))
+        else:
+            painter.drawText(QRectF(bar.right() + 6, bar.center().y() - 7, 80, 14), Qt.AlignLeft | Qt.AlignVCenter,
+                             _format_tick(c_low))
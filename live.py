@@ -0,0 +1,106 @@
+"""
+Spin boxes linked to the input fields, for changing a design and watching
+the plots follow.
+"""
+
+import numpy as np
+import PySide6.QtWidgets as Widgets
+from PySide6.QtCore import Qt, Signal
+
+
+def field_name(line_edit):
+    """
+    :param QLineEdit line_edit: An input field.
+    :return: A readable name made from the field's object name.
+    """
+
+    words = line_edit.objectName().split('_')
+    if words[-1] in ('ctc', 'linear'):
+        words = words[:-1]
+    return ' '.join(words).capitalize()
+
+
+class LinkedSpinBox(Widgets.QDoubleSpinBox):
+    """
+    A spin box that keeps an input field's text and its own value the same.
+    """
+
+    edited = Signal()
+
+    def __init__(self, line_edit, parent=None):
+        """
+        :param QLineEdit line_edit: The input field.
+        :param QWidget parent: The parent widget.
+        """
+
+        super().__init__(parent)
+        self.line_edit = line_edit
+
+        self.setRange(-1e6, 1e6)
+        self.setDecimals(4)
+        self.setAccelerated(True)
+
+        self.pull()
+        line_edit.textChanged.connect(self.pull)
+        self.valueChanged.connect(self.push)
+
+    def pull(self):
+        """
+        Copies the input field's value, if it's a number.
+
+        :return: None
+        """
+
+        try:
+            value = float(self.line_edit.text())
+        except ValueError:
+            return
+
+        self.blockSignals(True)
+        self.setValue(value)
+        # steps are about a tenth of the value's size
+        self.setSingleStep(10 ** (np.floor(np.log10(abs(value))) - 1) if value else 0.1)
+        self.blockSignals(False)
+
+    def push(self, value):
+        self.line_edit.blockSignals(True)
+        self.line_edit.setText(f'{value:.10g}')
+        self.line_edit.blockSignals(False)
+        self.edited.emit()
+
+
+class LiveControls(Widgets.QDockWidget):
+    """
+    A dock with a spin box for every input field, grouped by input tab.
+    """
+
+    edited = Signal()
+
+    def __init__(self, groups, parent=None):
+        """
+        :param list[tuple[str, list[QLineEdit]]] groups: The title of each
+        group and the input fields in it.
+        :param QWidget parent: The parent widget.
+        """
+
+        super().__init__('Live Inputs', parent)
+        self.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+
+        contents = Widgets.QWidget()
+        layout = Widgets.QVBoxLayout(contents)
+        self.spin_boxes = []
+        for title, line_edits in groups:
+            group = Widgets.QGroupBox(title)
+            form = Widgets.QFormLayout(group)
+            for line_edit in line_edits:
+                spin_box = LinkedSpinBox(line_edit)
+                spin_box.edited.connect(self.edited)
+                form.addRow(field_name(line_edit), spin_box)
+                self.spin_boxes.append(spin_box)
+            layout.addWidget(group)
+        layout.addStretch()
+
+        scroll = Widgets.QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(contents)
+        self.setWidget(scroll)
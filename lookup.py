@@ -0,0 +1,225 @@
+"""
+A precomputed inverse kinematics table, for finding the actuator positions
+of a target pitch and roll faster than solving for them, such as once per
+tick of a control loop.
+
+The table holds both actuators' positions, as float32, on a uniformly
+spaced grid of pitch and roll, and is queried by interpolating between the
+grid points. Grid points the actuators can't reach are NaN, and so is any
+query that needs one of them, or that's outside the grid.
+
+It's made by Rig.lookup_table, and can be saved and loaded without a Rig.
+"""
+
+import json
+
+import numpy as np
+
+BILINEAR = 'bilinear'
+BICUBIC = 'bicubic'
+
+
+def _catmull_rom(t):
+    """
+    :param array[float] t: The fraction of the way between the second and
+    third of four points.
+    :return: The weights of the four points, as a 4 x N array.
+    """
+
+    t2 = t * t
+    t3 = t2 * t
+    return np.stack(((-t3 + 2 * t2 - t) / 2,
+                     (3 * t3 - 5 * t2 + 2) / 2,
+                     (-3 * t3 + 4 * t2 + t) / 2,
+                     (t3 - t2) / 2))
+
+
+class LookupTable:
+    """
+    Actuator positions over a uniform grid of pitch and roll.
+
+    table has the shape (2, pitch points, roll points), the first actuator's
+    positions being table[0]. Positions are CTC angles, in radians, or
+    pushrod lengths, as from Rig.inverse_kinematics, and pitch and roll are
+    in degrees, as in Rig.pitch and Rig.roll.
+    """
+
+    def __init__(self, table, pitch_limits, roll_limits, drive='', max_error=None):
+        """
+        :param array[float] table: The positions, shaped (2, pitch points, roll points).
+        :param tuple[float, float] pitch_limits: The pitch of the first and last rows.
+        :param tuple[float, float] roll_limits: The roll of the first and last columns.
+        :param str drive: The Rig's drive.
+        :param tuple[float, float] max_error: The most that each actuator's
+        interpolated position was found to be off by, see max_error.
+        """
+
+        self.table = np.ascontiguousarray(table, dtype=np.float32)
+        self.pitch_limits = (float(pitch_limits[0]), float(pitch_limits[1]))
+        self.roll_limits = (float(roll_limits[0]), float(roll_limits[1]))
+        self.drive = drive
+        self.max_error = max_error
+
+        rows, columns = self.table.shape[1:]
+        self.pitch_step = (self.pitch_limits[1] - self.pitch_limits[0]) / (rows - 1)
+        self.roll_step = (self.roll_limits[1] - self.roll_limits[0]) / (columns - 1)
+
+        # kept as plain floats and ints so position doesn't touch NumPy more than it has to
+        self._pitch_scale = 1 / self.pitch_step
+        self._roll_scale = 1 / self.roll_step
+        self._last_row = rows - 1
+        self._last_column = columns - 1
+
+    @property
+    def shape(self):
+        return self.table.shape[1:]
+
+    @property
+    def metadata(self):
+        """
+        :return: A dict of everything but the table, which can be written as JSON.
+        """
+
+        return {'drive': self.drive,
+                'pitch_limits': self.pitch_limits,
+                'roll_limits': self.roll_limits,
+                'shape': self.shape,
+                'max_error': self.max_error}
+
+    def pitches(self):
+        """
+        :return: The pitch of each row of the table, in degrees.
+        """
+
+        return np.linspace(*self.pitch_limits, self.shape[0])
+
+    def rolls(self):
+        """
+        :return: The roll of each column of the table, in degrees.
+        """
+
+        return np.linspace(*self.roll_limits, self.shape[1])
+
+    def position(self, pitch, roll):
+        """
+        Bilinearly interpolates the positions of a single target, with
+        plain Python arithmetic, so it takes microseconds.
+
+        :param float pitch: The target pitch, in degrees.
+        :param float roll: The target roll, in degrees.
+        :return: A tuple of the two actuators' positions. NaN if the target
+        isn't in the table.
+        """
+
+        u = (pitch - self.pitch_limits[0]) * self._pitch_scale
+        v = (roll - self.roll_limits[0]) * self._roll_scale
+        if not (0 <= u <= self._last_row and 0 <= v <= self._last_column):
+            return np.nan, np.nan
+
+        i = min(int(u), self._last_row - 1)
+        j = min(int(v), self._last_column - 1)
+        u -= i
+        v -= j
+        item = self.table.item
+
+        return tuple((1 - u) * ((1 - v) * item(k, i, j) + v * item(k, i, j + 1))
+                     + u * ((1 - v) * item(k, i + 1, j) + v * item(k, i + 1, j + 1))
+                     for k in (0, 1))
+
+    def interpolate(self, pitch, roll, method=BILINEAR):
+        """
+        Interpolates the positions of many targets at once.
+
+        Bicubic interpolation is Catmull-Rom, with the table's edges
+        repeated. Near where the actuators can't reach it needs grid points
+        that aren't in the table, so bilinear interpolation is used there
+        instead.
+
+        :param array[float] pitch: The target pitches, in degrees.
+        :param array[float] roll: The target rolls, in degrees.
+        :param str method: BILINEAR or BICUBIC.
+        :return: A tuple of arrays of the two actuators' positions, shaped
+        like the targets. NaN for targets that aren't in the table.
+        """
+
+        if method not in (BILINEAR, BICUBIC):
+            raise ValueError(f'Unknown interpolation method {method!r}.')
+
+        pitch, roll = np.broadcast_arrays(np.asarray(pitch, dtype=float), np.asarray(roll, dtype=float))
+        shape = pitch.shape
+        u = (pitch.ravel() - self.pitch_limits[0]) * self._pitch_scale
+        v = (roll.ravel() - self.roll_limits[0]) * self._roll_scale
+        with np.errstate(invalid='ignore'):
+            inside = (u >= 0) & (u <= self._last_row) & (v >= 0) & (v <= self._last_column)
+
+        i = np.clip(np.floor(np.nan_to_num(u)), 0, self._last_row - 1).astype(np.intp)
+        j = np.clip(np.floor(np.nan_to_num(v)), 0, self._last_column - 1).astype(np.intp)
+        u = u - i
+        v = v - j
+
+        table = self.table
+        positions = ((1 - u) * ((1 - v) * table[:, i, j] + v * table[:, i, j + 1])
+                     + u * ((1 - v) * table[:, i + 1, j] + v * table[:, i + 1, j + 1]))
+
+        if method == BICUBIC:
+            weights_u = _catmull_rom(u)
+            weights_v = _catmull_rom(v)
+            cubic = np.zeros_like(positions)
+            for m in range(4):
+                rows = np.clip(i + m - 1, 0, self._last_row)
+                for n in range(4):
+                    columns = np.clip(j + n - 1, 0, self._last_column)
+                    cubic += weights_u[m] * weights_v[n] * table[:, rows, columns]
+            positions = np.where(np.isnan(cubic), positions, cubic)
+
+        positions[:, ~inside] = np.nan
+
+        return positions[0].reshape(shape), positions[1].reshape(shape)
+
+    def measure_error(self, rig, method=BILINEAR):
+        """
+        Finds how far the interpolated positions are from the exact ones at
+        the middle of each cell of the table, where they're furthest from
+        the grid points.
+
+        :param Rig rig: The Rig the table is of.
+        :param str method: BILINEAR or BICUBIC.
+        :return: A tuple of the largest error in each actuator's position.
+        NaN if no cell's middle can be reached.
+        """
+
+        pitches, rolls = self.pitches(), self.rolls()
+        pitch, roll = np.meshgrid((pitches[:-1] + pitches[1:]) / 2, (rolls[:-1] + rolls[1:]) / 2, indexing='ij')
+
+        exact1, exact2 = rig.inverse_kinematics(pitch, roll)[:2]
+        interpolated1, interpolated2 = (positions.ravel() for positions in self.interpolate(pitch, roll, method))
+
+        errors = []
+        for exact, interpolated in ((exact1, interpolated1), (exact2, interpolated2)):
+            error = np.abs(interpolated - exact)
+            error = error[np.isfinite(error)]
+            errors.append(float(error.max()) if error.size else np.nan)
+
+        return tuple(errors)
+
+    def save(self, path):
+        """
+        :param str path: The .npz file.
+        :return: None
+        """
+
+        np.savez(path, table=self.table, metadata=np.array(json.dumps(self.metadata)))
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param str path: A file written by save.
+        :return: The LookupTable.
+        """
+
+        with np.load(path) as contents:
+            table = contents['table']
+            metadata = json.loads(str(contents['metadata']))
+
+        max_error = tuple(metadata['max_error']) if metadata['max_error'] is not None else None
+        return cls(table, metadata['pitch_limits'], metadata['roll_limits'], metadata['drive'], max_error)
@@ -1,20 +1,29 @@
+import os
 import sys
 
 # from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QMessageBox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg
-from matplotlib.figure import Figure
-from PIL import Image
-from PIL import ImageQt
-import numpy as np
 import PySide6.QtWidgets as Widgets
 from PySide6.QtGui import QPixmap
-from PySide6.QtCore import Qt
-
-import json
+from PySide6.QtCore import QResource, Qt, QThreadPool, QTimer
 
+from cache import KinematicsCache
+import export
+from heatmap import HeatMapFigure
+from live import LiveControls
 from main_window import Ui_MainWindow
-from rig import Rig
+import project
+from rig import CTC, LINEAR, Rig
+from worker import CalculationWorker
+
+RESOURCES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main_window.rcc')
+
+EXPORT_FILTERS = {'CSV (*.csv)': export.CSV,
+                  'Columnar (*.mvcol)': export.COLUMNAR,
+                  'NumPy Folder (*)': export.NPY,
+                  'Arrow IPC (*.arrow)': export.ARROW}
+
+LIVE_DELAY = 150  # ms after the last edit in live mode before solving the full grid
+LIVE_PREVIEW_STEPS = 4  # of the grid solved as soon as an input changes in live mode
 
 
 class CalcWindow(Widgets.QMainWindow):
@@ -28,168 +37,323 @@ class CalcWindow(Widgets.QMainWindow):
 
         self.ui.actionSave.triggered.connect(self.save)
         self.ui.actionOpen.triggered.connect(self.open)
+        self.ui.menuFile.addAction('Export Results...').triggered.connect(self.export_results)
+
+        # the images are in a binary resource file that's only registered,
+        # and each image only loaded, once its tab is shown
+        self.resources_registered = False
+        self.tab_images = {self.ui.tab: (self.ui.whole_iso_label, ':/images/images/whole_isometric.png'),
+                           self.ui.tab_2: (self.ui.label_2, ':/images/images/front_view.png'),
+                           self.ui.tab_4: (self.ui.label_4, ':/images/images/top_view.png')}
+        self.ui.outputs_tab.currentChanged.connect(self.load_tab_image)
+        self.load_tab_image()
+
+        self.cache = KinematicsCache()
+
+        # the figures are built once and only their data changes after that,
+        # and each is only drawn when its tab is shown. The matplotlib canvases
+        # aren't built, and matplotlib isn't imported, until they're first drawn.
+        self.plots = []
+        for title1, title2, figure_title, tab, label, field1, field2, needs_inertia in (
+                ('Pitch Torque', 'Roll Torque',
+                 'Rocker Torque Calculated from Motor Torque Spec',
+                 self.ui.torque_tab, self.ui.torques_label, 'pitch_torque', 'roll_torque', False),
+                ('Pitch Omega (deg / sec)', 'Roll Omega (deg / sec)',
+                 'Rocker Omega Calculated from Motor RPM Spec',
+                 self.ui.omega_tab, self.ui.omegas_label, 'pitch_omega', 'roll_omega', False),
+                ('Pitch Alpha (deg / sec^2)', 'Roll Alpha (deg / sec^2)',
+                 'Rocker Alpha Calculated from Motor Torque Spec & Inertias',
+                 self.ui.alpha_tab, self.ui.alphas_label, 'pitch_alpha', 'roll_alpha', True),
+                ('Pitch Acceleration', 'Roll Acceleration',
+                 'Linear Acc Calculated from\nMotor Torque Spec, Inertias, and Inspect. Rad.',
+                 self.ui.linear_acc_tab, self.ui.linear_acc_label, 'pitch_linear_acc', 'roll_linear_acc', True),
+                ('Pitch Speed', 'Roll Speed',
+                 'Linear Speed Calculated from\nMotor Torque Spec, Inertias, and Inspect. Rad.',
+                 self.ui.linear_speed_tab, self.ui.linear_speed_label, 'pitch_linear_speed', 'roll_linear_speed', True)):
+            self.plots.append(((title1, title2, figure_title), HeatMapFigure(title1, title2, figure_title),
+                               tab, label, field1, field2, needs_inertia))
+        self.canvases = {}
+        self.point_index = None
+        self.stale_plots = []
+        self.ui.outputs_tab.currentChanged.connect(self.draw_visible_plot)
+
+        view_menu = self.ui.menubar.addMenu('View')
+        self.heat_maps_action = view_menu.addAction('Fast Heat Maps')
+        self.heat_maps_action.setCheckable(True)
+        self.heat_maps_action.toggled.connect(self.change_renderer)
+
+        self.rig = None
+        self.run_id = 0
+        self.worker = None
+        self.thread_pool = QThreadPool.globalInstance()
+
+        self.ctc_inputs = [getattr(self.ui, name) for name in project.CTC_FIELDS]
+        self.linear_inputs = [getattr(self.ui, name) for name in project.LINEAR_FIELDS]
+
+        # a run is stale as soon as any input changes
+        for line_edit in self.ctc_inputs + self.linear_inputs:
+            line_edit.textEdited.connect(self.input_edited)
+
+        self.live_controls = LiveControls([('CTC', self.ctc_inputs), ('Linear Actuator', self.linear_inputs)], self)
+        self.live_controls.edited.connect(self.input_edited)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.live_controls)
+        self.live_controls.hide()
+
+        self.live_action = view_menu.addAction('Live Mode')
+        self.live_action.setCheckable(True)
+        self.live_action.toggled.connect(self.live_controls.setVisible)
+        self.live_controls.visibilityChanged.connect(self.live_action.setChecked)
+
+        # each edit is previewed on a coarse grid straight away, and the full grid
+        # is only solved once the edits pause for LIVE_DELAY
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_DELAY)
+        self.live_timer.timeout.connect(self.live_calculate)
 
     def save(self):
         file = Widgets.QFileDialog.getSaveFileName(parent=self, caption='Save File',
                                                    filter='MotionVisualizer Files (*.mv)')
 
-        info = {'rod_mount_x_ctc': str(self.ui.rod_mount_x_ctc.text()),
-                'rod_mount_y_ctc': str(self.ui.rod_mount_y_ctc.text()),
-                'rod_mount_z_ctc': str(self.ui.rod_mount_z_ctc.text()),
-                'motor_x': str(self.ui.motor_x.text()),
-                'motor_y': str(self.ui.motor_y.text()),
-                'motor_z': str(self.ui.motor_z.text()),
-                'motor_angle': str(self.ui.motor_angle.text()),
-                'ctc_length': str(self.ui.ctc_length.text()),
-                'ctc_neutral_angle': str(self.ui.ctc_neutral_angle.text()),
-                'ctc_rotation': str(self.ui.ctc_rotation.text()),
-                'motor_torque_ctc': str(self.ui.motor_torque_ctc.text()),
-                'motor_rpm_ctc': str(self.ui.motor_rpm_ctc.text()),
-                'i_pitch_ctc': str(self.ui.i_pitch_ctc.text()),
-                'i_roll_ctc': str(self.ui.i_roll_ctc.text()),
-                'pitch_linear_rad_ctc': str(self.ui.pitch_linear_rad_ctc.text()),
-                'roll_linear_rad_ctc': str(self.ui.roll_linear_rad_ctc.text()),
-                'rod_mount_x_linear': str(self.ui.rod_mount_x_linear.text()),
-                'rod_mount_y_linear': str(self.ui.rod_mount_y_linear.text()),
-                'rod_mount_z_linear': str(self.ui.rod_mount_z_linear.text()),
-                'lower_mount_x_linear': str(self.ui.lower_mount_x_linear.text()),
-                'lower_mount_y_linear': str(self.ui.lower_mount_y_linear.text()),
-                'lower_mount_z_linear': str(self.ui.lower_mount_z_linear.text()),
-                'linear_travel': str(self.ui.linear_travel.text()),
-                'screw_pitch': str(self.ui.screw_pitch.text()),
-                'motor_torque_linear': str(self.ui.motor_torque_linear.text()),
-                'motor_rpm_linear': str(self.ui.motor_rpm_linear.text()),
-                'i_pitch_linear': str(self.ui.i_pitch_linear.text()),
-                'i_roll_linear': str(self.ui.i_roll_linear.text()),
-                'pitch_linear_rad_linear': str(self.ui.pitch_linear_rad_linear.text()),
-                'roll_linear_rad_linear': str(self.ui.roll_linear_rad_linear.text()),
-                'inputs_tab_index': str(self.ui.inputs_tab.currentIndex()),
-                'outputs_tab_index': str(self.ui.outputs_tab.currentIndex()),
-                }
-
-        info = json.dumps(info)
-        with open(file[0], 'w') as f:
-            f.write(info)
+        # the solution is saved too, unless it's still being worked out
+        project.save(file[0], self.project_info(), self.rig if self.worker is None else None)
 
     def open(self):
         file = Widgets.QFileDialog.getOpenFileName(parent=self, caption='Open file',
                                                    filter='MotionVisualizer Files (*.mv)')
 
-        with open(file[0], 'r') as f:
-            info = json.loads(f.read())
-
-        self.ui.rod_mount_x_ctc.setText(info['rod_mount_x_ctc'])
-        self.ui.rod_mount_y_ctc.setText(info['rod_mount_y_ctc'])
-        self.ui.rod_mount_z_ctc.setText(info['rod_mount_z_ctc'])
-        self.ui.motor_x.setText(info['motor_x'])
-        self.ui.motor_y.setText(info['motor_y'])
-        self.ui.motor_z.setText(info['motor_z'])
-        self.ui.motor_angle.setText(info['motor_angle'])
-        self.ui.ctc_length.setText(info['ctc_length'])
-        self.ui.ctc_neutral_angle.setText(info['ctc_neutral_angle'])
-        self.ui.ctc_rotation.setText(info['ctc_rotation'])
-        self.ui.motor_torque_ctc.setText(info['motor_torque_ctc'])
-        self.ui.motor_rpm_ctc.setText(info['motor_rpm_ctc'])
-        self.ui.i_pitch_ctc.setText(info['i_pitch_ctc'])
-        self.ui.i_roll_ctc.setText(info['i_roll_ctc'])
-        self.ui.pitch_linear_rad_ctc.setText(info['pitch_linear_rad_ctc'])
-        self.ui.roll_linear_rad_ctc.setText(info['roll_linear_rad_ctc'])
-        self.ui.rod_mount_x_linear.setText(info['rod_mount_x_linear'])
-        self.ui.rod_mount_y_linear.setText(info['rod_mount_y_linear'])
-        self.ui.rod_mount_z_linear.setText(info['rod_mount_z_linear'])
-        self.ui.lower_mount_x_linear.setText(info['lower_mount_x_linear'])
-        self.ui.lower_mount_y_linear.setText(info['lower_mount_y_linear'])
-        self.ui.lower_mount_z_linear.setText(info['lower_mount_z_linear'])
-        self.ui.linear_travel.setText(info['linear_travel'])
-        self.ui.screw_pitch.setText(info['screw_pitch'])
-        self.ui.motor_torque_linear.setText(info['motor_torque_linear'])
-        self.ui.motor_rpm_linear.setText(info['motor_rpm_linear'])
-        self.ui.i_pitch_linear.setText(info['i_pitch_linear'])
-        self.ui.i_roll_linear.setText(info['i_roll_linear'])
-        self.ui.pitch_linear_rad_linear.setText(info['pitch_linear_rad_linear'])
-        self.ui.roll_linear_rad_linear.setText(info['roll_linear_rad_linear'])
+        info = project.load(file[0])
+
+        for name in project.CTC_FIELDS + project.LINEAR_FIELDS:
+            getattr(self.ui, name).setText(project.field_text(info[name]))
         self.ui.inputs_tab.setCurrentIndex(int(info['inputs_tab_index']))
         self.ui.outputs_tab.setCurrentIndex(int(info['outputs_tab_index']))
 
-        if int(info['inputs_tab_index']) == 0:
-            self.calculate_ctc()
-        elif int(info['inputs_tab_index']) == 1:
-            self.calculate_linear()
+        if project.project_drive(info) == CTC:
+            rig, show_results = self.ctc_rig(), self.show_ctc_results
+        else:
+            rig, show_results = self.linear_rig(), self.show_linear_results
+
+        kinematics = project.load_kinematics(file[0], rig.geometry)
+        if kinematics is None:
+            self.start_calculation(rig, show_results)
+            return
+
+        # the saved solution only has to be scaled by the drive, so it's shown straight away
+        self.cancel_calculation()
+        rig.calculate(kinematics=kinematics)
+        self.rig = rig
+        self.show_results = show_results
+        self.make_plots()
+        self.show_results()
 
-    def plot(self, title1, title2, data1, data2, figure_title):
-        fig = Figure(figsize=(6, 8), dpi=100)
-        canvas = FigureCanvasAgg(fig)
+    def export_results(self):
+        if self.rig is None or self.worker is not None:
+            Widgets.QMessageBox.information(self, 'Export Results', 'There are no finished results to export.')
+            return
 
-        axs = fig.subplots(2, 1)
-        fig.set_figheight(5)
+        path, selected = Widgets.QFileDialog.getSaveFileName(parent=self, caption='Export Results',
+                                                             filter=';;'.join(EXPORT_FILTERS))
+        if not path:
+            return
 
-        img1 = axs[0].scatter(self.rig.roll, self.rig.pitch, s=50, c=data1)
-        axs[0].set_aspect('equal', 'box')
-        axs[0].set_title(title1, fontsize=10)
-        axs[0].set_xlabel('Degrees of Roll')
-        axs[0].set_ylabel('Degrees of Pitch')
-        fig.colorbar(img1, ax=axs[0])
+        try:
+            export.export(self.rig.results, path, EXPORT_FILTERS[selected])
+        except (ImportError, OSError) as e:
+            Widgets.QMessageBox.warning(self, 'Export failed', str(e))
 
-        img2 = axs[1].scatter(self.rig.roll, self.rig.pitch, s=50, c=data2)
-        axs[1].set_aspect('equal', 'box')
-        axs[1].set_title(title2, fontsize=10)
-        axs[1].set_xlabel('Degrees of Roll')
-        axs[1].set_ylabel('Degrees of Pitch')
-        fig.colorbar(img2, ax=axs[1])
+    def make_plots(self):
+        inertia = (float(self.ui.i_pitch_ctc.text()) > 0 or float(self.ui.i_roll_ctc.text()) > 0 or
+                   float(self.ui.i_pitch_linear.text()) > 0 or float(self.ui.i_roll_linear.text()) > 0)
+
+        self.point_index = None
+        self.stale_plots = [plot for plot in self.plots if inertia or not plot[-1]]
+        self.draw_visible_plot()
+
+    def load_tab_image(self, index=None):
+        tab = self.ui.outputs_tab.currentWidget()
+        if tab not in self.tab_images:
+            return
+
+        if not self.resources_registered:
+            # Qt memory maps the file where it can
+            self.resources_registered = QResource.registerResource(RESOURCES)
+        label, path = self.tab_images.pop(tab)
+        label.setPixmap(QPixmap(path))
+
+    def canvas(self, plot):
+        """
+        Gets the matplotlib canvas of a plot, building it the first time.
+
+        :param tuple plot: An item of self.plots.
+        :return: A ResultCanvas.
+        """
+
+        titles, _, tab, label, _, _, _ = plot
+        if tab not in self.canvases:
+            from plots import ResultCanvas
+
+            figure = ResultCanvas(*titles)
+            # the canvas takes the label's place once there's something to plot
+            figure.canvas.setParent(tab)
+            figure.canvas.setFixedSize(600, 500)
+            figure.canvas.move(label.geometry().center() - figure.canvas.rect().center())
+            self.canvases[tab] = figure
+
+        return self.canvases[tab]
+
+    def draw_visible_plot(self, index=None):
+        tab = self.ui.outputs_tab.currentWidget()
+        for plot in self.stale_plots:
+            _, heat_map, plot_tab, label, field1, field2, _ = plot
+            if plot_tab is tab:
+                data = (self.rig.roll, self.rig.pitch, getattr(self.rig, field1), getattr(self.rig, field2))
+                if self.heat_maps_action.isChecked():
+                    heat_map.update(*data)
+                    label.setPixmap(QPixmap.fromImage(heat_map.render()))
+                    if tab in self.canvases:
+                        self.canvases[tab].canvas.hide()
+                    label.show()
+                else:
+                    if self.point_index is None:
+                        from plots import PointIndex
+
+                        self.point_index = PointIndex(self.rig.results)
+                    figure = self.canvas(plot)
+                    figure.update(*data)
+                    figure.set_index(self.point_index)
+                    label.hide()
+                    figure.canvas.show()
+                    figure.canvas.draw_idle()
+                self.stale_plots.remove(plot)
+                break
+
+    def change_renderer(self, heat_maps):
+        if self.rig is not None:
+            self.make_plots()
+
+    def input_edited(self):
+        self.cancel_calculation()
+        if self.live_action.isChecked():
+            self.live_timer.start()
+            self.live_calculate(LIVE_PREVIEW_STEPS)
+
+    def live_calculate(self, preview_steps=None):
+        """
+        Solves the active input tab's Rig in live mode.
+
+        :param int preview_steps: Solves a grid with this many steps instead
+        of the full one. Ignored when only the drive values changed, since the
+        last solution is rescaled straight away then.
+        :return: None
+        """
+
+        if self.ui.inputs_tab.currentIndex() == 0:
+            make_rig, show_results = self.ctc_rig, self.show_ctc_results
+        else:
+            make_rig, show_results = self.linear_rig, self.show_linear_results
+
+        try:
+            rig = make_rig()
+        except ValueError:
+            return  # a field is part way through being typed
+
+        if preview_steps is not None:
+            if self.rig is not None and self.rig.geometry == rig.geometry:
+                self.live_timer.stop()
+            else:
+                # previews would only crowd the full grids out of the cache
+                rig = make_rig(preview_steps)
+                rig.cache = None
+
+        self.start_calculation(rig, show_results)
+
+    def start_calculation(self, rig, show_results):
+        """
+        Solves a Rig on the thread pool, replacing any calculation that's
+        still running. The plots are redrawn as each coarser grid is solved,
+        on the way to the Rig's own.
+
+        :param Rig rig: The Rig to solve.
+        :param callable show_results: Shows the Rig's outputs once it's solved.
+        :return: None
+        """
+
+        self.cancel_calculation()
+
+        self.run_id += 1
+        self.show_results = show_results
+        # when only the motor and inertia values changed, the last solution is just rescaled
+        self.worker = CalculationWorker(self.run_id, rig, previous=self.rig)
+        self.worker.signals.progress.connect(self.calculation_progress)
+        self.worker.signals.partial.connect(self.calculation_partial)
+        self.worker.signals.finished.connect(self.calculation_finished)
+        self.worker.signals.failed.connect(self.calculation_failed)
+
+        self.statusBar().showMessage('Calculating...')
+        self.thread_pool.start(self.worker)
+
+    def cancel_calculation(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+            self.statusBar().clearMessage()
+
+    def calculation_progress(self, run_id, fraction):
+        if run_id == self.run_id and self.worker is not None:
+            self.statusBar().showMessage(f'Calculating... {round(fraction * 100)}%')
+
+    def calculation_partial(self, run_id, rig):
+        if run_id != self.run_id or self.worker is None:
+            return
+
+        self.rig = rig
+        self.make_plots()
+        self.show_results()
 
-        fig.suptitle(figure_title)
+    def calculation_finished(self, run_id, rig):
+        if run_id != self.run_id or self.worker is None:
+            return
 
-        fig.subplots_adjust(wspace=0.4, hspace=0.4)
+        self.worker = None
+        self.rig = rig
+        self.statusBar().clearMessage()
 
-        canvas.draw()
-        buf = canvas.buffer_rgba()
-        X = np.asarray(buf)
-        return ImageQt.ImageQt(Image.fromarray(X))
+        self.make_plots()
+        self.show_results()
 
-    def make_plots(self):
-        torque_plot = self.plot('Pitch Torque', 'Roll Torque', self.rig.pitch_torque, self.rig.roll_torque,
-                                'Rocker Torque Calculated from Motor Torque Spec')
-        omega_plot = self.plot('Pitch Omega (deg / sec)', 'Roll Omega (deg / sec)', self.rig.pitch_omega, self.rig.roll_omega,
-                               'Rocker Omega Calculated from Motor RPM Spec')
-        alpha_plot = self.plot('Pitch Alpha (deg / sec^2)', 'Roll Alpha (deg / sec^2)', self.rig.pitch_alpha, self.rig.roll_alpha,
-                               'Rocker Alpha Calculated from Motor Torque Spec & Inertias')
-        acc_plot = self.plot('Pitch Acceleration', 'Roll Acceleration',
-                             self.rig.pitch_linear_acc, self.rig.roll_linear_acc,
-                             'Linear Acc Calculated from\nMotor Torque Spec, Inertias, and Inspect. Rad.')
-        speed_plot = self.plot('Pitch Speed', 'Roll Speed', self.rig.pitch_linear_speed, self.rig.roll_linear_speed,
-                               'Linear Speed Calculated from\nMotor Torque Spec, Inertias, and Inspect. Rad.')
-        self.ui.torques_label.setPixmap(QPixmap.fromImage(torque_plot))
-        self.ui.omegas_label.setPixmap(QPixmap.fromImage(omega_plot))
-
-        if (float(self.ui.i_pitch_ctc.text()) > 0 or float(self.ui.i_roll_ctc.text()) > 0 or
-                float(self.ui.i_pitch_linear.text()) > 0 or float(self.ui.i_roll_linear.text()) > 0):
-            self.ui.alphas_label.setPixmap(QPixmap.fromImage(alpha_plot))
-            self.ui.linear_acc_label.setPixmap(QPixmap.fromImage(acc_plot))
-            self.ui.linear_speed_label.setPixmap(QPixmap.fromImage(speed_plot))
+    def calculation_failed(self, run_id, message):
+        if run_id != self.run_id or self.worker is None:
+            return
+
+        self.worker = None
+        self.statusBar().showMessage(f'Calculation failed: {message.strip().splitlines()[-1]}')
+        if not self.live_action.isChecked():
+            Widgets.QMessageBox.warning(self, 'Calculation failed', message.strip().splitlines()[-1])
+
+    def closeEvent(self, event):
+        self.cancel_calculation()
+        self.thread_pool.waitForDone()
+        super().closeEvent(event)
 
     def calculate_ctc(self):
-        self.rig = Rig(np.array([float(self.ui.rod_mount_x_ctc.text()),
-                                 float(self.ui.rod_mount_y_ctc.text()),
-                                 float(self.ui.rod_mount_z_ctc.text())]),
-                       np.array([float(self.ui.motor_x.text()),
-                                 float(self.ui.motor_y.text()),
-                                 float(self.ui.motor_z.text())]),
-                       motor_angle=float(self.ui.motor_angle.text()),
-                       motor_torque=float(self.ui.motor_torque_ctc.text()),
-                       motor_rpm=float(self.ui.motor_rpm_ctc.text()),
-                       ctc_length=float(self.ui.ctc_length.text()),
-                       ctc_neutral_angle=float(self.ui.ctc_neutral_angle.text()),
-                       ctc_total_rotation=float(self.ui.ctc_rotation.text()),
-                       i_pitch=float(self.ui.i_pitch_ctc.text()),
-                       i_roll=float(self.ui.i_roll_ctc.text()),
-                       pitch_linear_rad=float(self.ui.pitch_linear_rad_ctc.text()),
-                       roll_linear_rad=float(self.ui.roll_linear_rad_ctc.text()),
-                       drive='ctc')
-
-        self.rig.calculate()
+        self.start_calculation(self.ctc_rig(), self.show_ctc_results)
 
-        self.make_plots()
+    def project_info(self):
+        """
+        :return: The project's fields, as saved in a .mv file.
+        """
 
+        info = {name: str(getattr(self.ui, name).text()) for name in project.CTC_FIELDS + project.LINEAR_FIELDS}
+        info['inputs_tab_index'] = str(self.ui.inputs_tab.currentIndex())
+        info['outputs_tab_index'] = str(self.ui.outputs_tab.currentIndex())
+
+        return info
+
+    def ctc_rig(self, plot_steps=16):
+        return Rig(**project.rig_kwargs(self.project_info(), CTC), plot_steps=plot_steps, cache=self.cache)
+
+    def show_ctc_results(self):
         self.ui.zx_rodmount_angle_ctc.setText(str(round(self.rig.zx_rodmount_angle_ctc, 2)))
         self.ui.zx_pushrod_angle_ctc.setText(str(round(self.rig.zx_pushrod_angle_ctc, 2)))
         self.ui.xy_rodmount_pushrod_angle_ctc.setText(str(round(self.rig.xy_rodmount_pushrod_angle_ctc, 2)))
@@ -200,30 +364,16 @@ class CalcWindow(Widgets.QMainWindow):
         self.ui.max_roll_omega_ctc.setText(str(round(self.rig.max_roll_speed, 2)))
         self.ui.pushrod_force_ctc.setText(str(round(self.rig.max_pushrod_force, 2)))
         self.ui.pitch_roll_ratio_ctc.setText(str(round(self.rig.pitch_roll_ratio, 4)))
-        self.ui.min_max_pitch_ctc.setText(f'{round(min(self.rig.pitch), 2)} / {round(max(self.rig.pitch), 2)}')
-        self.ui.min_max_roll_ctc.setText(f'{round(min(self.rig.roll), 2)} / {round(max(self.rig.roll), 2)}')
+        self.ui.min_max_pitch_ctc.setText(f'{round(self.rig.pitch.min(), 2)} / {round(self.rig.pitch.max(), 2)}')
+        self.ui.min_max_roll_ctc.setText(f'{round(self.rig.roll.min(), 2)} / {round(self.rig.roll.max(), 2)}')
 
     def calculate_linear(self):
-        self.rig = Rig(np.array([float(self.ui.rod_mount_x_linear.text()),
-                                 float(self.ui.rod_mount_y_linear.text()),
-                                 float(self.ui.rod_mount_z_linear.text())]),
-                       np.array([float(self.ui.lower_mount_x_linear.text()),
-                                 float(self.ui.lower_mount_y_linear.text()),
-                                 float(self.ui.lower_mount_z_linear.text())]),
-                       motor_torque=float(self.ui.motor_torque_linear.text()),
-                       motor_rpm=float(self.ui.motor_rpm_linear.text()),
-                       linear_travel=float(self.ui.linear_travel.text()),
-                       screw_pitch=float(self.ui.screw_pitch.text()),
-                       i_pitch=float(self.ui.i_pitch_linear.text()),
-                       i_roll=float(self.ui.i_roll_linear.text()),
-                       pitch_linear_rad=float(self.ui.pitch_linear_rad_linear.text()),
-                       roll_linear_rad=float(self.ui.roll_linear_rad_linear.text()),
-                       drive='linear')
-
-        self.rig.calculate()
+        self.start_calculation(self.linear_rig(), self.show_linear_results)
 
-        self.make_plots()
+    def linear_rig(self, plot_steps=16):
+        return Rig(**project.rig_kwargs(self.project_info(), LINEAR), plot_steps=plot_steps, cache=self.cache)
 
+    def show_linear_results(self):
         self.ui.zx_rodmount_angle_linear.setText(str(round(self.rig.zx_rodmount_angle_linear, 2)))
         self.ui.zx_pushrod_angle_linear.setText(str(round(self.rig.zx_pushrod_angle_linear, 2)))
         self.ui.xy_rodmount_pushrod_angle_linear.setText(str(round(self.rig.xy_rodmount_pushrod_angle_linear, 2)))
@@ -232,8 +382,8 @@ class CalcWindow(Widgets.QMainWindow):
         self.ui.max_roll_omega_linear.setText(str(round(self.rig.max_roll_speed, 2)))
         self.ui.pushrod_force_linear.setText(str(round(self.rig.max_pushrod_force, 2)))
         self.ui.pitch_roll_ratio_linear.setText(str(round(self.rig.pitch_roll_ratio, 4)))
-        self.ui.min_max_pitch_linear.setText(f'{round(min(self.rig.pitch), 2)} / {round(max(self.rig.pitch), 2)}')
-        self.ui.min_max_roll_linear.setText(f'{round(min(self.rig.roll), 2)} / {round(max(self.rig.roll), 2)}')
+        self.ui.min_max_pitch_linear.setText(f'{round(self.rig.pitch.min(), 2)} / {round(self.rig.pitch.max(), 2)}')
+        self.ui.min_max_roll_linear.setText(f'{round(self.rig.roll.min(), 2)} / {round(self.rig.roll.max(), 2)}')
 
 
 def run():
@@ -12,7 +12,6 @@ from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
-import main_window_rc
 
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
@@ -530,11 +529,8 @@ class Ui_MainWindow(object):
         MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"MotionVisualizer", None))
         self.actionSave.setText(QCoreApplication.translate("MainWindow", u"Save", None))
         self.actionOpen.setText(QCoreApplication.translate("MainWindow", u"Open", None))
-        self.whole_iso_label.setText(QCoreApplication.translate("MainWindow", u"<html><head/><body><p><img src=\":/images/images/whole_isometric.png\"/></p></body></html>", None))
         self.outputs_tab.setTabText(self.outputs_tab.indexOf(self.tab), QCoreApplication.translate("MainWindow", u"Iso Views", None))
-        self.label_2.setText(QCoreApplication.translate("MainWindow", u"<html><head/><body><p><img src=\":/images/images/front_view.png\"/></p></body></html>", None))
         self.outputs_tab.setTabText(self.outputs_tab.indexOf(self.tab_2), QCoreApplication.translate("MainWindow", u"Front Views", None))
-        self.label_4.setText(QCoreApplication.translate("MainWindow", u"<html><head/><body><p><img src=\":/images/images/top_view.png\"/></p></body></html>", None))
         self.outputs_tab.setTabText(self.outputs_tab.indexOf(self.tab_4), QCoreApplication.translate("MainWindow", u"Top Views", None))
         self.textBrowser.setHtml(QCoreApplication.translate("MainWindow", u"<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
 "<html><head><meta name=\"qrichtext\" content=\"1\" /><meta charset=\"utf-8\" /><style type=\"text/css\">\n"
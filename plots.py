@@ -0,0 +1,206 @@
+"""
+The output plots, built once and updated in place for each new result.
+"""
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from PySide6.QtGui import QCursor
+from PySide6.QtWidgets import QToolTip
+
+from rig import RigResults
+
+HOVER_RADIUS = 10  # pixels from a point that the cursor has to be within to pick it
+
+
+class PointIndex:
+    """
+    Finds the result point nearest a roll and pitch.
+
+    The spatial index is built the first time it's needed and then reused
+    for every lookup, so picking a point is a single tree query.
+    """
+
+    def __init__(self, results):
+        """
+        :param RigResults results: The results to search.
+        """
+
+        self.results = results
+        self._tree = None
+
+    def nearest(self, roll, pitch):
+        """
+        :param float roll: In degrees.
+        :param float pitch: In degrees.
+        :return: The index of the nearest point, or None if no point has a
+        finite roll and pitch.
+        """
+
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+
+            points = np.column_stack((self.results.roll, self.results.pitch))
+            self._finite = np.flatnonzero(np.all(np.isfinite(points), axis=1))
+            self._tree = cKDTree(points[self._finite])
+
+        if not self._finite.size:
+            return None
+
+        _, i = self._tree.query((roll, pitch))
+        return int(self._finite[i])
+
+    def describe(self, i):
+        """
+        :param int i: The index of a point.
+        :return: Every result at the point, one per line.
+        """
+
+        return '\n'.join(f'{name.replace("_", " ").capitalize()}: {self.results[name][i]:.4g}'
+                         for name in RigResults.FIELDS)
+
+
+class ResultFigure:
+    """
+    A figure with two scatter plots of values over the rocker's roll and
+    pitch, one above the other, each with a colorbar.
+    """
+
+    def __init__(self, title1, title2, figure_title, canvas_class=FigureCanvasAgg):
+        """
+        :param str title1: The title of the upper plot.
+        :param str title2: The title of the lower plot.
+        :param str figure_title: The title of the whole figure.
+        :param type canvas_class: The matplotlib canvas to draw on.
+        """
+
+        self.figure = Figure(figsize=(6, 8), dpi=100)
+        self.canvas = canvas_class(self.figure)
+
+        self.axes = self.figure.subplots(2, 1)
+        self.figure.set_figheight(5)
+
+        self.scatters = []
+        self.colorbars = []
+        for ax, title in zip(self.axes, (title1, title2)):
+            scatter = ax.scatter([], [], s=50, c=[])
+            ax.set_aspect('equal', 'box')
+            ax.set_title(title, fontsize=10)
+            ax.set_xlabel('Degrees of Roll')
+            ax.set_ylabel('Degrees of Pitch')
+            self.scatters.append(scatter)
+            self.colorbars.append(self.figure.colorbar(scatter, ax=ax))
+
+        self.figure.suptitle(figure_title)
+
+        self.figure.subplots_adjust(wspace=0.4, hspace=0.4)
+
+    def update(self, roll, pitch, data1, data2):
+        """
+        Replaces the plotted points and rescales the axes and colorbars to fit them.
+
+        :param array[float] roll: The roll of each point, in degrees.
+        :param array[float] pitch: The pitch of each point, in degrees.
+        :param array[float] data1: The upper plot's value at each point.
+        :param array[float] data2: The lower plot's value at each point.
+        :return: None
+        """
+
+        offsets = np.column_stack((roll, pitch))
+        for ax, scatter, colorbar, data in zip(self.axes, self.scatters, self.colorbars, (data1, data2)):
+            scatter.set_offsets(offsets)
+            scatter.set_array(np.asarray(data))
+            scatter.autoscale()
+            colorbar.update_normal(scatter)
+
+            ax.ignore_existing_data_limits = True
+            ax.update_datalim(offsets)
+            ax.autoscale_view()
+
+
+class ResultCanvas(ResultFigure):
+    """
+    A ResultFigure on an interactive Qt canvas. Hovering over a point
+    highlights it in both plots and shows every result at it in a tooltip.
+
+    The highlights are blitted over a saved copy of the figure, so hovering
+    never redraws the plots.
+    """
+
+    def __init__(self, title1, title2, figure_title):
+        """
+        :param str title1: The title of the upper plot.
+        :param str title2: The title of the lower plot.
+        :param str figure_title: The title of the whole figure.
+        """
+
+        super().__init__(title1, title2, figure_title, canvas_class=FigureCanvasQTAgg)
+
+        self.index = None
+        self._background = None
+        self.highlights = [ax.plot([], [], 'o', markersize=10, markerfacecolor='none', markeredgecolor='red',
+                                   animated=True)[0]
+                           for ax in self.axes]
+
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('motion_notify_event', self._on_motion)
+        self.canvas.mpl_connect('figure_leave_event', self._on_leave)
+
+    def set_index(self, index):
+        """
+        :param PointIndex index: The results that are plotted, for hovering.
+        :return: None
+        """
+
+        self.index = index
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+    def _blit(self, point=None):
+        if self._background is None:
+            return
+
+        self.canvas.restore_region(self._background)
+        for highlight in self.highlights:
+            highlight.set_data(*(([point[0]], [point[1]]) if point is not None else ([], [])))
+            highlight.axes.draw_artist(highlight)
+        self.canvas.blit(self.figure.bbox)
+
+    def pick(self, ax, x, y):
+        """
+        Finds the plotted point under a position on the canvas.
+
+        :param Axes ax: The plot the position is in.
+        :param float x: The position in display coordinates.
+        :param float y: The position in display coordinates.
+        :return: The index of the point, or None if there isn't one within HOVER_RADIUS.
+        """
+
+        if self.index is None or ax not in self.axes:
+            return None
+
+        roll, pitch = ax.transData.inverted().transform((x, y))
+        i = self.index.nearest(roll, pitch)
+        if i is None:
+            return None
+
+        point = ax.transData.transform((self.index.results.roll[i], self.index.results.pitch[i]))
+        if np.hypot(point[0] - x, point[1] - y) > HOVER_RADIUS * self.canvas.device_pixel_ratio:
+            return None
+
+        return i
+
+    def _on_motion(self, event):
+        i = self.pick(event.inaxes, event.x, event.y)
+        if i is None:
+            self._on_leave(event)
+            return
+
+        self._blit((self.index.results.roll[i], self.index.results.pitch[i]))
+        QToolTip.showText(QCursor.pos(), self.index.describe(i), self.canvas)
+
+    def _on_leave(self, event):
+        self._blit()
+        QToolTip.hideText()
@@ -0,0 +1,205 @@
+"""
+Reads and writes MotionVisualizer project (.mv) files and turns them into
+Rig arguments, without the GUI.
+
+A project holds every input field's value, by the field's name, and the
+selected input and output tabs. The input tab picks the drive.
+
+A project file is a zip of project.json, which has the format version and
+the inputs, and optionally the solved kinematics of the project's Rig as
+.npy files. The kinematics are keyed by a hash of the Rig's geometry and
+the solver version, so they're only used if they'd be solved the same
+today. The first format, a flat JSON object of the fields' text, is still
+read.
+"""
+
+import io
+import json
+import zipfile
+
+import numpy as np
+
+from cache import ARRAYS, geometry_key
+from rig import CTC, LINEAR, RigKinematics
+
+FORMAT_VERSION = 2
+
+CTC_FIELDS = ('rod_mount_x_ctc', 'rod_mount_y_ctc', 'rod_mount_z_ctc',
+              'motor_x', 'motor_y', 'motor_z', 'motor_angle',
+              'ctc_length', 'ctc_neutral_angle', 'ctc_rotation',
+              'motor_torque_ctc', 'motor_rpm_ctc', 'i_pitch_ctc', 'i_roll_ctc',
+              'pitch_linear_rad_ctc', 'roll_linear_rad_ctc')
+LINEAR_FIELDS = ('rod_mount_x_linear', 'rod_mount_y_linear', 'rod_mount_z_linear',
+                 'lower_mount_x_linear', 'lower_mount_y_linear', 'lower_mount_z_linear',
+                 'linear_travel', 'screw_pitch', 'motor_torque_linear', 'motor_rpm_linear',
+                 'i_pitch_linear', 'i_roll_linear',
+                 'pitch_linear_rad_linear', 'roll_linear_rad_linear')
+TAB_FIELDS = ('inputs_tab_index', 'outputs_tab_index')
+
+FIELDS = CTC_FIELDS + LINEAR_FIELDS + TAB_FIELDS
+
+# the Rig argument that each field is, other than the Rod Mount and lower pivot
+CTC_ARGUMENTS = {'motor_angle': 'motor_angle',
+                 'motor_torque': 'motor_torque_ctc',
+                 'motor_rpm': 'motor_rpm_ctc',
+                 'ctc_length': 'ctc_length',
+                 'ctc_neutral_angle': 'ctc_neutral_angle',
+                 'ctc_total_rotation': 'ctc_rotation',
+                 'i_pitch': 'i_pitch_ctc',
+                 'i_roll': 'i_roll_ctc',
+                 'pitch_linear_rad': 'pitch_linear_rad_ctc',
+                 'roll_linear_rad': 'roll_linear_rad_ctc'}
+LINEAR_ARGUMENTS = {'motor_torque': 'motor_torque_linear',
+                    'motor_rpm': 'motor_rpm_linear',
+                    'linear_travel': 'linear_travel',
+                    'screw_pitch': 'screw_pitch',
+                    'i_pitch': 'i_pitch_linear',
+                    'i_roll': 'i_roll_linear',
+                    'pitch_linear_rad': 'pitch_linear_rad_linear',
+                    'roll_linear_rad': 'roll_linear_rad_linear'}
+
+
+def field_text(value):
+    """
+    :param value: A field's value.
+    :return: The text to show in the field.
+    """
+
+    return value if isinstance(value, str) else f'{value:.10g}'
+
+
+def _typed(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value  # kept as typed, so it isn't lost
+
+
+def migrate(old):
+    """
+    Converts a project from the first format, where every value is text.
+
+    :param dict old: The fields.
+    :return: The fields, with numbers as numbers. Text that isn't a number is kept.
+    """
+
+    info = {name: _typed(value) for name, value in old.items() if name not in TAB_FIELDS}
+    for name in TAB_FIELDS:
+        info[name] = int(old.get(name, 0))
+
+    return info
+
+
+def load(path):
+    """
+    :param str path: The .mv file.
+    :return: A dict of the project's fields.
+    """
+
+    if not zipfile.is_zipfile(path):
+        with open(path, 'r') as f:
+            return migrate(json.loads(f.read()))
+
+    with zipfile.ZipFile(path) as z:
+        contents = json.loads(z.read('project.json'))
+
+    if contents['format_version'] > FORMAT_VERSION:
+        raise ValueError(f'{path} is from a newer version of MotionVisualizer.')
+
+    info = dict(contents['inputs'])
+    for name in TAB_FIELDS:
+        info[name] = contents[name]
+
+    return info
+
+
+def load_kinematics(path, geometry):
+    """
+    Gets the kinematics saved with a project, if they're of a geometry.
+
+    :param str path: The .mv file.
+    :param dict geometry: Rig.geometry.
+    :return: A RigKinematics, or None if there aren't any or they're of a
+    different geometry or solver version.
+    """
+
+    if not zipfile.is_zipfile(path):
+        return None
+
+    with zipfile.ZipFile(path) as z:
+        results = json.loads(z.read('project.json')).get('results')
+        if results is None or results['key'] != geometry_key(geometry):
+            return None
+
+        arrays = {name: np.load(io.BytesIO(z.read(f'kinematics/{name}.npy'))) for name in ARRAYS}
+
+    shape = tuple(results['shape']) if results['shape'] is not None else None
+    end_stop_angles = results.get('end_stop_angles')
+    end_stop_angles = tuple(end_stop_angles) if end_stop_angles is not None else None
+    return RigKinematics(shape=shape, end_stop_angles=end_stop_angles, **arrays)
+
+
+def save(path, info, rig=None):
+    """
+    :param str path: The .mv file.
+    :param dict info: The project's fields.
+    :param Rig rig: A solved Rig whose kinematics are saved with the project.
+    :return: None
+    """
+
+    contents = {'format_version': FORMAT_VERSION,
+                'inputs': {name: _typed(info[name]) for name in CTC_FIELDS + LINEAR_FIELDS},
+                'results': None}
+    for name in TAB_FIELDS:
+        contents[name] = int(info[name])
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+        if rig is not None:
+            kinematics = rig.kinematics
+            contents['results'] = {'key': geometry_key(rig.geometry), 'shape': kinematics.shape,
+                                   'end_stop_angles': kinematics.end_stop_angles}
+            for name in ARRAYS:
+                buffer = io.BytesIO()
+                np.save(buffer, np.asarray(getattr(kinematics, name)))
+                z.writestr(f'kinematics/{name}.npy', buffer.getvalue())
+
+        z.writestr('project.json', json.dumps(contents, indent=1))
+
+
+def project_drive(info):
+    """
+    :param dict info: A project's fields.
+    :return: CTC or LINEAR, whichever input tab was selected.
+    """
+
+    return CTC if int(info['inputs_tab_index']) == 0 else LINEAR
+
+
+def rig_kwargs(info, drive=None):
+    """
+    Gets the Rig arguments of a project.
+
+    :param dict info: The project's fields.
+    :param str drive: CTC or LINEAR. Defaults to the project's drive.
+    :return: A dict of keyword arguments for Rig.
+    """
+
+    if drive is None:
+        drive = project_drive(info)
+
+    if drive == CTC:
+        kwargs = {'rod_mount': np.array([float(info[f'rod_mount_{axis}_ctc']) for axis in 'xyz']),
+                  'lower_pivot': np.array([float(info[f'motor_{axis}']) for axis in 'xyz'])}
+        arguments = CTC_ARGUMENTS
+    elif drive == LINEAR:
+        kwargs = {'rod_mount': np.array([float(info[f'rod_mount_{axis}_linear']) for axis in 'xyz']),
+                  'lower_pivot': np.array([float(info[f'lower_mount_{axis}_linear']) for axis in 'xyz'])}
+        arguments = LINEAR_ARGUMENTS
+    else:
+        raise ValueError(f'Unknown drive {drive!r}.')
+
+    for argument, field in arguments.items():
+        kwargs[argument] = float(info[field])
+    kwargs['drive'] = drive
+
+    return kwargs
@@ -1,21 +1,248 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-from scipy.optimize import fsolve
+
+from lookup import LookupTable
 
 CTC = 'ctc'
 LINEAR = 'linear'
 
+IMPLICIT = 'implicit'
+NUMERICAL = 'numerical'
+
+ADAPTIVE_LEVELS = 4  # the most times a cell of the starting grid is halved
+LOOKUP_POINTS = 257  # along each side of an inverse kinematics lookup table
+
+# the inputs that only scale the kinematics, see Rig.update_drive
+DRIVE_VALUES = ('motor_torque', 'motor_rpm', 'i_pitch', 'i_roll', 'pitch_linear_rad', 'roll_linear_rad')
+
+
+class RigResults:
+    """
+    The per point results of a Rig.
+
+    Every field is a float64 array with one value per point, and all of
+    them are rows of one preallocated, contiguous block. The Nth value of
+    each field references the same point. Fields can be accessed as
+    attributes or by name, and as 2D, grid shaped views when the points are
+    a regular grid.
+    """
+
+    FIELDS = ('pitch', 'roll',
+              'pitch_torque', 'roll_torque',
+              'pitch_omega', 'roll_omega',
+              'pitch_alpha', 'roll_alpha',
+              'pitch_linear_speed', 'roll_linear_speed',
+              'pitch_linear_acc', 'roll_linear_acc',
+              'pushrod_force')
+
+    __slots__ = FIELDS + ('data', 'shape')
+
+    def __init__(self, size, shape=None):
+        """
+        :param int size: The number of points.
+        :param tuple[int, int] shape: The shape of the grid, if the points are
+        a regular grid with the first actuator's position changing slowest.
+        """
+
+        self.data = np.empty((len(self.FIELDS), size))
+        self.shape = shape
+
+        for name, row in zip(self.FIELDS, self.data):
+            setattr(self, name, row)
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def __getitem__(self, name):
+        if name not in self.FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def grid(self, name):
+        """
+        Gets a field as a view shaped like the grid.
+
+        :param str name: The name of the field.
+        :return: A 2D array indexed by the first and then second actuator's position.
+        """
+
+        if self.shape is None:
+            raise ValueError('The results are not on a regular grid.')
+        return self[name].reshape(self.shape)
+
+
+class RigKinematics:
+    """
+    The purely geometric solution of a Rig.
+
+    Holds everything about each point that doesn't depend on the motor or
+    inertia, so the results can be rescaled when only those change.
+    """
+
+    __slots__ = ('positions1', 'positions2',
+                 'rod_mounts1', 'rod_mounts2',
+                 'pitch_ratios', 'roll_ratios',
+                 'pitch', 'roll', 'pushrod_arms',
+                 'shape', 'end_stop_angles')
+
+    def __init__(self, positions1, positions2, rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios,
+                 pitch, roll, pushrod_arms, shape=None, end_stop_angles=None):
+        """
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param array[N, 3] rod_mounts1: The first Rod Mounts.
+        :param array[N, 3] rod_mounts2: The second Rod Mounts.
+        :param array[float] pitch_ratios: dpitch / dmotor angle.
+        :param array[float] roll_ratios: droll / dmotor angle.
+        :param array[float] pitch: The pitch, in radians, from the nominal position.
+        :param array[float] roll: The roll, in radians.
+        :param array[float] pushrod_arms: The pitch torque to first pushrod force
+        ratio, times 4.
+        :param tuple[int, int] shape: The shape of the grid, if the points are a
+        regular grid.
+        :param tuple[float, float] end_stop_angles: For a CTC, the
+        max_ctc_pushrod_angle and min_ctc_pushrod_angle, in degrees. Found
+        again if they're None.
+        """
+
+        self.positions1 = positions1
+        self.positions2 = positions2
+        self.rod_mounts1 = rod_mounts1
+        self.rod_mounts2 = rod_mounts2
+        self.pitch_ratios = pitch_ratios
+        self.roll_ratios = roll_ratios
+        self.pitch = pitch
+        self.roll = roll
+        self.pushrod_arms = pushrod_arms
+        self.shape = shape
+        self.end_stop_angles = end_stop_angles
+
+    def __len__(self):
+        return len(self.positions1)
+
+
+class RodMountMemo:
+    """
+    A bounded memo of solved Rod Mount positions, shared by every Rig in the
+    process so that a point solved once, in this or an earlier calculate(),
+    is only looked up after that.
+
+    Points are keyed by the Rig's geometry and its actuator positions rounded
+    to a number of decimals. The least recently used points are dropped once
+    there are max_size of them. It's safe to use from several threads.
+
+    It only pays for itself when the same geometry is solved again without a
+    KinematicsCache, so Rigs don't use it unless they're made with memoize=True.
+    """
+
+    def __init__(self, max_size=5000, decimals=10):
+        """
+        :param int max_size: The most points to remember.
+        :param int decimals: The decimals actuator positions are rounded to.
+        """
+
+        self.max_size = max_size
+        self.decimals = decimals
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self, identity, positions1, positions2):
+        """
+        :param tuple identity: Everything about the Rig the solution depends on.
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :return: A list of keys, one per point.
+        """
+
+        return [(identity, position1, position2)
+                for position1, position2 in zip(np.round(positions1, self.decimals).tolist(),
+                                                np.round(positions2, self.decimals).tolist())]
+
+    def lookup(self, keys, rod_mounts1, rod_mounts2):
+        """
+        Fills in the remembered points.
+
+        :param list keys: The keys of the points.
+        :param array[N, 3] rod_mounts1: Where to put the first Rod Mounts.
+        :param array[N, 3] rod_mounts2: Where to put the second Rod Mounts.
+        :return: The indices of the points that aren't remembered, as an array.
+        """
+
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self.entries.get(key)
+                if entry is None:
+                    missing.append(i)
+                else:
+                    self.entries.move_to_end(key)
+                    rod_mounts1[i], rod_mounts2[i] = entry
+
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        return np.array(missing, dtype=int)
+
+    def store(self, keys, rod_mounts1, rod_mounts2):
+        """
+        :param list keys: The keys of the points.
+        :param array[N, 3] rod_mounts1: The first Rod Mounts.
+        :param array[N, 3] rod_mounts2: The second Rod Mounts.
+        :return: None
+        """
+
+        with self._lock:
+            # each point gets its own small array, so the solve's arrays aren't kept alive
+            for key, rod_mount1, rod_mount2 in zip(keys, rod_mounts1, rod_mounts2):
+                self.entries[key] = (np.array(rod_mount1), np.array(rod_mount2))
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        """
+        :return: A dict of the number of hits, misses and remembered points.
+        """
+
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+    def clear(self):
+        """
+        Forgets every point and resets the counters.
+
+        :return: None
+        """
+
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+ROD_MOUNT_MEMO = RodMountMemo()
+
 
 class Rig:
     def __init__(self, rod_mount, lower_pivot, motor_angle=0, motor_torque=0, motor_rpm=0,
                  ctc_length=0, ctc_neutral_angle=0, ctc_total_rotation=0,
                  linear_travel=0, screw_pitch=0, i_pitch=0, i_roll=0,
                  pitch_linear_rad=0, roll_linear_rad=0,
-                 drive=''):
+                 drive='', ratio_method=IMPLICIT,
+                 plot_steps=16, adaptive=False, max_points=2000, refine_tolerance=0.05,
+                 workers=1, cache=None, memoize=False):
         self.lower_pivot1 = lower_pivot
         self.lower_pivot2 = np.copy(lower_pivot)
         self.lower_pivot2[2] *= -1
 
-        plot_steps = 16  # must be even for max speed to be calculated
+        self.plot_steps = plot_steps  # must be even for max speed to be calculated
         if drive == CTC:
             self.motor1_angle = np.radians(motor_angle)
             self.motor2_angle = -np.radians(motor_angle)
@@ -60,6 +287,59 @@ class Rig:
         self.roll_linear_rad = roll_linear_rad
 
         self.drive = drive
+        self.ratio_method = ratio_method
+
+        self.adaptive = adaptive
+        self.max_points = max_points
+        self.refine_tolerance = refine_tolerance
+
+        self.workers = workers  # more than 1 solves the grid, adaptive or not, across that many processes
+        self.cache = cache  # a cache.KinematicsCache to load and store solutions in
+        self.memoize = memoize  # remember solved points in ROD_MOUNT_MEMO
+        self.progress = None  # called with the fraction done while solving, see calculate
+
+        # everything the kinematics depend on, as given, to tell when they can be reused
+        self.geometry = {'drive': drive,
+                         'rod_mount': tuple(float(v) for v in rod_mount),
+                         'lower_pivot': tuple(float(v) for v in lower_pivot),
+                         'motor_angle': float(motor_angle),
+                         'ctc_length': float(ctc_length),
+                         'ctc_neutral_angle': float(ctc_neutral_angle),
+                         'ctc_total_rotation': float(ctc_total_rotation),
+                         'linear_travel': float(linear_travel),
+                         'screw_pitch': float(screw_pitch),
+                         'ratio_method': ratio_method,
+                         'plot_steps': int(plot_steps),
+                         'adaptive': bool(adaptive),
+                         'max_points': int(max_points),
+                         'refine_tolerance': float(refine_tolerance)}
+
+        # everything the Rod Mount positions at given actuator positions depend on,
+        # including the pushrod length, which the CTC's neutral angle sets
+        if drive == CTC:
+            pushrod_length = float(self.pushrod_length)
+        else:
+            pushrod_length = 0.
+        self.solve_identity = tuple(self.geometry[name] for name in
+                                    ('drive', 'rod_mount', 'lower_pivot', 'motor_angle', 'ctc_length'))
+        self.solve_identity += (pushrod_length,)
+
+    def __getstate__(self):
+        # the progress callback belongs to the calling process, so it isn't sent to workers
+        state = self.__dict__.copy()
+        state['progress'] = None
+        return state
+
+    def _report_progress(self, fraction):
+        """
+        Passes the fraction of the solve that's done to self.progress, if there is one.
+
+        :param float fraction: From 0 to 1.
+        :return: None
+        """
+
+        if self.progress is not None:
+            self.progress(fraction)
 
     @staticmethod
     def _calc_length(point1, point2=np.zeros(3)):
@@ -140,6 +420,8 @@ class Rig:
             a = 9
         estimated_coords = x1, x2, y1, y2, z1, z2
         estimated_coords = [v if abs(v) > 1e-5 else 0 for v in estimated_coords]
+        # only needed for the points the batched solvers can't solve, so scipy isn't imported until then
+        from scipy.optimize import fsolve
         x1, x2, y1, y2, z1, z2 = fsolve(equations, estimated_coords,
                                         (self.rod_mount_length,
                                          pushrod1,
@@ -151,6 +433,419 @@ class Rig:
 
         return np.array([x1, y1, z1]), np.array([x2, y2, z2])
 
+    def _calc_lower_mounts(self, positions1, positions2):
+        """
+        Calculates the lower end of both pushrods and the pushrod lengths for
+        arrays of CTC angles or linear actuator lengths.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :return: A tuple of the lower mounts, as N x 3 arrays, and the pushrod
+        lengths, as length N arrays, in the form mount1, mount2, pushrod1, pushrod2.
+        """
+
+        positions1 = np.asarray(positions1, dtype=float)
+        positions2 = np.asarray(positions2, dtype=float)
+
+        if self.drive == CTC:
+            mounts1 = self._calc_ctc_location(self.lower_pivot1, self.motor1_angle, positions1).T
+            mounts2 = self._calc_ctc_location(self.lower_pivot2, self.motor2_angle, positions2).T
+            pushrods1 = np.full(positions1.shape, float(self.pushrod_length))
+            pushrods2 = np.full(positions2.shape, float(self.pushrod_length))
+        elif self.drive == LINEAR:
+            mounts1 = np.broadcast_to(self.lower_pivot1, positions1.shape + (3,)).astype(float)
+            mounts2 = np.broadcast_to(self.lower_pivot2, positions2.shape + (3,)).astype(float)
+            pushrods1 = positions1
+            pushrods2 = positions2
+
+        return mounts1, mounts2, pushrods1, pushrods2
+
+    @staticmethod
+    def _closure_residuals(p, rod_mount_length, pushrods1, pushrods2, rod_mount_spacing, mounts1, mounts2):
+        """
+        The Rod Mount closure equations evaluated for many points at once.
+
+        Identical to the equations solved by _calc_rod_mount_points, just
+        broadcast over the first axis.
+
+        :param array[N, 6] p: The unknowns in the form X1, X2, Y1, Y2, Z1, Z2.
+        :param float rod_mount_length: The distance from the pivot to each Rod Mount.
+        :param array[float] pushrods1: The first pushrod lengths.
+        :param array[float] pushrods2: The second pushrod lengths.
+        :param float rod_mount_spacing: The distance between the two Rod Mounts.
+        :param array[N, 3] mounts1: The lower ends of the first pushrods.
+        :param array[N, 3] mounts2: The lower ends of the second pushrods.
+        :return: The residuals as an N x 6 array.
+        """
+
+        x1, x2, y1, y2, z1, z2 = p.T
+
+        return np.stack((rod_mount_length ** 2 - (x1 ** 2 + y1 ** 2 + z1 ** 2),
+                         rod_mount_length ** 2 - (x2 ** 2 + y2 ** 2 + z2 ** 2),
+                         rod_mount_spacing ** 2 - ((x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2),
+                         pushrods1 ** 2 - ((x1 - mounts1[:, 0]) ** 2
+                                           + (y1 - mounts1[:, 1]) ** 2
+                                           + (z1 - mounts1[:, 2]) ** 2),
+                         pushrods2 ** 2 - ((x2 - mounts2[:, 0]) ** 2
+                                           + (y2 - mounts2[:, 1]) ** 2
+                                           + (z2 - mounts2[:, 2]) ** 2),
+                         x1 - x2),
+                        axis=-1)
+
+    @staticmethod
+    def _closure_jacobian(p, mounts1, mounts2):
+        """
+        The analytic Jacobian of _closure_residuals with respect to the unknowns.
+
+        :param array[N, 6] p: The unknowns in the form X1, X2, Y1, Y2, Z1, Z2.
+        :param array[N, 3] mounts1: The lower ends of the first pushrods.
+        :param array[N, 3] mounts2: The lower ends of the second pushrods.
+        :return: The Jacobian as an N x 6 x 6 array.
+        """
+
+        x1, x2, y1, y2, z1, z2 = p.T
+        dx, dy, dz = x2 - x1, y2 - y1, z2 - z1
+
+        jacobian = np.zeros(p.shape + (6,))
+        jacobian[:, 0, 0], jacobian[:, 0, 2], jacobian[:, 0, 4] = -2 * x1, -2 * y1, -2 * z1
+        jacobian[:, 1, 1], jacobian[:, 1, 3], jacobian[:, 1, 5] = -2 * x2, -2 * y2, -2 * z2
+        jacobian[:, 2, 0], jacobian[:, 2, 2], jacobian[:, 2, 4] = 2 * dx, 2 * dy, 2 * dz
+        jacobian[:, 2, 1], jacobian[:, 2, 3], jacobian[:, 2, 5] = -2 * dx, -2 * dy, -2 * dz
+        jacobian[:, 3, 0] = -2 * (x1 - mounts1[:, 0])
+        jacobian[:, 3, 2] = -2 * (y1 - mounts1[:, 1])
+        jacobian[:, 3, 4] = -2 * (z1 - mounts1[:, 2])
+        jacobian[:, 4, 1] = -2 * (x2 - mounts2[:, 0])
+        jacobian[:, 4, 3] = -2 * (y2 - mounts2[:, 1])
+        jacobian[:, 4, 5] = -2 * (z2 - mounts2[:, 2])
+        jacobian[:, 5, 0], jacobian[:, 5, 1] = 1, -1
+
+        return jacobian
+
+    def _calc_rod_mount_points_batch(self, positions1, positions2, estimated_points,
+                                     tolerance=1e-12, max_iterations=50):
+        """
+        Calculates the Rod Mount positions for arrays of CTC angles or linear
+        actuator lengths at once.
+
+        Runs Newton's method on the same equations as _calc_rod_mount_points,
+        for every point simultaneously, using the analytic Jacobian. Each point
+        stops iterating once it has converged. Any point that doesn't converge
+        is handed to _calc_rod_mount_points.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param tuple[array, array] estimated_points: Estimated locations of the two
+        Rod Mounts, either a single pair of points or a pair of N x 3 arrays.
+        :param float tolerance: The relative step size at which a point is converged.
+        :param int max_iterations: The most Newton steps that are taken.
+        :return: The two Rod Mounts, as N x 3 arrays, and a boolean array flagging
+        the points that converged.
+        """
+
+        positions1, positions2 = np.broadcast_arrays(np.atleast_1d(np.asarray(positions1, dtype=float)),
+                                                     np.atleast_1d(np.asarray(positions2, dtype=float)))
+        n = positions1.size
+        mounts1, mounts2, pushrods1, pushrods2 = self._calc_lower_mounts(positions1.ravel(), positions2.ravel())
+        args = (self.rod_mount_length, pushrods1, pushrods2, self.rod_mount_width, mounts1, mounts2)
+
+        estimate1 = np.broadcast_to(estimated_points[0], (n, 3))
+        estimate2 = np.broadcast_to(estimated_points[1], (n, 3))
+        p = np.stack((estimate1[:, 0], estimate2[:, 0],
+                      estimate1[:, 1], estimate2[:, 1],
+                      estimate1[:, 2], estimate2[:, 2]), axis=-1)
+
+        converged = np.zeros(n, dtype=bool)
+        active = np.arange(n)
+        scale = self.rod_mount_length
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+
+            sub_args = (args[0], args[1][active], args[2][active], args[3], args[4][active], args[5][active])
+            residuals = self._closure_residuals(p[active], *sub_args)
+            jacobian = self._closure_jacobian(p[active], sub_args[4], sub_args[5])
+            step, solved = self._solve_linear_batch(jacobian, -residuals)
+
+            p[active[solved]] += step[solved]
+            finite = np.all(np.isfinite(p[active]), axis=-1)
+            small = np.max(np.abs(step), axis=-1) <= tolerance * scale
+            done = solved & finite & small
+            converged[active[done]] = True
+            active = active[solved & finite & ~small]
+
+        rod_mounts1 = p[:, [0, 2, 4]]
+        rod_mounts2 = p[:, [1, 3, 5]]
+
+        for i in np.flatnonzero(~converged):
+            estimate = (estimate1[i], estimate2[i])
+            rod_mount1, rod_mount2 = self._calc_rod_mount_points(positions1.flat[i], positions2.flat[i], estimate)
+            rod_mounts1[i], rod_mounts2[i] = rod_mount1, rod_mount2
+            p_i = np.array([[rod_mount1[0], rod_mount2[0], rod_mount1[1], rod_mount2[1], rod_mount1[2], rod_mount2[2]]])
+            residual = self._closure_residuals(p_i, args[0], args[1][i:i + 1], args[2][i:i + 1], args[3],
+                                               args[4][i:i + 1], args[5][i:i + 1])
+            converged[i] = np.max(np.abs(residual)) <= 1e-9 * scale ** 2
+
+        return rod_mounts1, rod_mounts2, converged
+
+    @staticmethod
+    def _solve_linear_batch(a, b):
+        """
+        Solves a stack of small linear systems, tolerating singular members.
+
+        :param array[N, M, M] a: The stacked matrices.
+        :param array[N, M] b: The stacked right hand sides.
+        :return: The N x M solutions and a boolean array flagging the systems
+        that could be solved. Unsolved rows are zero.
+        """
+
+        try:
+            return np.linalg.solve(a, b[..., None])[..., 0], np.ones(len(b), dtype=bool)
+        except np.linalg.LinAlgError:
+            x = np.zeros_like(b)
+            solved = np.zeros(len(b), dtype=bool)
+            for i in range(len(b)):
+                try:
+                    x[i] = np.linalg.solve(a[i], b[i])
+                    solved[i] = True
+                except np.linalg.LinAlgError:
+                    pass
+            return x, solved
+
+    def _calc_rod_mounts_from_pitch_and_roll(self, pitch, roll):
+        """
+        Calculates the Rod Mount positions from the rocker's orientation.
+
+        The Rod Mounts are fixed to the rocker, so their position is set by the
+        pitch and roll alone. It's the inverse of _calc_pitch_and_roll.
+
+        :param array[float] pitch: The pitch, in radians, measured from the
+        horizontal rather than from the nominal position.
+        :param array[float] roll: The roll, in radians.
+        :return: The two Rod Mounts as N x 3 arrays.
+        """
+
+        pitch, roll = np.broadcast_arrays(np.atleast_1d(np.asarray(pitch, dtype=float)),
+                                          np.atleast_1d(np.asarray(roll, dtype=float)))
+        radius = (self.rod_mount[0] ** 2 + self.rod_mount[1] ** 2) ** 0.5
+        half_width = self.rod_mount_width / 2
+
+        midpoint = np.stack((radius * np.cos(pitch),
+                             radius * np.sin(pitch) * np.cos(roll),
+                             -radius * np.sin(pitch) * np.sin(roll)), axis=-1)
+        offset = np.stack((np.zeros(roll.shape),
+                           half_width * np.sin(roll),
+                           half_width * np.cos(roll)), axis=-1)
+
+        return midpoint + offset, midpoint - offset
+
+    def _calc_symmetric_pitch(self, positions, estimated_pitch):
+        """
+        Calculates the pitch, in closed form, when both actuators are in the
+        same position, and so the roll is zero.
+
+        Each pushrod then leaves a single equation in the form
+        A * cos(pitch) + B * sin(pitch) = C, which has up to two solutions.
+        The one closest to the estimate is used.
+
+        :param array[float] positions: The CTC angles or linear actuator lengths.
+        :param array[float] estimated_pitch: The estimated pitch, in radians,
+        measured from the horizontal.
+        :return: The pitch, in radians, measured from the horizontal. NaN where
+        the pushrod can't reach the rocker.
+        """
+
+        positions = np.atleast_1d(np.asarray(positions, dtype=float))
+        mounts, _, pushrods, _ = self._calc_lower_mounts(positions, positions)
+        radius = (self.rod_mount[0] ** 2 + self.rod_mount[1] ** 2) ** 0.5
+        half_width = self.rod_mount_width / 2
+
+        a = radius * mounts[:, 0]
+        b = radius * mounts[:, 1]
+        c = (self.rod_mount_length ** 2 + np.sum(mounts ** 2, axis=-1) - pushrods ** 2) / 2 - half_width * mounts[:, 2]
+
+        return self._solve_harmonic(a, b, c, estimated_pitch)
+
+    @staticmethod
+    def _solve_harmonic(a, b, c, estimate):
+        """
+        Solves A * cos(angle) + B * sin(angle) = C, keeping whichever of the
+        two solutions is closest to the estimate.
+
+        :param array[float] a: A.
+        :param array[float] b: B.
+        :param array[float] c: C.
+        :param array[float] estimate: The estimated angle, in radians.
+        :return: The angle, in radians. NaN where there's no solution.
+        """
+
+        with np.errstate(invalid='ignore'):
+            spread = np.arccos(c / (a ** 2 + b ** 2) ** 0.5)
+        base = np.arctan2(b, a)
+        solutions = np.stack((base + spread, base - spread), axis=-1)
+
+        # wrap the solutions to be within pi of the estimate before picking the closest
+        estimate = np.broadcast_to(estimate, base.shape)[:, None]
+        solutions = estimate + (solutions - estimate + np.pi) % (2 * np.pi) - np.pi
+        closest = np.argmin(np.abs(solutions - estimate), axis=-1)
+
+        return np.take_along_axis(solutions, closest[:, None], axis=-1)[:, 0]
+
+    def _calc_rod_mount_points_reduced(self, positions1, positions2, estimated_points,
+                                       tolerance=1e-12, max_iterations=50):
+        """
+        Calculates the Rod Mount positions for arrays of CTC angles or linear
+        actuator lengths at once, using the rocker's pitch and roll as the
+        only unknowns.
+
+        The Rod Mounts sit on a rigid rocker, so the first three closure
+        equations and X1 == X2 are satisfied by construction and only the two
+        pushrod equations are left. Since each Rod Mount is a fixed distance
+        from the pivot, the pushrod equations are linear in the Rod Mount
+        position, ie. rod_mount . mount = (rod_mount_length^2 + |mount|^2 - pushrod^2) / 2.
+        Points where both actuators are in the same position are solved in
+        closed form, the rest by Newton's method on the 2 unknowns.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param tuple[array, array] estimated_points: Estimated locations of the two
+        Rod Mounts, either a single pair of points or a pair of N x 3 arrays.
+        :param float tolerance: The step size, in radians, at which a point is converged.
+        :param int max_iterations: The most Newton steps that are taken.
+        :return: The two Rod Mounts, as N x 3 arrays, and a boolean array flagging
+        the points that converged.
+        """
+
+        positions1, positions2 = np.broadcast_arrays(np.atleast_1d(np.asarray(positions1, dtype=float)),
+                                                     np.atleast_1d(np.asarray(positions2, dtype=float)))
+        positions1, positions2 = positions1.ravel(), positions2.ravel()
+        n = positions1.size
+        mounts1, mounts2, pushrods1, pushrods2 = self._calc_lower_mounts(positions1, positions2)
+        targets1 = (self.rod_mount_length ** 2 + np.sum(mounts1 ** 2, axis=-1) - pushrods1 ** 2) / 2
+        targets2 = (self.rod_mount_length ** 2 + np.sum(mounts2 ** 2, axis=-1) - pushrods2 ** 2) / 2
+
+        estimate1 = np.broadcast_to(estimated_points[0], (n, 3))
+        estimate2 = np.broadcast_to(estimated_points[1], (n, 3))
+        pitch, roll = self._calc_pitch_and_roll(estimate1.T, estimate2.T)
+        pitch, roll = np.array(pitch, dtype=float), np.array(roll, dtype=float)
+
+        converged = np.zeros(n, dtype=bool)
+        symmetric = positions1 == positions2
+        pitch[symmetric] = self._calc_symmetric_pitch(positions1[symmetric], pitch[symmetric])
+        roll[symmetric] = 0
+        converged[symmetric] = np.isfinite(pitch[symmetric])
+
+        radius = (self.rod_mount[0] ** 2 + self.rod_mount[1] ** 2) ** 0.5
+        half_width = self.rod_mount_width / 2
+        active = np.flatnonzero(~symmetric)
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+
+            rod_mount1, rod_mount2 = self._calc_rod_mounts_from_pitch_and_roll(pitch[active], roll[active])
+            mount1, mount2 = mounts1[active], mounts2[active]
+            residual1 = np.sum(rod_mount1 * mount1, axis=-1) - targets1[active]
+            residual2 = np.sum(rod_mount2 * mount2, axis=-1) - targets2[active]
+
+            sin_p, cos_p = np.sin(pitch[active]), np.cos(pitch[active])
+            sin_r, cos_r = np.sin(roll[active]), np.cos(roll[active])
+            d_pitch = np.stack((-radius * sin_p, radius * cos_p * cos_r, -radius * cos_p * sin_r), axis=-1)
+            d_roll_mid = np.stack((np.zeros(sin_r.shape), -radius * sin_p * sin_r, -radius * sin_p * cos_r), axis=-1)
+            d_roll_offset = np.stack((np.zeros(sin_r.shape), half_width * cos_r, -half_width * sin_r), axis=-1)
+
+            j11 = np.sum(d_pitch * mount1, axis=-1)
+            j12 = np.sum((d_roll_mid + d_roll_offset) * mount1, axis=-1)
+            j21 = np.sum(d_pitch * mount2, axis=-1)
+            j22 = np.sum((d_roll_mid - d_roll_offset) * mount2, axis=-1)
+            determinant = j11 * j22 - j12 * j21
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step_pitch = -(j22 * residual1 - j12 * residual2) / determinant
+                step_roll = -(-j21 * residual1 + j11 * residual2) / determinant
+
+            # keep steps from the edges of travel from jumping to the other solution
+            largest = np.maximum(np.abs(step_pitch), np.abs(step_roll))
+            damping = np.minimum(1, 0.5 / np.where(largest > 0, largest, 1))
+            pitch[active] += damping * step_pitch
+            roll[active] += damping * step_roll
+
+            finite = np.isfinite(pitch[active]) & np.isfinite(roll[active])
+            small = largest <= tolerance
+            converged[active[finite & small]] = True
+            active = active[finite & ~small]
+
+        rod_mounts1, rod_mounts2 = self._calc_rod_mounts_from_pitch_and_roll(pitch, roll)
+
+        return rod_mounts1, rod_mounts2, converged
+
+    def _solve_rod_mount_points(self, positions1, positions2, estimated_points):
+        """
+        Calculates the Rod Mount positions for arrays of CTC angles or linear
+        actuator lengths.
+
+        Points already in ROD_MOUNT_MEMO are looked up, and the rest are solved
+        with _calc_rod_mount_points_reduced, falling back to solving all 6
+        unknowns with _calc_rod_mount_points_batch for any point it can't solve.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param tuple[array, array] estimated_points: Estimated locations of the two
+        Rod Mounts, either a single pair of points or a pair of N x 3 arrays.
+        :return: The two Rod Mounts, as N x 3 arrays, and a boolean array flagging
+        the points that converged.
+        """
+
+        positions1, positions2 = np.broadcast_arrays(np.atleast_1d(np.asarray(positions1, dtype=float)),
+                                                     np.atleast_1d(np.asarray(positions2, dtype=float)))
+        positions1, positions2 = positions1.ravel(), positions2.ravel()
+        if not self.memoize:
+            return self._solve_new_rod_mount_points(positions1, positions2, estimated_points)
+
+        rod_mounts1 = np.empty((positions1.size, 3))
+        rod_mounts2 = np.empty((positions1.size, 3))
+        converged = np.ones(positions1.size, dtype=bool)
+
+        keys = ROD_MOUNT_MEMO.keys(self.solve_identity, positions1, positions2)
+        missing = ROD_MOUNT_MEMO.lookup(keys, rod_mounts1, rod_mounts2)
+        if missing.size:
+            estimate1 = np.broadcast_to(estimated_points[0], (positions1.size, 3))[missing]
+            estimate2 = np.broadcast_to(estimated_points[1], (positions1.size, 3))[missing]
+            (rod_mounts1[missing],
+             rod_mounts2[missing],
+             converged[missing]) = self._solve_new_rod_mount_points(positions1[missing], positions2[missing],
+                                                                    (estimate1, estimate2))
+
+            solved = missing[converged[missing]]
+            ROD_MOUNT_MEMO.store([keys[i] for i in solved], rod_mounts1[solved], rod_mounts2[solved])
+
+        return rod_mounts1, rod_mounts2, converged
+
+    def _solve_new_rod_mount_points(self, positions1, positions2, estimated_points):
+        """
+        Solves the Rod Mount positions for flat arrays of CTC angles or linear
+        actuator lengths without looking them up.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param tuple[array, array] estimated_points: Estimated locations of the two
+        Rod Mounts, either a single pair of points or a pair of N x 3 arrays.
+        :return: The two Rod Mounts, as N x 3 arrays, and a boolean array flagging
+        the points that converged.
+        """
+
+        rod_mounts1, rod_mounts2, converged = self._calc_rod_mount_points_reduced(positions1, positions2,
+                                                                                  estimated_points)
+
+        failed = np.flatnonzero(~converged)
+        if failed.size:
+            estimate1 = np.broadcast_to(estimated_points[0], (positions1.size, 3))[failed]
+            estimate2 = np.broadcast_to(estimated_points[1], (positions1.size, 3))[failed]
+            (rod_mounts1[failed],
+             rod_mounts2[failed],
+             converged[failed]) = self._calc_rod_mount_points_batch(positions1[failed], positions2[failed],
+                                                                    (estimate1, estimate2))
+
+        return rod_mounts1, rod_mounts2, converged
+
     @staticmethod
     def _calc_pitch_and_roll(rod_mount1, rod_mount2):
         """
@@ -184,59 +879,176 @@ class Rig:
         Since iterative solving is used by _calc_performance,
         this can make things going faster and more reliably.
 
+        Both actuators stay in the same position, so each step is solved in
+        closed form and the closest solution to the last step is kept.
+
         :return: The coordinates of the two rod mounts, as floats, in
         the form X1, X2, Y1, Y2, Z1, Z2.
         """
 
-        rm = self.rod_mount
-        estimated_points = np.array([rm[0], rm[1], rm[2]]), np.array([rm[0], rm[1], -rm[2]])
-
         if self.drive == CTC:
-            for angle in np.arange(self.ctc_neutral_angle,
-                                   self.ctc_min_angle - self.grid_spacing / 2,
-                                   -self.grid_spacing):
-                estimated_points = self._calc_rod_mount_points(angle, angle, estimated_points)
+            positions = np.arange(self.ctc_neutral_angle,
+                                  self.ctc_min_angle - self.grid_spacing / 2,
+                                  -self.grid_spacing)
         elif self.drive == LINEAR:
-            for length in np.arange(self.pushrod_nominal_length,
-                                    self.pushrod_min_length - self.grid_spacing / 2,
-                                    -self.grid_spacing):
-                estimated_points = self._calc_rod_mount_points(length, length, estimated_points)
+            positions = np.arange(self.pushrod_nominal_length,
+                                  self.pushrod_min_length - self.grid_spacing / 2,
+                                  -self.grid_spacing)
+
+        pitch = self.rod_mount_base_angle
+        for position in positions:
+            pitch = self._calc_symmetric_pitch(position, pitch)[0]
+
+        rod_mount1, rod_mount2 = self._calc_rod_mounts_from_pitch_and_roll(pitch, 0)
 
-        return estimated_points
+        return rod_mount1[0], rod_mount2[0]
 
-    def _grid_points(self):
+    def _grid_positions(self, spacing=None):
         """
-        Create a generator to iterate over all of the points of interest.
+        Gets the CTC angles, or Pushrod lengths, along each axis of the grid of
+        points of interest.
 
         Also sets delta, the amount in each direction from each
         point of interest that's used to estimate the gear ratio of the
         sim rig.
 
-        yields: the angles of the two CTCs, or the two Pushrod lengths as a tuple.
+        :param float spacing: The distance between points. Defaults to spacing.
+        :return: The positions of the first and second actuators as a tuple of arrays.
+        The points of interest are every combination of the two, with the first
+        actuator's position changing slowest.
         """
+        if spacing is None:
+            spacing = self.grid_spacing
+
         if self.drive == CTC:
             delta = 1  # values will be checked one degree on either side of the nominal position
             self.delta = np.radians(delta)
 
-            for ctc1_angle in np.arange(self.ctc_min_angle,
-                                        self.ctc_max_angle + self.grid_spacing / 2,
-                                        self.grid_spacing):
-                for ctc2_angle in np.arange(self.ctc_min_angle,
-                                            self.ctc_max_angle + self.grid_spacing / 2,
-                                            self.grid_spacing):
-                    yield ctc1_angle, ctc2_angle
+            positions = np.arange(self.ctc_min_angle,
+                                  self.ctc_max_angle + spacing / 2,
+                                  spacing)
 
         elif self.drive == LINEAR:
             delta = 1  # values will be checked 1 percent of linear travel on either side of the nominal position
             self.delta = self.linear_travel / 100 * delta
 
-            for pushrod1_length in np.arange(self.pushrod_min_length,
-                                             self.pushrod_max_length + self.grid_spacing / 2,
-                                             self.grid_spacing):
-                for pushrod2_length in np.arange(self.pushrod_min_length,
-                                                 self.pushrod_max_length + self.grid_spacing / 2,
-                                                 self.grid_spacing):
-                    yield pushrod1_length, pushrod2_length
+            positions = np.arange(self.pushrod_min_length,
+                                  self.pushrod_max_length + spacing / 2,
+                                  spacing)
+
+        return positions, np.copy(positions)
+
+    def _solve_edge(self, positions1, position2):
+        """
+        Solves the Rod Mount positions along an edge of the grid, one point at
+        a time, so that each point is estimated from the one before it.
+
+        :param array[float] positions1: The first actuator's positions.
+        :param float position2: The second actuator's position along the edge.
+        :return: The two Rod Mounts as len(positions1) x 3 arrays.
+        """
+
+        edge1 = np.empty((len(positions1), 3))
+        edge2 = np.empty((len(positions1), 3))
+
+        estimated_points = self._get_starting_points()
+        for i, position1 in enumerate(positions1):
+            rod_mount1, rod_mount2, _ = self._solve_rod_mount_points(position1, position2, estimated_points)
+            edge1[i], edge2[i] = rod_mount1[0], rod_mount2[0]
+            estimated_points = edge1[i], edge2[i]
+            self._report_progress(0.5 * (i + 1) / len(positions1))
+
+        return edge1, edge2
+
+    def _solve_rows(self, positions1, positions2, edge1, edge2):
+        """
+        Solves the Rod Mount positions for rows of the grid at once, using
+        each row's edge point as the estimate.
+
+        :param array[float] positions1: The first actuator's positions, one per row.
+        :param array[float] positions2: The second actuator's positions.
+        :param array[N, 3] edge1: The first Rod Mount at the start of each row.
+        :param array[N, 3] edge2: The second Rod Mount at the start of each row.
+        :return: The two Rod Mounts as len(positions1) x len(positions2) x 3 arrays.
+        """
+
+        grid1, grid2 = np.meshgrid(positions1, positions2, indexing='ij')
+        estimated_points = (np.repeat(edge1, len(positions2), axis=0), np.repeat(edge2, len(positions2), axis=0))
+        rod_mounts1, rod_mounts2, _ = self._solve_rod_mount_points(grid1.ravel(), grid2.ravel(), estimated_points)
+
+        shape = (len(positions1), len(positions2), 3)
+        return rod_mounts1.reshape(shape), rod_mounts2.reshape(shape)
+
+    def _solve_grid(self, positions1, positions2):
+        """
+        Solves the Rod Mount positions for every point of interest.
+
+        Walks along the edge of the grid where the second actuator is at its
+        minimum, one point at a time, then solves every row at once using the
+        row's edge point as the estimate.
+
+        :param array[float] positions1: The first actuator's positions.
+        :param array[float] positions2: The second actuator's positions.
+        :return: The two Rod Mounts as len(positions1) x len(positions2) x 3 arrays.
+        """
+
+        edge1, edge2 = self._solve_edge(positions1, positions2[0])
+        return self._solve_rows(positions1, positions2, edge1, edge2)
+
+    def _solve_grid_parallel(self, positions1, positions2, executor=None):
+        """
+        Solves the Rod Mount positions and ratios for every point of interest
+        across self.workers processes.
+
+        The edge of the grid is walked in this process, as in _solve_grid, so
+        each worker gets its own estimates. The rows are then split into one
+        tile per worker and the tiles are put back together in order, so the
+        results are the same as solving in one process.
+
+        :param array[float] positions1: The first actuator's positions.
+        :param array[float] positions2: The second actuator's positions.
+        :param ProcessPoolExecutor executor: The pool to solve the tiles in.
+        One is started, and shut down again, if it's None.
+        :return: The two Rod Mounts, as len(positions1) x len(positions2) x 3
+        arrays, and the pitch and roll ratios, as len(positions1) x len(positions2)
+        arrays.
+        """
+
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(positions1))) as executor:
+                return self._solve_grid_parallel(positions1, positions2, executor)
+
+        edge1, edge2 = self._solve_edge(positions1, positions2[0])
+        tiles = np.array_split(np.arange(len(positions1)), min(self.workers, len(positions1)))
+
+        futures = [executor.submit(_solve_tile, self, positions1[tile], positions2, edge1[tile], edge2[tile])
+                   for tile in tiles]
+        parts = [future.result() for future in futures]
+
+        return tuple(np.concatenate(part) for part in zip(*parts))
+
+    def _solve_points_parallel(self, positions1, positions2, estimated_points, executor):
+        """
+        Solves the Rod Mount positions and ratios of scattered points, split
+        into one chunk per worker, and puts the chunks back together in order.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param tuple[array, array] estimated_points: The estimated Rod Mounts as
+        a pair of N x 3 arrays.
+        :param ProcessPoolExecutor executor: The pool to solve the chunks in.
+        :return: The two Rod Mounts, as N x 3 arrays, and the pitch and roll
+        ratios, as arrays.
+        """
+
+        chunks = np.array_split(np.arange(len(positions1)), min(self.workers, len(positions1)))
+
+        futures = [executor.submit(_solve_points, self, positions1[chunk], positions2[chunk],
+                                   (estimated_points[0][chunk], estimated_points[1][chunk]))
+                   for chunk in chunks]
+        parts = [future.result() for future in futures]
+
+        return tuple(np.concatenate(part) for part in zip(*parts))
 
     def _numerical_derivative(self, position1_t0, position2_t0, position1_t1, position2_t1, estimated_points):
         """
@@ -245,6 +1057,9 @@ class Rig:
 
         Estimates the effective gear ratio between the motor and the rocker.
 
+        Positions can be floats or arrays, in which case every point is
+        solved at once.
+
         :param float position1_t0: The starting point of either the CTC angle or
         linear actuator position of the respective value on the positive Z side.
         :param float position2_t0: The starting point of either the CTC angle or
@@ -253,137 +1068,530 @@ class Rig:
         linear actuator position of the respective value on the positive Z side.
         :param float position2_t1: The ending point of either the CTC angle or
         linear actuator position of the respective value on the negative Z side.
-        :param tuple[X1, X2, Y1, Y2, Z1, Z2] estimated_points: The estimates
-        locations of the points, the last solved set of locations can be a good
+        :param tuple[array, array] estimated_points: The estimated locations of
+        the two Rod Mounts, the last solved set of locations can be a good
         estimate
 
         :return: The effective gear ratio as a tuple of floats representing
         the pitch and roll ratios.
         """
-        rod_mount1_t0, rod_mount2_t0 = self._calc_rod_mount_points(position1_t0, position2_t0, estimated_points)
-        rod_mount1_t1, rod_mount2_t1 = self._calc_rod_mount_points(position1_t1, position2_t1, estimated_points)
+        shape = np.shape(position1_t0)
+        rod_mount1_t0, rod_mount2_t0, _ = self._solve_rod_mount_points(position1_t0, position2_t0, estimated_points)
+        rod_mount1_t1, rod_mount2_t1, _ = self._solve_rod_mount_points(position1_t1, position2_t1, estimated_points)
 
-        pitch1, roll1 = self._calc_pitch_and_roll(rod_mount1_t0, rod_mount2_t0)
-        pitch2, roll2 = self._calc_pitch_and_roll(rod_mount1_t1, rod_mount2_t1)
+        pitch1, roll1 = self._calc_pitch_and_roll(rod_mount1_t0.T, rod_mount2_t0.T)
+        pitch2, roll2 = self._calc_pitch_and_roll(rod_mount1_t1.T, rod_mount2_t1.T)
 
         if self.drive == CTC:
-            return (pitch2 - pitch1) / (2 * self.delta), (roll2 - roll1) / (2 * self.delta)
+            step = 2 * self.delta
         elif self.drive == LINEAR:
-            return ((pitch2 - pitch1) / (2 * self.delta / self.travel_per_rad),
-                    (roll2 - roll1) / (2 * self.delta / self.travel_per_rad))
+            step = 2 * self.delta / self.travel_per_rad
+
+        return ((pitch2 - pitch1).reshape(shape) / step,
+                (roll2 - roll1).reshape(shape) / step)
 
-    def _calc_performance(self):
+    def _calc_lower_mounts_derivative(self, positions1, positions2):
+        """
+        Calculates how the closure equations change with each actuator's position.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :return: A tuple of the derivatives of the lower mounts, as N x 3 arrays,
+        and of the pushrod lengths, as length N arrays, in the form mount1, mount2,
+        pushrod1, pushrod2.
+        """
+
+        positions1 = np.asarray(positions1, dtype=float)
+        positions2 = np.asarray(positions2, dtype=float)
+
+        if self.drive == CTC:
+            def ctc_derivative(motor_angle, ctc_angle):
+                return self.ctc_length * np.stack((-np.cos(motor_angle) * np.sin(ctc_angle),
+                                                   np.cos(ctc_angle),
+                                                   -np.sin(motor_angle) * np.sin(ctc_angle)), axis=-1)
+
+            return (ctc_derivative(self.motor1_angle, positions1),
+                    ctc_derivative(self.motor2_angle, positions2),
+                    np.zeros(positions1.shape),
+                    np.zeros(positions2.shape))
+        elif self.drive == LINEAR:
+            return (np.zeros(positions1.shape + (3,)),
+                    np.zeros(positions2.shape + (3,)),
+                    np.ones(positions1.shape),
+                    np.ones(positions2.shape))
+
+    @staticmethod
+    def _calc_pitch_and_roll_gradient(rod_mounts1, rod_mounts2):
+        """
+        The analytic gradient of _calc_pitch_and_roll with respect to the
+        Rod Mount coordinates.
+
+        :param array[N, 3] rod_mounts1: The first Rod Mounts.
+        :param array[N, 3] rod_mounts2: The second Rod Mounts.
+        :return: An N x 2 x 6 array of the gradients of pitch and roll with
+        respect to X1, X2, Y1, Y2, Z1, Z2.
+        """
+
+        d_mounts = rod_mounts1 - rod_mounts2
+        mounts_avg = (rod_mounts1 + rod_mounts2) / 2
+
+        roll = np.arctan(d_mounts[:, 1] / d_mounts[:, 2])
+        midpoint_height = mounts_avg[:, 1] / np.cos(roll)
+
+        gradient = np.zeros((len(rod_mounts1), 2, 6))
+
+        # roll = arctan(dy / dz)
+        d_roll_d_dy = d_mounts[:, 2] / (d_mounts[:, 1] ** 2 + d_mounts[:, 2] ** 2)
+        d_roll_d_dz = -d_mounts[:, 1] / (d_mounts[:, 1] ** 2 + d_mounts[:, 2] ** 2)
+        gradient[:, 1, 2], gradient[:, 1, 3] = d_roll_d_dy, -d_roll_d_dy
+        gradient[:, 1, 4], gradient[:, 1, 5] = d_roll_d_dz, -d_roll_d_dz
+
+        # pitch = arctan(h / x_avg), h = y_avg / cos(roll)
+        denominator = mounts_avg[:, 0] ** 2 + midpoint_height ** 2
+        d_pitch_d_h = mounts_avg[:, 0] / denominator
+        d_pitch_d_x_avg = -midpoint_height / denominator
+        d_h_d_roll = midpoint_height * np.tan(roll)
+
+        gradient[:, 0, 0] = gradient[:, 0, 1] = d_pitch_d_x_avg / 2
+        gradient[:, 0, 2] = gradient[:, 0, 3] = d_pitch_d_h / (2 * np.cos(roll))
+        gradient[:, 0] += (d_pitch_d_h * d_h_d_roll)[:, None] * gradient[:, 1]
+
+        return gradient
+
+    def _implicit_derivative(self, positions1, positions2, rod_mounts1, rod_mounts2):
+        """
+        Calculates the derivative of pitch and roll as a function of either
+        CTC angle or linear actuator length from the solved Rod Mounts.
+
+        Calculates the same effective gear ratios as _numerical_derivative,
+        exactly, by applying the implicit function theorem to the closure
+        equations instead of re-solving them on either side of each point.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param array[N, 3] rod_mounts1: The solved first Rod Mounts.
+        :param array[N, 3] rod_mounts2: The solved second Rod Mounts.
+        :return: The effective gear ratio as a tuple of arrays representing
+        the pitch and roll ratios.
+        """
+
+        jacobian = self._implicit_jacobian(positions1, positions2, rod_mounts1, rod_mounts2)
+
+        pitch_ratio = jacobian[:, 0, 0] + jacobian[:, 0, 1]
+        roll_ratio = jacobian[:, 1, 0] - jacobian[:, 1, 1]
+
+        return pitch_ratio, roll_ratio
+
+    def _implicit_jacobian(self, positions1, positions2, rod_mounts1, rod_mounts2):
+        """
+        Calculates the derivative of pitch and roll with respect to each
+        motor's angle, by applying the implicit function theorem to the
+        closure equations.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param array[N, 3] rod_mounts1: The solved first Rod Mounts.
+        :param array[N, 3] rod_mounts2: The solved second Rod Mounts.
+        :return: An N x 2 x 2 array, with pitch and roll down the rows and the
+        first and second motors across the columns.
+        """
+
+        positions1 = np.atleast_1d(np.asarray(positions1, dtype=float))
+        positions2 = np.atleast_1d(np.asarray(positions2, dtype=float))
+        mounts1, mounts2, pushrods1, pushrods2 = self._calc_lower_mounts(positions1, positions2)
+        d_mounts1, d_mounts2, d_pushrods1, d_pushrods2 = self._calc_lower_mounts_derivative(positions1, positions2)
+
+        p = np.stack((rod_mounts1[:, 0], rod_mounts2[:, 0],
+                      rod_mounts1[:, 1], rod_mounts2[:, 1],
+                      rod_mounts1[:, 2], rod_mounts2[:, 2]), axis=-1)
+        jacobian = self._closure_jacobian(p, mounts1, mounts2)
+
+        # only the pushrod equations depend on the actuator positions
+        d_residuals = np.zeros((len(p), 6, 2))
+        d_residuals[:, 3, 0] = (2 * pushrods1 * d_pushrods1
+                                + 2 * np.sum((rod_mounts1 - mounts1) * d_mounts1, axis=-1))
+        d_residuals[:, 4, 1] = (2 * pushrods2 * d_pushrods2
+                                + 2 * np.sum((rod_mounts2 - mounts2) * d_mounts2, axis=-1))
+
+        d_points = np.linalg.solve(jacobian, -d_residuals)
+        d_pitch_and_roll = self._calc_pitch_and_roll_gradient(rod_mounts1, rod_mounts2) @ d_points
+
+        if self.drive == LINEAR:
+            d_pitch_and_roll = d_pitch_and_roll * self.travel_per_rad
+
+        return d_pitch_and_roll
+
+    def _calc_ratios(self, positions1, positions2, rod_mounts1, rod_mounts2):
+        """
+        Calculates the pitch and roll ratios at solved points using the
+        selected ratio_method.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param array[N, 3] rod_mounts1: The solved first Rod Mounts.
+        :param array[N, 3] rod_mounts2: The solved second Rod Mounts.
+        :return: The pitch and roll ratios as a tuple of arrays.
+        """
+
+        if self.ratio_method == NUMERICAL:
+            pitch_ratios, _ = self._numerical_derivative(positions1 - self.delta,
+                                                         positions2 - self.delta,
+                                                         positions1 + self.delta,
+                                                         positions2 + self.delta,
+                                                         (rod_mounts1, rod_mounts2))
+            _, roll_ratios = self._numerical_derivative(positions1 - self.delta,
+                                                        positions2 + self.delta,
+                                                        positions1 + self.delta,
+                                                        positions2 - self.delta,
+                                                        (rod_mounts1, rod_mounts2))
+            return pitch_ratios, roll_ratios
+
+        return self._implicit_derivative(positions1, positions2, rod_mounts1, rod_mounts2)
+
+    def _calc_residuals(self, positions1, positions2, rod_mounts1, rod_mounts2):
+        """
+        Calculates how far solved points are from satisfying the closure equations.
+
+        :param array[float] positions1: The first CTC angles or linear actuator lengths.
+        :param array[float] positions2: The second CTC angles or linear actuator lengths.
+        :param array[N, 3] rod_mounts1: The solved first Rod Mounts.
+        :param array[N, 3] rod_mounts2: The solved second Rod Mounts.
+        :return: The largest residual of each point as an array.
+        """
+
+        mounts1, mounts2, pushrods1, pushrods2 = self._calc_lower_mounts(positions1, positions2)
+        p = np.stack((rod_mounts1[:, 0], rod_mounts2[:, 0],
+                      rod_mounts1[:, 1], rod_mounts2[:, 1],
+                      rod_mounts1[:, 2], rod_mounts2[:, 2]), axis=-1)
+        residuals = self._closure_residuals(p, self.rod_mount_length, pushrods1, pushrods2,
+                                            self.rod_mount_width, mounts1, mounts2)
+
+        return np.max(np.abs(residuals), axis=-1)
+
+    def _solve_adaptive(self):
+        """
+        Solves the Rod Mount positions and ratios on a grid that's refined
+        where the results change quickly.
+
+        Starts from the plot_steps grid and repeatedly splits cells into four,
+        up to ADAPTIVE_LEVELS times, until max_points is reached. A cell is
+        split when the pitch or roll ratio, and so the torque or omega, changes
+        across it by more than refine_tolerance of its overall range, or when
+        any of its corners didn't solve cleanly. The cells that change the most
+        are split first.
+
+        With more than one worker, the starting grid is solved as in
+        _solve_grid_parallel and each pass's new points are split across
+        the same pool of processes.
+
+        :return: The points as a tuple of arrays in the form positions1, positions2,
+        rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios. The starting grid
+        comes first, in the same order as the regular grid, followed by the
+        added points.
+        """
+
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                return self._refine(executor)
+
+        return self._refine()
+
+    def _refine(self, executor=None):
+        """
+        Does the work of _solve_adaptive.
+
+        :param ProcessPoolExecutor executor: The pool to solve points in, or
+        None to solve them in this process.
+        :return: As _solve_adaptive.
+        """
+
+        coarse1, coarse2 = self._grid_positions()
+        if executor is not None:
+            rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios = self._solve_grid_parallel(coarse1, coarse2,
+                                                                                            executor)
+        else:
+            rod_mounts1, rod_mounts2 = self._solve_grid(coarse1, coarse2)
+
+        scale = 2 ** ADAPTIVE_LEVELS
+        spacing = self.grid_spacing / scale
+        lattice = np.arange(len(coarse1)) * scale
+        lattice1, lattice2 = (a.ravel() for a in np.meshgrid(lattice, lattice, indexing='ij'))
+        index = {(i, j): k for k, (i, j) in enumerate(zip(lattice1.tolist(), lattice2.tolist()))}
+
+        positions1, positions2 = (a.ravel() for a in np.meshgrid(coarse1, coarse2, indexing='ij'))
+        rod_mounts1, rod_mounts2 = rod_mounts1.reshape(-1, 3), rod_mounts2.reshape(-1, 3)
+        if executor is not None:
+            pitch_ratios, roll_ratios = pitch_ratios.ravel(), roll_ratios.ravel()
+        else:
+            pitch_ratios, roll_ratios = self._calc_ratios(positions1, positions2, rod_mounts1, rod_mounts2)
+        residuals = self._calc_residuals(positions1, positions2, rod_mounts1, rod_mounts2)
+
+        cells = [(i, j, scale) for i in lattice[:-1].tolist() for j in lattice[:-1].tolist()]
+        level = 0
+        while cells and len(positions1) < self.max_points:
+            self._report_progress(0.5 + 0.5 * level / ADAPTIVE_LEVELS)
+            level += 1
+            with np.errstate(divide='ignore', invalid='ignore'):
+                fields = np.stack((pitch_ratios, roll_ratios, 1 / pitch_ratios, 1 / roll_ratios))
+            fields[~np.isfinite(fields)] = np.nan
+            spans = np.nanmax(fields, axis=1) - np.nanmin(fields, axis=1)
+            spans[~(spans > 0)] = np.inf
+            unsolved = ~(residuals <= 1e-9 * self.rod_mount_length ** 2) | np.any(np.isnan(fields), axis=0)
+
+            corners = np.array([[index[(i, j)], index[(i + size, j)], index[(i, j + size)], index[(i + size, j + size)]]
+                                for i, j, size in cells])
+            corner_fields = fields[:, corners]
+            with np.errstate(invalid='ignore'):
+                change = (np.nanmax(corner_fields, axis=2) - np.nanmin(corner_fields, axis=2)) / spans[:, None]
+            scores = np.nan_to_num(np.nanmax(change, axis=0), nan=np.inf)
+            scores[np.any(unsolved[corners], axis=1)] = np.inf
+
+            new_points = {}
+            children = []
+            for c in np.argsort(-scores, kind='stable'):
+                i, j, size = cells[c]
+                if size == 1 or not scores[c] > self.refine_tolerance:
+                    continue
+
+                half = size // 2
+                added = [(i + half, j), (i, j + half), (i + half, j + half), (i + size, j + half), (i + half, j + size)]
+                added = [point for point in added if point not in index and point not in new_points]
+                if len(positions1) + len(new_points) + len(added) > self.max_points:
+                    break
+
+                for point in added:
+                    new_points[point] = corners[c, 0]
+                children += [(i, j, half), (i + half, j, half), (i, j + half, half), (i + half, j + half, half)]
+
+            if not new_points:
+                break
+
+            lattice_points = np.array(list(new_points.keys()))
+            estimates = np.array(list(new_points.values()))
+            new_positions1 = coarse1[0] + lattice_points[:, 0] * spacing
+            new_positions2 = coarse2[0] + lattice_points[:, 1] * spacing
+            estimated_points = (rod_mounts1[estimates], rod_mounts2[estimates])
+            if executor is not None:
+                (new_rod_mounts1, new_rod_mounts2,
+                 new_pitch_ratios, new_roll_ratios) = self._solve_points_parallel(new_positions1, new_positions2,
+                                                                                  estimated_points, executor)
+            else:
+                (new_rod_mounts1, new_rod_mounts2,
+                 new_pitch_ratios, new_roll_ratios) = _solve_points(self, new_positions1, new_positions2,
+                                                                    estimated_points)
+            new_residuals = self._calc_residuals(new_positions1, new_positions2, new_rod_mounts1, new_rod_mounts2)
+
+            for point in new_points:
+                index[point] = len(index)
+            positions1 = np.concatenate((positions1, new_positions1))
+            positions2 = np.concatenate((positions2, new_positions2))
+            rod_mounts1 = np.concatenate((rod_mounts1, new_rod_mounts1))
+            rod_mounts2 = np.concatenate((rod_mounts2, new_rod_mounts2))
+            pitch_ratios = np.concatenate((pitch_ratios, new_pitch_ratios))
+            roll_ratios = np.concatenate((roll_ratios, new_roll_ratios))
+            residuals = np.concatenate((residuals, new_residuals))
+
+            cells = children
+
+        return positions1, positions2, rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios
+
+    def _solve_kinematics(self):
+        """
+        Solves the Rod Mount positions and ratios for every point of interest,
+        on either the regular grid or an adaptive one.
+
+        :return: The points as a tuple of arrays in the form positions1, positions2,
+        rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios, followed by the
+        shape of the grid, or None if it's adaptive.
+        """
+
+        if self.adaptive:
+            return self._solve_adaptive() + (None,)
+
+        positions1, positions2 = self._grid_positions()
+        shape = (len(positions1), len(positions2))
+
+        if self.workers > 1:
+            rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios = self._solve_grid_parallel(positions1, positions2)
+            positions1, positions2 = (a.ravel() for a in np.meshgrid(positions1, positions2, indexing='ij'))
+            return (positions1, positions2, rod_mounts1.reshape(-1, 3), rod_mounts2.reshape(-1, 3),
+                    pitch_ratios.ravel(), roll_ratios.ravel(), shape)
+
+        rod_mounts1, rod_mounts2 = self._solve_grid(positions1, positions2)
+
+        return self._flatten_grid(positions1, positions2, rod_mounts1, rod_mounts2)
+
+    def _flatten_grid(self, positions1, positions2, rod_mounts1, rod_mounts2):
+        """
+        Flattens a solved grid of Rod Mount positions and finds the ratios at
+        each point.
+
+        :param array[float] positions1: The first actuator's positions.
+        :param array[float] positions2: The second actuator's positions.
+        :param array rod_mounts1: The first Rod Mount, as a len(positions1) x len(positions2) x 3 array.
+        :param array rod_mounts2: The second Rod Mount, as a len(positions1) x len(positions2) x 3 array.
+        :return: The points in the same form as _solve_kinematics.
+        """
+
+        shape = (len(positions1), len(positions2))
+        positions1, positions2 = (a.ravel() for a in np.meshgrid(positions1, positions2, indexing='ij'))
+        rod_mounts1, rod_mounts2 = rod_mounts1.reshape(-1, 3), rod_mounts2.reshape(-1, 3)
+        pitch_ratios, roll_ratios = self._calc_ratios(positions1, positions2, rod_mounts1, rod_mounts2)
+
+        return positions1, positions2, rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios, shape
+
+    def _calc_kinematics(self):
+        """
+        Solves the geometry of the sim rig at every point of interest.
+
+        :return: A RigKinematics.
+        """
+
+        return self._build_kinematics(*self._solve_kinematics())
+
+    def _build_kinematics(self, positions1, positions2, rod_mounts1, rod_mounts2,
+                          pitch_ratios, roll_ratios, shape):
+        """
+        Finds the pitch, roll and pushrod arms of solved points, which are
+        given in the form _solve_kinematics returns them.
+
+        :return: A RigKinematics.
+        """
+
+        pitch, roll = self._calc_pitch_and_roll(rod_mounts1.T, rod_mounts2.T)
+
+        if self.drive == CTC:
+            mounts = self._calc_ctc_location(self.lower_pivot1, self.motor1_angle, positions1).T
+        elif self.drive == LINEAR:
+            mounts = self.lower_pivot1
+        unit_vectors = (rod_mounts1 - mounts) / self.rod_mount_length
+        pushrod_arms = 2 * (-unit_vectors[:, 0] * rod_mounts1[:, 1] + unit_vectors[:, 1] * rod_mounts1[:, 0])
+
+        end_stop_angles = None
+        if self.drive == CTC:
+            end_stop_angles = self._calc_end_stop_angles()
+
+        return RigKinematics(positions1, positions2, rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios,
+                             pitch - self.rod_mount_base_angle, roll, pushrod_arms, shape, end_stop_angles)
+
+    def _apply_drive(self):
+        """
+        Scales the solved geometry in self.kinematics by the motor and inertia
+        values to get the performance metrics.
+
+        Sets self.results, a RigResults, and, as views of it:
+        self.pitch_torque
+        self.roll_torque
+        self.pitch_omega
+        self.roll_omega
+        self.pitch
+        self.roll
+        ...
+
+        :return: None
+        """
+
+        kinematics = self.kinematics
+        results = RigResults(len(kinematics), kinematics.shape)
+        motor_speed = self.motor_rpm * 360 / 60
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.degrees(kinematics.pitch, out=results.pitch)
+            np.degrees(kinematics.roll, out=results.roll)
+            np.multiply(self.motor_torque * 2, 1 / kinematics.pitch_ratios, out=results.pitch_torque)
+            np.multiply(self.motor_torque * 2, 1 / kinematics.roll_ratios, out=results.roll_torque)
+            np.multiply(motor_speed, kinematics.pitch_ratios, out=results.pitch_omega)
+            np.multiply(motor_speed, kinematics.roll_ratios, out=results.roll_omega)
+            np.multiply(results.pitch_torque, np.degrees(1) / self.i_pitch, out=results.pitch_alpha)
+            np.multiply(results.roll_torque, np.degrees(1) / self.i_roll, out=results.roll_alpha)
+            np.multiply(results.pitch_alpha, self.pitch_linear_rad, out=results.pitch_linear_acc)
+            np.multiply(results.roll_alpha, self.roll_linear_rad, out=results.roll_linear_acc)
+            np.multiply(results.pitch_omega, np.radians(1) * self.pitch_linear_rad, out=results.pitch_linear_speed)
+            np.multiply(results.roll_omega, np.radians(1) * self.roll_linear_rad, out=results.roll_linear_speed)
+            np.divide(results.pitch_torque / 2, kinematics.pushrod_arms, out=results.pushrod_force)
+
+        self.results = results
+        for name in RigResults.FIELDS[:-1]:
+            setattr(self, name, results[name])
+        self.max_pushrod_force = np.max(results.pushrod_force)
+
+        median = np.flatnonzero(np.isclose(0, kinematics.pitch) & np.isclose(0, kinematics.roll))
+        if median.size:
+            self.median_pitch_and_roll_torques = (results.pitch_torque[median[-1]], results.roll_torque[median[-1]])
+            self.pitch_roll_ratio = results.pitch_torque[median[-1]] / results.roll_torque[median[-1]]
+
+    def _calc_performance(self, kinematics=None):
         """
         Calculates the performance metrics of the sim rig.
 
-        Sets values to:
-        self.pitch_torque = []
-        self.roll_torque = []
-        self.pitch_omega = []
-        self.roll_omega = []
-        self.pitch = []
-        self.roll = []
+        Sets self.kinematics, a RigKinematics, and self.results, a RigResults,
+        and, as views of it:
+        self.pitch_torque
+        self.roll_torque
+        self.pitch_omega
+        self.roll_omega
+        self.pitch
+        self.roll
+        ...
+
+        On the regular grid the first actuator's position changes slowest.
 
-        Values are set in no particular order but are in the same
-        order for each list so the Nth item for each list references
-        the same point.
+        The kinematics are loaded from self.cache when they've been solved
+        before, and stored in it otherwise.
 
+        :param RigKinematics kinematics: Already solved kinematics to use.
         :return: None
         """
 
-        def pushrod_force(torque, position1, position2, estimated_points):
-            ((x1, y1, z1), (x2, y2, z2)) = estimated_points
-            rod_mount1, rod_mount2 = self._calc_rod_mount_points(position1, position2, estimated_points)
-
-            if self.drive == CTC:
-                mount = self._calc_ctc_location(self.lower_pivot1, self.motor1_angle, position1)
-            elif self.drive == LINEAR:
-                mount = self.lower_pivot1
-
-            unit_vector = (rod_mount1 - mount) / self.rod_mount_length
-
-            return torque / (2 * (-unit_vector[0] * rod_mount1[1] + unit_vector[1] * rod_mount1[0]))
-
-        self.pitch_torque = []
-        self.roll_torque = []
-        self.pitch_omega = []
-        self.roll_omega = []
-        self.pitch_alpha = []
-        self.roll_alpha = []
-        self.pitch = []
-        self.roll = []
-        self.pitch_linear_speed = []
-        self.roll_linear_speed = []
-        self.pitch_linear_acc = []
-        self.roll_linear_acc = []
-        self.max_pushrod_force = []
+        if kinematics is None and self.cache is not None:
+            kinematics = self.cache.load(self.geometry)
+        if kinematics is None:
+            kinematics = self._calc_kinematics()
+            if self.cache is not None:
+                self.cache.store(self.geometry, kinematics)
 
-        motor_speed = self.motor_rpm * 360 / 60
-        last_estimated_points = self._get_starting_points()
-        for i, (position1, position2) in enumerate(self._grid_points()):
-            if np.isclose(position2, self.pushrod_min_length) or np.isclose(position2, self.ctc_min_angle):
-                estimated_points = last_estimated_points
-            else:
-                estimated_points = self._calc_rod_mount_points(position1, position2, estimated_points)
-
-            pitch_ratio, _ = self._numerical_derivative(position1 - self.delta,
-                                                        position2 - self.delta,
-                                                        position1 + self.delta,
-                                                        position2 + self.delta,
-                                                        estimated_points)
-            _, roll_ratio = self._numerical_derivative(position1 - self.delta,
-                                                       position2 + self.delta,
-                                                       position1 + self.delta,
-                                                       position2 - self.delta,
-                                                       estimated_points)
-
-            rod_mount1, rod_mount2 = self._calc_rod_mount_points(position1, position2, estimated_points)
-            pitch, roll = self._calc_pitch_and_roll(rod_mount1, rod_mount2)
-            self.pitch.append(np.degrees(pitch - self.rod_mount_base_angle))
-            self.roll.append(np.degrees(roll))
-            self.pitch_torque.append(self.motor_torque / pitch_ratio * 2)
-            self.roll_torque.append(self.motor_torque / roll_ratio * 2)
-            self.pitch_omega.append(motor_speed * pitch_ratio)
-            self.roll_omega.append(motor_speed * roll_ratio)
-            self.pitch_alpha.append(np.degrees(self.pitch_torque[-1] / self.i_pitch))
-            self.roll_alpha.append(np.degrees(self.roll_torque[-1] / self.i_roll))
-            self.pitch_linear_acc.append(self.pitch_alpha[-1] * self.pitch_linear_rad)
-            self.roll_linear_acc.append(self.roll_alpha[-1] * self.roll_linear_rad)
-            self.pitch_linear_speed.append(np.radians(self.pitch_omega[-1]) * self.pitch_linear_rad)
-            self.roll_linear_speed.append(np.radians(self.roll_omega[-1]) * self.roll_linear_rad)
-            self.max_pushrod_force.append(pushrod_force(self.pitch_torque[-1] / 2,
-                                                        position1,
-                                                        position2,
-                                                        estimated_points))
-
-            if np.isclose(0, pitch - self.rod_mount_base_angle) and np.isclose(0, roll):
-                self.median_pitch_and_roll_torques = (self.pitch_torque[-1], self.roll_torque[-1])
-                self.pitch_roll_ratio = self.pitch_torque[-1] / self.roll_torque[-1]
-
-        self.max_pushrod_force = max(self.max_pushrod_force)
-
-        # print(self.pitch)
-        # print(self.roll)
-        # print(self.pitch_torque)
-        # print(self.roll_torque)
-        # print(self.pitch_omega)
-        # print(self.roll_omega)
-
-    def calculate(self):
+        self.kinematics = kinematics
+        self._apply_drive()
+        self._report_progress(1)
+
+    def update_drive(self, motor_torque=None, motor_rpm=None, i_pitch=None, i_roll=None,
+                     pitch_linear_rad=None, roll_linear_rad=None):
+        """
+        Changes the motor, inertia, or inspection radius values and updates
+        the results without solving the geometry again.
+
+        Only the given values are changed. Solves the rig if it hasn't been yet.
+
+        :return: None
+        """
+
+        for name, value in zip(DRIVE_VALUES, (motor_torque, motor_rpm, i_pitch, i_roll,
+                                              pitch_linear_rad, roll_linear_rad)):
+            if value is not None:
+                setattr(self, name, value)
+
+        if getattr(self, 'kinematics', None) is None:
+            self.calculate()
+            return
+
+        self._apply_drive()
+        self._get_max_speeds()
+
+    def calculate(self, progress=None, kinematics=None):
         """
         The main function that solves the rig.
 
-        Sets values to:
-        self.pitch_torque = []
-        self.roll_torque = []
-        self.pitch_omega = []
-        self.roll_omega = []
-        self.pitch = []
-        self.roll = []
+        Sets self.results, a RigResults, and, as views of it:
+        self.pitch_torque
+        self.roll_torque
+        self.pitch_omega
+        self.roll_omega
+        self.pitch
+        self.roll
+        ...
 
-        Values are set in no particular order but are in the same
-        order for each list so the Nth item for each list references
-        the same point.
+        Values are in the same order for each field so the Nth item
+        for each field references the same point.
 
         And:
 
@@ -399,17 +1607,309 @@ class Rig:
         self.zx_pushrod_angle_linear
         self.xy_rodmount_pushrod_angle_linear
 
+        :param callable progress: Called with the fraction of the solve that's
+        done, from 0 to 1, every so often. Raising an exception from it stops
+        the solve.
+        :param RigKinematics kinematics: The already solved kinematics of a Rig
+        with the same geometry, to use instead of solving them again.
         :return: None
         """
-        self._calc_performance()
+        self.progress = progress
+        try:
+            self._calc_performance(kinematics)
+        finally:
+            self.progress = None
 
         self._get_angles()
 
-        if self.i_pitch > 0 and self.i_roll > 0:
-            self._get_max_speeds()
+        self._get_max_speeds()
+
+    def calculate_progressive(self, first_steps=4, progress=None, coarse=None):
+        """
+        Solves the rig on successively finer grids, from first_steps up to
+        self.plot_steps, doubling each time.
+
+        The first grid is solved as calculate() would. Every grid after it is
+        solved all at once, with each point estimated from the nearest point
+        of the grid before it. With more than one worker, every grid is split
+        across the same pool of processes.
+
+        After each grid is solved the rig is set up as calculate() leaves it,
+        but with that grid's results, and the number of steps is yielded. The
+        last grid is self.plot_steps, so once the generator is used up the rig
+        is the same as after calculate(). Only the last grid is cached.
+
+        An adaptive rig, or one that's already cached, is solved in one go.
+
+        :param int first_steps: The steps of the first grid. Must be even.
+        :param callable progress: As in calculate().
+        :param RigKinematics coarse: The kinematics of a regular grid with
+        fewer steps, but otherwise the same geometry, such as a preview. The
+        grids are then solved from the one after it, so it's not solved again,
+        and first_steps is ignored.
+        :return: A generator of the number of steps of each grid as it's solved.
+        """
+
+        kinematics = None
+        if self.cache is not None:
+            kinematics = self.cache.load(self.geometry)
+
+        steps = []
+        level = None
+        if not self.adaptive and kinematics is None:
+            if coarse is not None and coarse.shape is not None and coarse.shape[0] - 1 < self.plot_steps:
+                level = self._kinematics_level(coarse)
+                first_steps = 2 * (coarse.shape[0] - 1)
+            steps = [first_steps * 2 ** i for i in range(int(np.ceil(np.log2(self.plot_steps / first_steps))))]
+
+        executor = None
+        if self.workers > 1 and (steps or level is not None):
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        self.progress = progress
+        try:
+            for i, level_steps in enumerate(steps):
+                level = self._solve_level(level_steps, level, executor)
+                self.kinematics = self._build_kinematics(*self._flatten_level(level))
+                self._apply_drive()
+                self._get_angles()
+                self._get_max_speeds()
+                # the first grid's edge walk reports up to a half
+                self._report_progress(0.5 + 0.5 * (i + 1) / (len(steps) + 1))
+                yield level_steps
+
+            if level is not None:
+                level = self._solve_level(self.plot_steps, level, executor)
+                kinematics = self._build_kinematics(*self._flatten_level(level))
+                if self.cache is not None:
+                    self.cache.store(self.geometry, kinematics)
+        finally:
+            self.progress = None
+            if executor is not None:
+                executor.shutdown()
+
+        self.calculate(progress, kinematics)
+        yield self.plot_steps
+
+    def _solve_level(self, steps, previous=None, executor=None):
+        """
+        Solves the Rod Mount positions and ratios on a grid with a given
+        number of steps.
+
+        :param int steps: The number of steps across the grid.
+        :param tuple previous: The last grid solved, as returned by this
+        method, to estimate the points from. If None, the grid is solved as
+        in _solve_grid.
+        :param ProcessPoolExecutor executor: The pool to solve the grid in, or
+        None to solve it in this process.
+        :return: The positions of the two actuators along the grid, the two
+        Rod Mounts as len(positions1) x len(positions2) x 3 arrays, and the
+        pitch and roll ratios as len(positions1) x len(positions2) arrays.
+        """
+
+        positions1, positions2 = self._grid_positions(self.grid_spacing * self.plot_steps / steps)
+        shape = (len(positions1), len(positions2))
+
+        if previous is None:
+            if executor is not None:
+                return (positions1, positions2) + self._solve_grid_parallel(positions1, positions2, executor)
+            flat = self._flatten_grid(positions1, positions2, *self._solve_grid(positions1, positions2))
+            return (positions1, positions2) + self._unflatten(shape, *flat[2:6])
+
+        coarse1, coarse2, coarse_mounts1, coarse_mounts2 = previous[:4]
+        nearest1 = np.abs(positions1[:, None] - coarse1).argmin(axis=1)
+        nearest2 = np.abs(positions2[:, None] - coarse2).argmin(axis=1)
+        estimates = (coarse_mounts1[np.ix_(nearest1, nearest2)].reshape(-1, 3),
+                     coarse_mounts2[np.ix_(nearest1, nearest2)].reshape(-1, 3))
+
+        grid1, grid2 = (a.ravel() for a in np.meshgrid(positions1, positions2, indexing='ij'))
+        if executor is not None:
+            points = self._solve_points_parallel(grid1, grid2, estimates, executor)
         else:
-            self.max_pitch_speed = -1
-            self.max_roll_speed = -1
+            points = _solve_points(self, grid1, grid2, estimates)
+
+        return (positions1, positions2) + self._unflatten(shape, *points)
+
+    @staticmethod
+    def _unflatten(shape, rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios):
+        """
+        Reshapes the Rod Mounts and ratios of a flattened grid to the grid's shape.
+
+        :param tuple[int, int] shape: The shape of the grid.
+        :return: The two Rod Mounts, as shape x 3 arrays, and the pitch and
+        roll ratios, as shape arrays.
+        """
+
+        return (rod_mounts1.reshape(shape + (3,)), rod_mounts2.reshape(shape + (3,)),
+                pitch_ratios.reshape(shape), roll_ratios.reshape(shape))
+
+    @staticmethod
+    def _kinematics_level(kinematics):
+        """
+        Puts solved kinematics of a regular grid in the form _solve_level
+        returns a grid in.
+
+        :param RigKinematics kinematics: Kinematics with a shape.
+        :return: As _solve_level.
+        """
+
+        shape = kinematics.shape
+
+        return (np.asarray(kinematics.positions1).reshape(shape)[:, 0],
+                np.asarray(kinematics.positions2).reshape(shape)[0],
+                np.asarray(kinematics.rod_mounts1).reshape(shape + (3,)),
+                np.asarray(kinematics.rod_mounts2).reshape(shape + (3,)),
+                np.asarray(kinematics.pitch_ratios).reshape(shape),
+                np.asarray(kinematics.roll_ratios).reshape(shape))
+
+    @staticmethod
+    def _flatten_level(level):
+        """
+        Flattens a grid solved by _solve_level.
+
+        :param tuple level: As returned by _solve_level.
+        :return: The points in the same form as _solve_kinematics.
+        """
+
+        positions1, positions2, rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios = level
+        shape = (len(positions1), len(positions2))
+        grid1, grid2 = (a.ravel() for a in np.meshgrid(positions1, positions2, indexing='ij'))
+
+        return (grid1, grid2, rod_mounts1.reshape(-1, 3), rod_mounts2.reshape(-1, 3),
+                pitch_ratios.ravel(), roll_ratios.ravel(), shape)
+
+    def inverse_kinematics(self, pitch, roll, pitch_torque=0, roll_torque=0, estimated_positions=None):
+        """
+        Calculates the actuator positions that put the rocker at target
+        orientations, and the motor torques needed there to put given torques
+        on the rocker.
+
+        The Rod Mounts are fixed to the rocker, so they follow straight from
+        each target, which leaves each pushrod's closure equation to be solved
+        on its own, in closed form. For a linear actuator that's a distance.
+        For a CTC it's an equation in the form A * cos(angle) + B * sin(angle) = C,
+        which has up to two solutions, and the one closest to the estimate
+        is used.
+
+        The motor torques are the rocker torques through the transpose of the
+        implicit Jacobian, so with pitch_torque of self.pitch_torque at a point
+        and no roll torque, each motor needs about self.motor_torque.
+
+        :param array[float] pitch: The target pitch, in degrees from the nominal
+        position, as in self.pitch.
+        :param array[float] roll: The target roll, in degrees.
+        :param array[float] pitch_torque: The torque needed about the pitch axis.
+        :param array[float] roll_torque: The torque needed about the roll axis.
+        :param tuple[array, array] estimated_positions: For a CTC, the estimated
+        angle of each CTC, in radians, such as the solution of the previous
+        target. Defaults to the neutral angle.
+        :return: A tuple of arrays in the form positions1, positions2,
+        motor_torques1, motor_torques2, reachable. The positions are CTC angles,
+        in radians, or pushrod lengths. Everything but reachable is NaN for a
+        target outside the actuators' travel.
+        """
+
+        pitch, roll, pitch_torque, roll_torque = (
+            a.ravel() for a in np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                                     for v in (pitch, roll, pitch_torque, roll_torque))))
+        rod_mounts1, rod_mounts2 = self._calc_rod_mounts_from_pitch_and_roll(
+            np.radians(pitch) + self.rod_mount_base_angle, np.radians(roll))
+
+        if self.drive == CTC:
+            if estimated_positions is None:
+                estimated_positions = (self.ctc_neutral_angle, self.ctc_neutral_angle)
+            positions = []
+            for rod_mounts, lower_pivot, motor_angle, estimate in zip((rod_mounts1, rod_mounts2),
+                                                                      (self.lower_pivot1, self.lower_pivot2),
+                                                                      (self.motor1_angle, self.motor2_angle),
+                                                                      estimated_positions):
+                d = rod_mounts - lower_pivot
+                a = d[:, 0] * np.cos(motor_angle) + d[:, 2] * np.sin(motor_angle)
+                b = d[:, 1]
+                c = (np.sum(d ** 2, axis=-1) + self.ctc_length ** 2 - self.pushrod_length ** 2) / (2 * self.ctc_length)
+                positions.append(self._solve_harmonic(a, b, c, estimate))
+            low, high = self.ctc_min_angle, self.ctc_max_angle
+        elif self.drive == LINEAR:
+            positions = [np.linalg.norm(rod_mounts1 - self.lower_pivot1, axis=-1),
+                         np.linalg.norm(rod_mounts2 - self.lower_pivot2, axis=-1)]
+            low, high = self.pushrod_min_length, self.pushrod_max_length
+
+        # a little slack so the ends of the travel, as solved forwards, count
+        slack = 1e-9 * (high - low)
+        positions1, positions2 = positions
+        with np.errstate(invalid='ignore'):
+            reachable = ((positions1 >= low - slack) & (positions1 <= high + slack)
+                         & (positions2 >= low - slack) & (positions2 <= high + slack))
+        positions1[~reachable] = np.nan
+        positions2[~reachable] = np.nan
+
+        motor_torques = np.full((len(pitch), 2), np.nan)
+        if reachable.any():
+            jacobian = self._implicit_jacobian(positions1[reachable], positions2[reachable],
+                                               rod_mounts1[reachable], rod_mounts2[reachable])
+            torques = np.stack((pitch_torque[reachable], roll_torque[reachable]), axis=-1)
+            motor_torques[reachable] = np.einsum('nij,ni->nj', jacobian, torques)
+
+        return positions1, positions2, motor_torques[:, 0], motor_torques[:, 1], reachable
+
+    def lookup_table(self, pitch_points=LOOKUP_POINTS, roll_points=LOOKUP_POINTS, pitch_limits=None,
+                     roll_limits=None):
+        """
+        Tabulates the inverse kinematics over a uniform grid of pitch and
+        roll, for interpolating instead of solving.
+
+        The table's max_error is the most that bilinear interpolation was
+        found to be off by, see LookupTable.measure_error.
+
+        :param int pitch_points: The number of rows.
+        :param int roll_points: The number of columns.
+        :param tuple[float, float] pitch_limits: The lowest and highest
+        pitch, in degrees. Defaults to the range the Rig can reach, which
+        calculates it if it hasn't been.
+        :param tuple[float, float] roll_limits: The lowest and highest roll,
+        in degrees. Defaults to the range the Rig can reach.
+        :return: A lookup.LookupTable.
+        """
+
+        if pitch_limits is None or roll_limits is None:
+            if not hasattr(self, 'results'):
+                self.calculate()
+            if pitch_limits is None:
+                pitch_limits = (np.nanmin(self.pitch), np.nanmax(self.pitch))
+            if roll_limits is None:
+                roll_limits = (np.nanmin(self.roll), np.nanmax(self.roll))
+
+        pitch, roll = np.meshgrid(np.linspace(*pitch_limits, pitch_points), np.linspace(*roll_limits, roll_points),
+                                  indexing='ij')
+        positions1, positions2 = self.inverse_kinematics(pitch, roll)[:2]
+
+        table = LookupTable(np.stack((positions1, positions2)).reshape(2, pitch_points, roll_points),
+                            pitch_limits, roll_limits, self.drive)
+        table.max_error = table.measure_error(self)
+
+        return table
+
+    def summary(self):
+        """
+        Gets the scalar outputs of a solved rig.
+
+        :return: A dict of floats. NaN for anything that couldn't be found.
+        """
+
+        if self.drive == CTC:
+            pushrod_length = self.pushrod_length
+        else:
+            pushrod_length = self.pushrod_nominal_length
+
+        return {'pushrod_length': float(pushrod_length),
+                'min_pitch': float(np.min(self.pitch)),
+                'max_pitch': float(np.max(self.pitch)),
+                'min_roll': float(np.min(self.roll)),
+                'max_roll': float(np.max(self.roll)),
+                'max_pushrod_force': float(self.max_pushrod_force),
+                'pitch_roll_ratio': float(getattr(self, 'pitch_roll_ratio', np.nan)),
+                'max_pitch_speed': float(self.max_pitch_speed),
+                'max_roll_speed': float(self.max_roll_speed)}
 
     def _get_angles(self):
         """
@@ -447,20 +1947,11 @@ class Rig:
             rodmount_ctc = self._calc_length(self.rod_mount, ctc_location)
             self.xy_rodmount_pushrod_angle_ctc = rodmount_pushrod_inner_angle(pivot_ctc, rodmount, rodmount_ctc)
 
-            rm = self.rod_mount
-            estimated_points = np.array([rm[0], rm[1], rm[2]]), np.array([rm[0], rm[1], -rm[2]])
-
-            ctc_location1 = self._calc_ctc_location(self.lower_pivot1, self.motor1_angle, self.ctc_max_angle)
-            rodmount_point1, _ = self._calc_rod_mount_points(self.ctc_max_angle, self.ctc_max_angle, estimated_points)
-            pushrod_angle1 = np.arctan((rodmount_point1[1] - ctc_location1[1]) /
-                                       (rodmount_point1[0] - ctc_location1[0])) + np.pi
-            self.max_ctc_pushrod_angle = np.degrees(pushrod_angle1 - self.ctc_max_angle)
-
-            ctc_location2 = self._calc_ctc_location(self.lower_pivot1, self.motor1_angle, self.ctc_min_angle)
-            rodmount_point2, _ = self._calc_rod_mount_points(self.ctc_min_angle, self.ctc_min_angle, estimated_points)
-            pushrod_angle2 = np.arctan((rodmount_point2[1] - ctc_location2[1]) /
-                                       (rodmount_point2[0] - ctc_location2[0]))
-            self.min_ctc_pushrod_angle = np.degrees(self.ctc_min_angle - pushrod_angle2)
+            # carried in the kinematics so that reusing them doesn't solve the end stops again
+            end_stop_angles = getattr(getattr(self, 'kinematics', None), 'end_stop_angles', None)
+            if end_stop_angles is None:
+                end_stop_angles = self._calc_end_stop_angles()
+            self.max_ctc_pushrod_angle, self.min_ctc_pushrod_angle = end_stop_angles
 
         elif self.drive == LINEAR:
             self.zx_rodmount_angle_linear = 2 * np.degrees(np.arctan(self.rod_mount[2] / self.rod_mount[0]))
@@ -473,6 +1964,33 @@ class Rig:
             pushrod = self.pushrod_nominal_length
             self.xy_rodmount_pushrod_angle_linear = rodmount_pushrod_inner_angle(pivot_ctc, rodmount, pushrod)
 
+    def _calc_end_stop_angles(self):
+        """
+        Finds the angle between the first CTC and its pushrod at each end of
+        the CTC's travel.
+
+        :return: A tuple of floats in the form max_ctc_pushrod_angle,
+        min_ctc_pushrod_angle, in degrees.
+        """
+
+        def symmetric_rod_mount(ctc_angle):
+            pitch = self._calc_symmetric_pitch(ctc_angle, self.rod_mount_base_angle)
+            return self._calc_rod_mounts_from_pitch_and_roll(pitch, 0)[0][0]
+
+        ctc_location1 = self._calc_ctc_location(self.lower_pivot1, self.motor1_angle, self.ctc_max_angle)
+        rodmount_point1 = symmetric_rod_mount(self.ctc_max_angle)
+        pushrod_angle1 = np.arctan((rodmount_point1[1] - ctc_location1[1]) /
+                                   (rodmount_point1[0] - ctc_location1[0])) + np.pi
+        max_ctc_pushrod_angle = np.degrees(pushrod_angle1 - self.ctc_max_angle)
+
+        ctc_location2 = self._calc_ctc_location(self.lower_pivot1, self.motor1_angle, self.ctc_min_angle)
+        rodmount_point2 = symmetric_rod_mount(self.ctc_min_angle)
+        pushrod_angle2 = np.arctan((rodmount_point2[1] - ctc_location2[1]) /
+                                   (rodmount_point2[0] - ctc_location2[0]))
+        min_ctc_pushrod_angle = np.degrees(self.ctc_min_angle - pushrod_angle2)
+
+        return float(max_ctc_pushrod_angle), float(min_ctc_pushrod_angle)
+
     def _get_max_speeds(self):
 
         def max_speed(angle, torque, inertia):
@@ -480,11 +1998,61 @@ class Rig:
             t = (angle * 2 / acceleration) ** 0.5
             return acceleration * t
 
+        if not (self.i_pitch > 0 and self.i_roll > 0):
+            self.max_pitch_speed = -1
+            self.max_roll_speed = -1
+            return
+
         try:
             pitch_torque, roll_torque = self.median_pitch_and_roll_torques
 
-            self.max_pitch_speed = max_speed(max(self.pitch) * 2, pitch_torque, self.i_pitch)
-            self.max_roll_speed = max_speed(max(self.roll) * 2, roll_torque, self.i_roll)
+            self.max_pitch_speed = max_speed(np.max(self.pitch) * 2, pitch_torque, self.i_pitch)
+            self.max_roll_speed = max_speed(np.max(self.roll) * 2, roll_torque, self.i_roll)
         except:
             self.max_pitch_speed = -1
             self.max_roll_speed = -1
+
+
+def _solve_tile(rig, positions1, positions2, edge1, edge2):
+    """
+    Solves the Rod Mount positions and ratios for some rows of a Rig's grid.
+
+    Runs in a worker process for Rig._solve_grid_parallel.
+
+    :param Rig rig: The rig being solved.
+    :param array[float] positions1: The first actuator's positions, one per row.
+    :param array[float] positions2: The second actuator's positions.
+    :param array[N, 3] edge1: The first Rod Mount at the start of each row.
+    :param array[N, 3] edge2: The second Rod Mount at the start of each row.
+    :return: The two Rod Mounts, as len(positions1) x len(positions2) x 3 arrays,
+    and the pitch and roll ratios, as len(positions1) x len(positions2) arrays.
+    """
+
+    rod_mounts1, rod_mounts2 = rig._solve_rows(positions1, positions2, edge1, edge2)
+
+    grid1, grid2 = np.meshgrid(positions1, positions2, indexing='ij')
+    pitch_ratios, roll_ratios = rig._calc_ratios(grid1.ravel(), grid2.ravel(),
+                                                 rod_mounts1.reshape(-1, 3), rod_mounts2.reshape(-1, 3))
+
+    return rod_mounts1, rod_mounts2, pitch_ratios.reshape(grid1.shape), roll_ratios.reshape(grid1.shape)
+
+
+def _solve_points(rig, positions1, positions2, estimated_points):
+    """
+    Solves the Rod Mount positions and ratios of scattered points of a Rig.
+
+    Runs in a worker process for Rig._solve_points_parallel.
+
+    :param Rig rig: The rig being solved.
+    :param array[float] positions1: The first CTC angles or linear actuator lengths.
+    :param array[float] positions2: The second CTC angles or linear actuator lengths.
+    :param tuple[array, array] estimated_points: The estimated Rod Mounts as
+    a pair of N x 3 arrays.
+    :return: The two Rod Mounts, as N x 3 arrays, and the pitch and roll
+    ratios, as arrays.
+    """
+
+    rod_mounts1, rod_mounts2, _ = rig._solve_rod_mount_points(positions1, positions2, estimated_points)
+    pitch_ratios, roll_ratios = rig._calc_ratios(positions1, positions2, rod_mounts1, rod_mounts2)
+
+    return rod_mounts1, rod_mounts2, pitch_ratios, roll_ratios
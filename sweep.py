@@ -0,0 +1,223 @@
+"""
+Evaluates many Rig designs, without the GUI, and writes one summary row per
+design to a CSV file.
+
+A sweep can be stopped and started again with the same arguments, in which
+case only the designs that aren't in the file yet are evaluated.
+"""
+
+import csv
+import itertools
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from rig import ROD_MOUNT_MEMO, Rig
+
+GRID = 'grid'
+LATIN_HYPERCUBE = 'latin_hypercube'
+
+VECTOR_PARAMETERS = ('rod_mount', 'lower_pivot')
+AXES = ('x', 'y', 'z')
+
+SUMMARY_FIELDS = ('pushrod_length',
+                  'min_pitch', 'max_pitch',
+                  'min_roll', 'max_roll',
+                  'max_pushrod_force',
+                  'pitch_roll_ratio',
+                  'max_pitch_speed', 'max_roll_speed')
+
+
+def grid_samples(ranges, steps):
+    """
+    Gets every combination of evenly spaced values of each parameter.
+
+    :param dict[str, tuple[float, float]] ranges: The lowest and highest value
+    of each parameter.
+    :param int steps: The number of values of each parameter.
+    :return: A list of dicts of parameter values.
+    """
+
+    names = list(ranges)
+    values = [np.linspace(low, high, steps) for low, high in ranges.values()]
+
+    return [dict(zip(names, (float(v) for v in combination))) for combination in itertools.product(*values)]
+
+
+def latin_hypercube_samples(ranges, samples, seed=0):
+    """
+    Gets a Latin hypercube sample of the parameters.
+
+    Each parameter's range is split into as many equal bins as there are
+    samples, and each bin is used exactly once. The same seed always gives
+    the same samples.
+
+    :param dict[str, tuple[float, float]] ranges: The lowest and highest value
+    of each parameter.
+    :param int samples: The number of designs.
+    :param int seed: The random seed.
+    :return: A list of dicts of parameter values.
+    """
+
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (low, high) in ranges.items():
+        unit = (rng.permutation(samples) + rng.random(samples)) / samples
+        columns[name] = low + unit * (high - low)
+
+    return [{name: float(column[i]) for name, column in columns.items()} for i in range(samples)]
+
+
+def make_rig(base, design):
+    """
+    Builds a Rig from a base design with some parameters changed.
+
+    :param dict base: Keyword arguments for Rig.
+    :param dict[str, float] design: The parameters to change. Single
+    coordinates of rod_mount and lower_pivot can be changed with names
+    like rod_mount_x or lower_pivot_z.
+    :return: The Rig.
+    """
+
+    kwargs = dict(base)
+    for name in VECTOR_PARAMETERS:
+        kwargs[name] = np.array(kwargs[name], dtype=float)
+
+    for name, value in design.items():
+        vector, _, axis = name.rpartition('_')
+        if vector in VECTOR_PARAMETERS and axis in AXES:
+            kwargs[vector][AXES.index(axis)] = value
+        else:
+            kwargs[name] = value
+
+    return Rig(**kwargs)
+
+
+def evaluate(base, design):
+    """
+    Solves one design. Warnings are silenced, since a sweep is expected to
+    hit plenty of poor designs.
+
+    No two designs share a geometry, so ROD_MOUNT_MEMO is cleared after each
+    one rather than left to fill up with points that won't be looked up again.
+
+    :param dict base: Keyword arguments for Rig.
+    :param dict[str, float] design: The parameters to change.
+    :return: A dict of the summary values and an error message, which is empty
+    if the design solved.
+    """
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            rig = make_rig(base, design)
+            rig.calculate()
+            summary = rig.summary()
+        summary['error'] = ''
+    except Exception as e:
+        summary = {field: np.nan for field in SUMMARY_FIELDS}
+        summary['error'] = f'{type(e).__name__}: {e}'
+    finally:
+        ROD_MOUNT_MEMO.clear()
+
+    return summary
+
+
+def _evaluate_batch(base, designs):
+    """
+    Solves a batch of designs. Runs in a worker process.
+
+    :param dict base: Keyword arguments for Rig.
+    :param list[tuple[int, dict]] designs: The index and parameters of each design.
+    :return: A list of CSV rows.
+    """
+
+    rows = []
+    for index, design in designs:
+        summary = evaluate(base, design)
+        rows.append([index] + list(design.values()) + [summary[field] for field in SUMMARY_FIELDS + ('error',)])
+
+    return rows
+
+
+def _completed_designs(path, header):
+    """
+    Gets the designs that are already in a sweep's file.
+
+    Drops a partly written last line, so that it's evaluated again.
+
+    :param str path: The file.
+    :param list[str] header: The header the file should have.
+    :return: A set of design indices.
+    """
+
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return set()
+
+    with open(path, 'rb+') as f:
+        contents = f.read()
+        if not contents.endswith(b'\n'):
+            f.truncate(contents.rfind(b'\n') + 1)
+
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        if next(reader, None) != header:
+            raise ValueError(f'{path} is from a sweep with different parameters.')
+        return {int(row[0]) for row in reader if len(row) == len(header)}
+
+
+def sweep(base, ranges, samples, method=LATIN_HYPERCUBE, path='sweep.csv', workers=None, batch_size=50, seed=0):
+    """
+    Evaluates many designs and writes a summary row for each one to a CSV file.
+
+    Rows are written as each batch finishes, so progress is kept if the sweep
+    is stopped. Running it again with the same arguments skips the designs
+    that are already in the file.
+
+    :param dict base: Keyword arguments for Rig that all designs share.
+    :param dict[str, tuple[float, float]] ranges: The lowest and highest value
+    of each parameter that's varied.
+    :param int samples: The number of designs for LATIN_HYPERCUBE, or the
+    number of values of each parameter for GRID.
+    :param str method: LATIN_HYPERCUBE or GRID.
+    :param str path: The CSV file to write.
+    :param int workers: The number of processes. Defaults to one per CPU.
+    1 evaluates everything in this process.
+    :param int batch_size: The number of designs sent to a process at a time.
+    :param int seed: The random seed for LATIN_HYPERCUBE.
+    :return: The number of designs evaluated.
+    """
+
+    if method == GRID:
+        designs = grid_samples(ranges, samples)
+    elif method == LATIN_HYPERCUBE:
+        designs = latin_hypercube_samples(ranges, samples, seed)
+    else:
+        raise ValueError(f'Unknown sampling method {method!r}.')
+
+    header = ['design'] + list(ranges) + list(SUMMARY_FIELDS) + ['error']
+    completed = _completed_designs(path, header)
+    remaining = [(i, design) for i, design in enumerate(designs) if i not in completed]
+    batches = [remaining[i:i + batch_size] for i in range(0, len(remaining), batch_size)]
+
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if not completed:
+            f.seek(0)
+            f.truncate()
+            writer.writerow(header)
+
+        if workers == 1:
+            results = (_evaluate_batch(base, batch) for batch in batches)
+            for rows in results:
+                writer.writerows(rows)
+                f.flush()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for rows in executor.map(_evaluate_batch, itertools.repeat(base), batches):
+                    writer.writerows(rows)
+                    f.flush()
+
+    return len(remaining)
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+
+import project
+from batch import CSV, HEADER, JSON_LINES, find_projects, main, run
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_projects(project_info, folder):
+    linear = dict(project_info, inputs_tab_index='1')
+    broken = dict(project_info, ctc_length='two')
+    for name, info in (('a.mv', project_info), ('b.mv', linear), ('c.mv', broken)):
+        project.save(str(folder / name), info)
+    (folder / 'notes.txt').write_text('not a project')
+
+
+def test_find_projects(project_info, tmp_path):
+    write_projects(project_info, tmp_path)
+
+    projects = find_projects([str(tmp_path), 'other.mv'])
+
+    assert [os.path.basename(p) for p in projects] == ['a.mv', 'b.mv', 'c.mv', 'other.mv']
+
+
+def test_run_json_lines(project_info, tmp_path):
+    write_projects(project_info, tmp_path)
+    output = io.StringIO()
+
+    failed = run([str(tmp_path)], output, JSON_LINES, workers=1, plot_steps=6)
+
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert failed == 1
+    assert [row['drive'] for row in rows] == ['ctc', 'linear', 'ctc']
+    assert all(list(row) == list(HEADER) for row in rows)
+    assert rows[0]['error'] == '' and rows[0]['max_pushrod_force'] > 0
+    assert rows[2]['error'].startswith('ValueError') and rows[2]['pushrod_length'] is None
+
+
+def test_run_csv_parallel_matches_serial(project_info, tmp_path):
+    write_projects(project_info, tmp_path)
+    serial, parallel = io.StringIO(), io.StringIO()
+
+    run([str(tmp_path)], serial, CSV, workers=1, plot_steps=6)
+    run([str(tmp_path)], parallel, CSV, workers=2, plot_steps=6)
+
+    rows = list(csv.reader(io.StringIO(serial.getvalue())))
+    assert rows[0] == list(HEADER)
+    assert len(rows) == 4
+    assert parallel.getvalue() == serial.getvalue()
+
+
+def test_main_exit_code(project_info, tmp_path):
+    project.save(str(tmp_path / 'a.mv'), project_info)
+    path = str(tmp_path / 'out.csv')
+
+    assert main([str(tmp_path / 'a.mv'), '--format', 'csv', '-o', path, '-j', '1', '--plot-steps', '4']) == 0
+    assert main([str(tmp_path / 'missing.mv'), '-o', path]) == 1
+
+
+def test_module_without_gui(project_info, tmp_path):
+    project.save(str(tmp_path / 'a.mv'), project_info)
+    code = ('import runpy, sys\n'
+            f'sys.argv = ["batch", {str(tmp_path / "a.mv")!r}, "-j", "1", "--plot-steps", "4"]\n'
+            'try:\n'
+            '    runpy.run_module("batch", run_name="__main__")\n'
+            'finally:\n'
+            '    print(sorted({m.split(".")[0] for m in sys.modules} & {"PySide6", "matplotlib"}))\n')
+
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True).stdout
+
+    lines = output.splitlines()
+    assert json.loads(lines[0])['error'] == ''
+    assert lines[-1] == '[]'
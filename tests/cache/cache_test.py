@@ -0,0 +1,126 @@
+import os
+import shutil
+
+import numpy as np
+
+import cache
+from cache import KinematicsCache, geometry_key
+
+
+def test_geometry_key(make_ctc_rig, monkeypatch):
+    key = geometry_key(make_ctc_rig().geometry)
+
+    assert key == geometry_key(make_ctc_rig(motor_torque=1).geometry)
+    assert key != geometry_key(make_ctc_rig(ctc_length=3).geometry)
+
+    monkeypatch.setattr(cache, 'SOLVER_VERSION', cache.SOLVER_VERSION + 1)
+    assert key != geometry_key(make_ctc_rig().geometry)
+
+
+def test_load_missing(kinematics_cache, make_ctc_rig):
+    assert kinematics_cache.load(make_ctc_rig().geometry) is None
+
+
+def test_rig_uses_cache(kinematics_cache, make_ctc_rig):
+    solved = make_ctc_rig()
+    solved.calculate()
+
+    rig = make_ctc_rig()
+    rig._calc_kinematics = None  # would fail if it were called
+    rig.calculate()
+
+    assert isinstance(rig.kinematics.pitch_ratios, np.memmap)
+    assert rig.kinematics.shape == solved.kinematics.shape
+    assert rig.kinematics.end_stop_angles == solved.kinematics.end_stop_angles
+    np.testing.assert_array_equal(rig.results.data, solved.results.data)
+    assert rig.summary() == solved.summary()
+
+
+def test_progressive_loads_cache_once(kinematics_cache, make_ctc_rig, monkeypatch):
+    solved = make_ctc_rig()
+    solved.calculate()
+
+    loads = []
+    load = kinematics_cache.load
+    monkeypatch.setattr(kinematics_cache, 'load', lambda geometry: loads.append(geometry) or load(geometry))
+
+    rig = make_ctc_rig()
+    assert list(rig.calculate_progressive()) == [rig.plot_steps]
+
+    assert len(loads) == 1
+    np.testing.assert_array_equal(rig.results.data, solved.results.data)
+
+
+def test_eviction(tmp_path, make_ctc_rig):
+    rig = make_ctc_rig()
+    rig.calculate()
+    kinematics_cache = KinematicsCache(str(tmp_path), max_bytes=1)
+
+    kinematics_cache.store({'a': 1}, rig.kinematics)
+    kinematics_cache.store({'b': 2}, rig.kinematics)
+
+    assert kinematics_cache.load({'a': 1}) is None
+    assert kinematics_cache.load({'b': 2}) is None
+
+
+def test_least_recently_used_evicted(tmp_path, make_ctc_rig):
+    rig = make_ctc_rig()
+    rig.calculate()
+    kinematics_cache = KinematicsCache(str(tmp_path))
+    for i, geometry in enumerate(({'a': 1}, {'b': 2})):
+        kinematics_cache.store(geometry, rig.kinematics)
+        os.utime(os.path.join(kinematics_cache.path, geometry_key(geometry)), (i, i))
+    kinematics_cache.load({'a': 1})
+
+    entry_size = sum(f.stat().st_size for f in os.scandir(os.path.join(kinematics_cache.path, geometry_key({'a': 1}))))
+    kinematics_cache.max_bytes = 2 * entry_size
+    kinematics_cache.store({'c': 3}, rig.kinematics)
+
+    assert kinematics_cache.load({'a': 1}) is not None
+    assert kinematics_cache.load({'b': 2}) is None
+    assert kinematics_cache.load({'c': 3}) is not None
+
+
+def test_old_versions_removed(tmp_path, make_ctc_rig, monkeypatch):
+    rig = make_ctc_rig()
+    rig.calculate()
+    old_path = rig.cache.path
+
+    monkeypatch.setattr(cache, 'SOLVER_VERSION', cache.SOLVER_VERSION + 1)
+    KinematicsCache(str(tmp_path)).store(rig.geometry, rig.kinematics)
+
+    assert not os.path.exists(old_path)
+
+
+def test_load_evicted_meanwhile(kinematics_cache, make_ctc_rig, monkeypatch):
+    rig = make_ctc_rig()
+    rig.calculate()
+
+    def evicted(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, 'utime', evicted)
+
+    assert kinematics_cache.load(rig.geometry) is None
+
+
+def test_undeletable_entry_still_counted(tmp_path, make_ctc_rig, monkeypatch):
+    rig = make_ctc_rig()
+    rig.calculate()
+    kinematics_cache = KinematicsCache(str(tmp_path / 'other'))
+    for i, geometry in enumerate(({'a': 1}, {'b': 2})):
+        kinematics_cache.store(geometry, rig.kinematics)
+        os.utime(os.path.join(kinematics_cache.path, geometry_key(geometry)), (i, i))
+
+    # as on Windows, where a memory mapped entry can't be deleted
+    locked = os.path.join(kinematics_cache.path, geometry_key({'a': 1}))
+    rmtree = shutil.rmtree
+    monkeypatch.setattr(shutil, 'rmtree', lambda path, **kwargs: None if path == locked else rmtree(path, **kwargs))
+
+    entry_size = sum(f.stat().st_size for f in os.scandir(locked))
+    kinematics_cache.max_bytes = 2 * entry_size
+    kinematics_cache.store({'c': 3}, rig.kinematics)
+
+    assert kinematics_cache.load({'a': 1}) is not None
+    assert kinematics_cache.load({'b': 2}) is None
+    assert kinematics_cache.load({'c': 3}) is not None
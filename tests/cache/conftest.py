@@ -0,0 +1,8 @@
+import pytest
+
+from cache import KinematicsCache
+
+
+@pytest.fixture
+def kinematics_cache(tmp_path):
+    return KinematicsCache(str(tmp_path))
@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pytest
+
+from rig import Rig
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def project_info():
+    return {'rod_mount_x_ctc': '23', 'rod_mount_y_ctc': '28', 'rod_mount_z_ctc': '8.5',
+            'motor_x': '45.5', 'motor_y': '-8', 'motor_z': '13', 'motor_angle': '10',
+            'ctc_length': '2.5', 'ctc_neutral_angle': '45', 'ctc_rotation': '45',
+            'motor_torque_ctc': '480', 'motor_rpm_ctc': '70', 'i_pitch_ctc': '0', 'i_roll_ctc': '0',
+            'pitch_linear_rad_ctc': '0', 'roll_linear_rad_ctc': '0',
+            'rod_mount_x_linear': '23', 'rod_mount_y_linear': '28', 'rod_mount_z_linear': '8.5',
+            'lower_mount_x_linear': '45.5', 'lower_mount_y_linear': '-8', 'lower_mount_z_linear': '13',
+            'linear_travel': '8', 'screw_pitch': '0.19685', 'motor_torque_linear': '0.4', 'motor_rpm_linear': '3500',
+            'i_pitch_linear': '0', 'i_roll_linear': '0',
+            'pitch_linear_rad_linear': '0', 'roll_linear_rad_linear': '0',
+            'inputs_tab_index': '0', 'outputs_tab_index': '0'}
+
+
+@pytest.fixture
+def ctc_kwargs():
+    # the CTC design most of the tests solve, as keyword arguments for Rig
+    return {'rod_mount': np.array([23., 28.0, 8.5]),
+            'lower_pivot': np.array([45.5, -8., 13.]),
+            'motor_angle': 10,
+            'motor_torque': 40 * 12,
+            'motor_rpm': 70,
+            'ctc_length': 2.5,
+            'ctc_neutral_angle': 45,
+            'ctc_total_rotation': 45,
+            'drive': 'ctc'}
+
+
+@pytest.fixture
+def linear_kwargs():
+    # the same design with a linear actuator in place of the CTC
+    return {'rod_mount': np.array([23., 28.0, 8.5]),
+            'lower_pivot': np.array([45.5, -8., 13.]),
+            'motor_torque': 0.4,
+            'motor_rpm': 3500,
+            'linear_travel': 8,
+            'screw_pitch': 5 / 25.4,
+            'drive': 'linear'}
+
+
+@pytest.fixture
+def kinematics_cache():
+    # None but in the cache tests, which override it with a real cache
+    return None
+
+
+@pytest.fixture
+def make_ctc_rig(ctc_kwargs, kinematics_cache):
+    def make(ctc_length=2.5, motor_torque=40 * 12, plot_steps=6):
+        return Rig(**dict(ctc_kwargs, ctc_length=ctc_length, motor_torque=motor_torque),
+                   plot_steps=plot_steps, cache=kinematics_cache)
+
+    return make
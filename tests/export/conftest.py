@@ -0,0 +1,12 @@
+import numpy as np
+import pytest
+
+from rig import RigResults
+
+
+@pytest.fixture
+def results():
+    results = RigResults(5 * 7, (5, 7))
+    results.data[:] = np.random.default_rng(0).normal(size=results.data.shape)
+    results.pitch_torque[3] = np.nan
+    return results
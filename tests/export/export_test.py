@@ -0,0 +1,88 @@
+import csv
+
+import numpy as np
+import pytest
+
+import export
+from rig import RigResults
+
+
+def assert_same(columns, results):
+    assert columns['shape'] == results.shape
+    for name in RigResults.FIELDS:
+        assert np.array_equal(columns[name], results[name], equal_nan=True)
+
+
+def test_csv(results, tmp_path):
+    path = str(tmp_path / 'results.csv')
+
+    export.write_csv(results, path, chunk=4)
+
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(RigResults.FIELDS)
+    assert len(rows) == len(results) + 1
+    assert np.array_equal(np.array(rows[1:], dtype=float).T, results.data, equal_nan=True)
+
+
+def test_columnar(results, tmp_path):
+    path = str(tmp_path / 'results.mvcol')
+
+    export.write_columnar(results, path)
+    columns = export.read_columnar(path)
+
+    assert_same(columns, results)
+    assert all(columns[name].offset % export.COLUMNAR_ALIGNMENT == 0 for name in RigResults.FIELDS)
+
+
+def test_columnar_not_grid(tmp_path):
+    results = RigResults(3)
+    results.data[:] = 1
+    path = str(tmp_path / 'results.mvcol')
+
+    export.write_columnar(results, path)
+
+    assert_same(export.read_columnar(path), results)
+
+
+def test_read_columnar_wrong_file(tmp_path):
+    path = tmp_path / 'results.mvcol'
+    path.write_bytes(b'pitch,roll\n')
+
+    with pytest.raises(ValueError):
+        export.read_columnar(str(path))
+
+
+def test_npy(results, tmp_path):
+    path = str(tmp_path / 'results')
+
+    export.write_npy(results, path)
+    columns = export.read_npy(path)
+
+    assert_same(columns, results)
+    assert isinstance(columns['pitch'], np.memmap)
+
+
+def test_arrow(results, tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'results.arrow')
+
+    export.write_arrow(results, path)
+
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    assert table.column_names == list(RigResults.FIELDS)
+    assert np.array_equal(table.column('pitch_torque').to_numpy(), results.pitch_torque, equal_nan=True)
+
+
+def test_export_picks_format_from_extension(results, tmp_path):
+    export.export(results, str(tmp_path / 'results.csv'))
+    export.export(results, str(tmp_path / 'results.mvcol'))
+    export.export(results, str(tmp_path / 'bundle'))
+
+    assert (tmp_path / 'results.csv').read_text().startswith('pitch,roll,')
+    assert_same(export.read_columnar(str(tmp_path / 'results.mvcol')), results)
+    assert_same(export.read_npy(str(tmp_path / 'bundle')), results)
+
+    with pytest.raises(ValueError):
+        export.export(results, str(tmp_path / 'results.csv'), 'parquet')
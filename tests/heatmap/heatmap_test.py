@@ -0,0 +1,41 @@
+import numpy as np
+
+from heatmap import LUT, HeatMapFigure, colormap, nice_ticks
+
+
+def test_colormap():
+    colours = colormap(np.array([0., 5., 10., 20.]), 0., 10.)
+
+    assert colours[0] == LUT[0] == 0xFF440154
+    assert colours[2] == colours[3] == LUT[-1] == 0xFFFDE725
+    assert colours[1] == LUT[128]
+
+
+def test_nice_ticks():
+    np.testing.assert_allclose(nice_ticks(-5.4, 5.4), [-4., -2., 0., 2., 4.])
+    np.testing.assert_allclose(nice_ticks(13400, 15600), [13500., 14000., 14500., 15000., 15500.])
+    np.testing.assert_allclose(nice_ticks(3., 3.), [3.])
+
+
+def test_heat_map_render(qapp):
+    figure = HeatMapFigure('Pitch Torque', 'Roll Torque', 'Torque')
+    roll, pitch = (a.ravel() for a in np.meshgrid(np.linspace(-5, 5, 9), np.linspace(-1, 1, 5)))
+    figure.update(roll, pitch, roll, np.where(roll > 0, np.nan, pitch))
+
+    image = figure.render()
+
+    assert (image.width(), image.height()) == (600, 500)
+    pixels = figure._pixels
+    upper, lower = pixels[:270], pixels[270:]
+    assert np.isin(LUT[[0, -1]], upper).all()
+    assert np.isin(LUT[0], lower) and np.isin(LUT[-1], lower)
+
+
+def test_heat_map_render_empty(qapp):
+    figure = HeatMapFigure('Pitch Torque', 'Roll Torque', 'Torque')
+    figure.update(np.array([np.nan]), np.array([0.]), np.array([1.]), np.array([1.]))
+
+    image = figure.render()
+
+    assert not np.isin(LUT, figure._pixels).any()
+    assert image.width() == 600
@@ -0,0 +1,48 @@
+from live import LinkedSpinBox, LiveControls, field_name
+
+
+def make_line_edit(name, text):
+    from PySide6.QtWidgets import QLineEdit
+
+    line_edit = QLineEdit(text)
+    line_edit.setObjectName(name)
+    return line_edit
+
+
+def test_field_name(qapp):
+    assert field_name(make_line_edit('rod_mount_x_ctc', '')) == 'Rod mount x'
+    assert field_name(make_line_edit('screw_pitch', '')) == 'Screw pitch'
+
+
+def test_linked_spin_box(qapp):
+    line_edit = make_line_edit('ctc_length', '2.5')
+    spin_box = LinkedSpinBox(line_edit)
+    edits = []
+    spin_box.edited.connect(lambda: edits.append(line_edit.text()))
+
+    assert spin_box.value() == 2.5
+    assert spin_box.singleStep() == 0.1
+
+    spin_box.stepBy(2)
+    assert line_edit.text() == '2.7'
+    assert edits == ['2.7']
+
+    line_edit.setText('40')
+    assert spin_box.value() == 40
+    assert spin_box.singleStep() == 1
+    line_edit.setText('4-')
+    assert spin_box.value() == 40
+    assert edits == ['2.7']
+
+
+def test_live_controls(qapp):
+    line_edits = [make_line_edit('motor_x', '1'), make_line_edit('linear_travel', '8')]
+    controls = LiveControls([('CTC', line_edits[:1]), ('Linear Actuator', line_edits[1:])])
+    edits = []
+    controls.edited.connect(lambda: edits.append(True))
+
+    controls.spin_boxes[1].setValue(9)
+
+    assert [box.line_edit for box in controls.spin_boxes] == line_edits
+    assert line_edits[1].text() == '9'
+    assert edits == [True]
@@ -0,0 +1,13 @@
+from rig import Rig
+
+import pytest
+
+
+@pytest.fixture
+def rig_ctc(ctc_kwargs):
+    return Rig(**ctc_kwargs)
+
+
+@pytest.fixture
+def rig_la(linear_kwargs):
+    return Rig(**linear_kwargs)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from lookup import BICUBIC, BILINEAR, LookupTable
+
+
+def test_lookup_table_matches_inverse_kinematics(rig_ctc, rig_la):
+    for rig in (rig_ctc, rig_la):
+        table = rig.lookup_table(33, 41)
+
+        assert table.table.dtype == np.float32
+        assert table.shape == (33, 41)
+        assert table.drive == rig.drive
+        assert table.pitch_limits == (np.min(rig.pitch), np.max(rig.pitch))
+
+        # at the grid points interpolation gives the table back, other than
+        # beside unreachable points, which are needed there
+        pitch, roll = np.meshgrid(table.pitches(), table.rolls(), indexing='ij')
+        positions1, positions2 = table.interpolate(pitch, roll)
+        found = np.isfinite(positions1)
+        assert found.sum() > 0.3 * found.size
+        assert np.isfinite(table.table[0][found]).all()
+        assert np.allclose(positions1[found], table.table[0][found])
+        assert np.allclose(positions2[found], table.table[1][found])
+
+        exact = rig.inverse_kinematics(pitch, roll)[0].reshape(pitch.shape)
+        assert np.array_equal(np.isnan(exact), np.isnan(table.table[0]))
+
+
+def test_lookup_table_max_error(rig_la):
+    table = rig_la.lookup_table(33, 33)
+    pitch = np.random.default_rng(0).uniform(*table.pitch_limits, 2000)
+    roll = np.random.default_rng(1).uniform(*table.roll_limits, 2000)
+
+    exact1, exact2 = rig_la.inverse_kinematics(pitch, roll)[:2]
+    for method in (BILINEAR, BICUBIC):
+        positions1, positions2 = table.interpolate(pitch, roll, method)
+        both = np.isfinite(positions1) & np.isfinite(exact1)
+        assert both.sum() > 500
+        assert np.max(np.abs(positions1 - exact1)[both]) <= table.max_error[0] * 1.01
+        assert np.max(np.abs(positions2 - exact2)[both]) <= table.max_error[1] * 1.01
+
+    # a finer table is closer
+    assert rig_la.lookup_table(65, 65).max_error[0] < table.max_error[0] / 2
+
+
+def test_lookup_table_position(rig_ctc):
+    table = rig_ctc.lookup_table(33, 33)
+    pitch = np.random.default_rng(0).uniform(*table.pitch_limits, 50)
+    roll = np.random.default_rng(1).uniform(*table.roll_limits, 50)
+
+    expected1, expected2 = table.interpolate(pitch, roll)
+    for i in range(50):
+        assert np.allclose(table.position(pitch[i], roll[i]), (expected1[i], expected2[i]), equal_nan=True)
+
+    assert np.allclose(table.position(table.pitches()[16], table.rolls()[16]), table.table[:, 16, 16])
+    assert np.isnan(table.position(table.pitch_limits[1] + 1, 0)).all()
+    assert np.isnan(table.interpolate([table.pitch_limits[0] - 1], [0])).all()
+
+
+def test_lookup_table_interpolate_method(rig_la):
+    table = rig_la.lookup_table(9, 9)
+
+    with pytest.raises(ValueError):
+        table.interpolate(0, 0, 'nearest')
+
+
+def test_lookup_table_save_and_load(rig_ctc, tmp_path):
+    table = rig_ctc.lookup_table(17, 17)
+    path = str(tmp_path / 'table.npz')
+
+    table.save(path)
+    loaded = LookupTable.load(path)
+
+    assert np.array_equal(loaded.table, table.table, equal_nan=True)
+    assert loaded.metadata == table.metadata
+    assert loaded.position(0, 0) == table.position(0, 0)
@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# seconds, about twice what they were measured to take, which was 0.61 to 0.69 s
+# to import main and 0.68 to 0.76 s to show the first window
+IMPORT_BUDGET = 1.25
+FIRST_WINDOW_BUDGET = 1.5
+
+HEAVY_MODULES = ('matplotlib', 'scipy')
+
+
+def run_python(code, tmp_path):
+    """
+    Runs code in a new interpreter, so nothing's already imported.
+
+    :param str code: Prints a JSON object as its last line.
+    :param tmp_path: A folder for the cache.
+    :return: The object.
+    """
+
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', XDG_CACHE_HOME=str(tmp_path))
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def imported(names):
+    return f'sorted({{m.split(".")[0] for m in sys.modules}} & {set(names)!r})'
+
+
+def test_rig_imports_without_qt(tmp_path):
+    result = run_python(f'import json, sys\n'
+                        f'import rig, sweep, cache\n'
+                        f'print(json.dumps({imported(HEAVY_MODULES + ("PySide6",))}))', tmp_path)
+
+    assert result == []
+
+
+def test_ctc_calculate_without_scipy(ctc_kwargs, tmp_path):
+    kwargs = {name: value.tolist() if isinstance(value, np.ndarray) else value
+              for name, value in dict(ctc_kwargs, i_pitch=10, i_roll=10).items()}
+
+    result = run_python(f'import json, sys\n'
+                        f'import numpy as np\n'
+                        f'from rig import Rig\n'
+                        f'kwargs = {kwargs!r}\n'
+                        f'rig = Rig(**{{name: np.array(value) if isinstance(value, list) else value\n'
+                        f'             for name, value in kwargs.items()}})\n'
+                        f'rig.calculate()\n'
+                        f'print(json.dumps({imported(HEAVY_MODULES)}))', tmp_path)
+
+    assert result == []
+
+
+def test_import_main_time(tmp_path):
+    pytest.importorskip('PySide6')
+
+    # the fastest of a few, so a busy machine doesn't fail it
+    times = []
+    for _ in range(3):
+        result = run_python(f'import json, sys, time\n'
+                            f'start = time.perf_counter()\n'
+                            f'import main\n'
+                            f'print(json.dumps([time.perf_counter() - start, {imported(HEAVY_MODULES)}]))', tmp_path)
+        times.append(result[0])
+        assert result[1] == []
+
+    assert min(times) < IMPORT_BUDGET
+
+
+def test_first_window_time(tmp_path):
+    pytest.importorskip('PySide6')
+
+    times = []
+    for _ in range(3):
+        result = run_python(f'import json, sys, time\n'
+                            f'start = time.perf_counter()\n'
+                            f'import main\n'
+                            f'import PySide6.QtWidgets as Widgets\n'
+                            f'app = Widgets.QApplication([])\n'
+                            f'window = main.CalcWindow()\n'
+                            f'window.show()\n'
+                            f'app.processEvents()\n'
+                            f'print(json.dumps([time.perf_counter() - start, {imported(HEAVY_MODULES)}]))', tmp_path)
+        times.append(result[0])
+        assert result[1] == []
+
+    assert min(times) < FIRST_WINDOW_BUDGET
+
+
+def test_resources_have_the_images():
+    pytest.importorskip('PySide6')
+    from PySide6.QtCore import QFile, QResource
+
+    import main
+
+    assert QResource.registerResource(main.RESOURCES)
+    try:
+        for name in ('whole_isometric', 'front_view', 'top_view'):
+            assert QFile.exists(f':/images/images/{name}.png')
+    finally:
+        QResource.unregisterResource(main.RESOURCES)
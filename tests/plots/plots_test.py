@@ -0,0 +1,51 @@
+import numpy as np
+
+from plots import PointIndex, ResultCanvas, ResultFigure
+from rig import RigResults
+
+
+def test_result_figure_update():
+    figure = ResultFigure('Pitch Torque', 'Roll Torque', 'Torque')
+
+    figure.update(np.array([0., 1.]), np.array([0., 2.]), np.array([1., 2.]), np.array([3., 4.]))
+    figure.update(np.array([-5., 0., 5.]), np.array([-1., 0., 1.]), np.array([10., np.nan, 30.]), np.array([1., 2., 3.]))
+    figure.canvas.draw()
+
+    upper, lower = figure.scatters
+    np.testing.assert_array_equal(upper.get_offsets(), [[-5., -1.], [0., 0.], [5., 1.]])
+    assert upper.get_clim() == (10., 30.)
+    assert lower.get_clim() == (1., 3.)
+    assert figure.colorbars[0].vmax == 30.
+    assert figure.axes[0].get_xlim()[0] <= -5 and figure.axes[0].get_xlim()[1] >= 5
+
+
+def make_results(roll, pitch):
+    results = RigResults(len(roll))
+    results.data[:] = np.arange(len(roll))
+    results.roll[:] = roll
+    results.pitch[:] = pitch
+    return results
+
+
+def test_point_index_nearest():
+    index = PointIndex(make_results([0., 1., np.nan, 5.], [0., 1., 0., 5.]))
+
+    assert index.nearest(0.9, 1.2) == 1
+    assert index.nearest(0., 0.1) == 0
+    assert index.nearest(10., 10.) == 3
+    assert index.describe(3).splitlines()[2] == 'Pitch torque: 3'
+
+
+def test_result_canvas_pick(qapp):
+    results = make_results([-5., 0., 5.], [-1., 0., 1.])
+    figure = ResultCanvas('Pitch Torque', 'Roll Torque', 'Torque')
+    figure.update(results.roll, results.pitch, results.pitch_torque, results.roll_torque)
+    figure.set_index(PointIndex(results))
+    figure.canvas.draw()
+
+    ax = figure.axes[1]
+    x, y = ax.transData.transform((5., 1.))
+
+    assert figure.pick(ax, x + 3, y - 3) == 2
+    assert figure.pick(ax, x + 50, y) is None
+    assert figure.pick(figure.colorbars[1].ax, x, y) is None
@@ -0,0 +1,95 @@
+import json
+import zipfile
+
+import numpy as np
+import pytest
+
+import project
+from rig import CTC, LINEAR, Rig
+
+
+def test_fields(project_info):
+    assert set(project.FIELDS) == set(project_info)
+
+
+def test_save_and_load(project_info, tmp_path):
+    path = str(tmp_path / 'design.mv')
+
+    project.save(path, project_info)
+    info = project.load(path)
+
+    assert zipfile.is_zipfile(path)
+    assert info['ctc_length'] == 2.5 and info['inputs_tab_index'] == 0
+    assert {name: project.field_text(value) for name, value in info.items()} == project_info
+    assert project.load_kinematics(path, {}) is None
+
+
+def test_load_migrates_old_projects(project_info, tmp_path):
+    path = str(tmp_path / 'old.mv')
+    project_info['ctc_length'] = '2.5.'
+    with open(path, 'w') as f:
+        f.write(json.dumps(project_info))
+
+    info = project.load(path)
+
+    assert info['motor_torque_ctc'] == 480. and info['outputs_tab_index'] == 0
+    assert info['ctc_length'] == '2.5.'
+    assert project.load_kinematics(path, {}) is None
+
+
+def test_load_newer_format(project_info, tmp_path):
+    path = str(tmp_path / 'new.mv')
+    with zipfile.ZipFile(path, 'w') as z:
+        z.writestr('project.json', json.dumps({'format_version': project.FORMAT_VERSION + 1}))
+
+    with pytest.raises(ValueError):
+        project.load(path)
+
+
+def test_saved_kinematics(project_info, tmp_path):
+    path = str(tmp_path / 'design.mv')
+    rig = Rig(**project.rig_kwargs(project_info), plot_steps=6)
+    rig.calculate()
+
+    project.save(path, project_info, rig)
+
+    same = Rig(**project.rig_kwargs(project.load(path)), plot_steps=6)
+    kinematics = project.load_kinematics(path, same.geometry)
+    same.calculate(kinematics=kinematics)
+    assert kinematics.shape == (7, 7)
+    assert kinematics.end_stop_angles == rig.kinematics.end_stop_angles
+    assert np.array_equal(same.results.data, rig.results.data, equal_nan=True)
+
+    project_info['ctc_length'] = '3'
+    other = Rig(**project.rig_kwargs(project_info), plot_steps=6)
+    assert project.load_kinematics(path, other.geometry) is None
+
+
+def test_rig_kwargs_ctc(project_info):
+    kwargs = project.rig_kwargs(project_info)
+
+    assert kwargs['drive'] == CTC
+    np.testing.assert_allclose(kwargs['rod_mount'], [23., 28., 8.5])
+    np.testing.assert_allclose(kwargs['lower_pivot'], [45.5, -8., 13.])
+    assert kwargs['ctc_total_rotation'] == 45.
+    assert kwargs['motor_torque'] == 480.
+    Rig(**kwargs)
+
+
+def test_rig_kwargs_linear(project_info):
+    project_info['inputs_tab_index'] = '1'
+
+    kwargs = project.rig_kwargs(project_info)
+
+    assert kwargs['drive'] == LINEAR
+    assert kwargs['linear_travel'] == 8.
+    assert kwargs['motor_torque'] == 0.4
+    assert 'ctc_length' not in kwargs
+    assert project.rig_kwargs(project_info, CTC)['drive'] == CTC
+
+
+def test_rig_kwargs_bad_field(project_info):
+    project_info['ctc_length'] = '2.5.'
+
+    with pytest.raises(ValueError):
+        project.rig_kwargs(project_info)
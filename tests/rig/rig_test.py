@@ -2,6 +2,8 @@ from unittest.mock import patch
 
 import numpy as np
 
+from rig import NUMERICAL, Rig
+
 
 def test_rig_ctc_init(rig_ctc_inputs):
     from rig import Rig
@@ -150,6 +152,7 @@ def test_numerical_derivative_2(rig_ctc_w_I_2):
 def test_calc_performance_ctc(rig_ctc_w_I, performance_info_ctc):
     pitch, roll, pitch_torque, roll_torque, pitch_omega, roll_omega = performance_info_ctc
 
+    rig_ctc_w_I.ratio_method = NUMERICAL
     rig_ctc_w_I._calc_performance()
     assert np.all(np.isclose(rig_ctc_w_I.pitch, pitch))
     assert np.all(np.isclose(rig_ctc_w_I.roll, roll))
@@ -162,6 +165,7 @@ def test_calc_performance_ctc(rig_ctc_w_I, performance_info_ctc):
 def test_calc_performance_linear(rig_la_w_I, performance_info_linear):
     pitch, roll, pitch_torque, roll_torque, pitch_omega, roll_omega = performance_info_linear
 
+    rig_la_w_I.ratio_method = NUMERICAL
     rig_la_w_I._calc_performance()
     assert np.all(np.isclose(rig_la_w_I.pitch, pitch))
     assert np.all(np.isclose(rig_la_w_I.roll, roll))
@@ -169,3 +173,425 @@ def test_calc_performance_linear(rig_la_w_I, performance_info_linear):
     assert np.all(np.isclose(rig_la_w_I.roll_torque, roll_torque))
     assert np.all(np.isclose(rig_la_w_I.pitch_omega, pitch_omega))
     assert np.all(np.isclose(rig_la_w_I.roll_omega, roll_omega))
+
+
+def test_calc_rod_mount_points_batch_matches_fsolve_ctc(rig_ctc_w_I):
+    positions1, positions2 = (a.ravel() for a in np.meshgrid(*rig_ctc_w_I._grid_positions(), indexing='ij'))
+    estimated_points = rig_ctc_w_I._get_starting_points()
+
+    rod_mounts1, rod_mounts2, converged = rig_ctc_w_I._calc_rod_mount_points_batch(positions1, positions2,
+                                                                                   estimated_points)
+
+    assert np.all(converged)
+    for position1, position2, rod_mount1, rod_mount2 in zip(positions1, positions2, rod_mounts1, rod_mounts2):
+        expected1, expected2 = rig_ctc_w_I._calc_rod_mount_points(position1, position2, (rod_mount1, rod_mount2))
+        assert np.all(np.isclose(expected1, rod_mount1, rtol=0, atol=1e-9))
+        assert np.all(np.isclose(expected2, rod_mount2, rtol=0, atol=1e-9))
+
+
+def test_calc_rod_mount_points_batch_matches_fsolve_la(rig_la_w_I, pushrod_lengths_w_mount_locations):
+    pushrod1, pushrod2, _, _ = pushrod_lengths_w_mount_locations
+
+    rm = rig_la_w_I.rod_mount
+    points = (np.array([rm[0], rm[1], rm[2]]), np.array([rm[0], rm[1], -rm[2]]))
+    expected1, expected2 = rig_la_w_I._calc_rod_mount_points(pushrod1, pushrod2, points)
+    rod_mounts1, rod_mounts2, converged = rig_la_w_I._calc_rod_mount_points_batch(pushrod1, pushrod2, points)
+
+    assert converged.shape == (1,)
+    assert np.all(converged)
+    assert np.all(np.isclose(expected1, rod_mounts1[0], rtol=0, atol=1e-9))
+    assert np.all(np.isclose(expected2, rod_mounts2[0], rtol=0, atol=1e-9))
+
+
+def test_implicit_derivative_matches_numerical(rig_ctc_w_I_2):
+    positions1, positions2 = (a.ravel() for a in np.meshgrid(*rig_ctc_w_I_2._grid_positions(), indexing='ij'))
+    rod_mounts1, rod_mounts2 = (a.reshape(-1, 3) for a in rig_ctc_w_I_2._solve_grid(*rig_ctc_w_I_2._grid_positions()))
+
+    pitch_ratio, roll_ratio = rig_ctc_w_I_2._implicit_derivative(positions1, positions2, rod_mounts1, rod_mounts2)
+
+    rig_ctc_w_I_2.delta = 1e-5
+    delta = rig_ctc_w_I_2.delta
+    expected_pitch_ratio, _ = rig_ctc_w_I_2._numerical_derivative(positions1 - delta, positions2 - delta,
+                                                                  positions1 + delta, positions2 + delta,
+                                                                  (rod_mounts1, rod_mounts2))
+    _, expected_roll_ratio = rig_ctc_w_I_2._numerical_derivative(positions1 - delta, positions2 + delta,
+                                                                 positions1 + delta, positions2 - delta,
+                                                                 (rod_mounts1, rod_mounts2))
+
+    assert np.all(np.isclose(pitch_ratio, expected_pitch_ratio, rtol=1e-7))
+    assert np.all(np.isclose(roll_ratio, expected_roll_ratio, rtol=1e-7))
+
+
+def test_calc_performance_implicit_close_to_numerical(rig_la_w_I, performance_info_linear):
+    _, _, pitch_torque, roll_torque, _, _ = performance_info_linear
+
+    rig_la_w_I._calc_performance()
+
+    assert np.all(np.isclose(rig_la_w_I.pitch_torque, pitch_torque, rtol=1e-4))
+    assert np.all(np.isclose(rig_la_w_I.roll_torque, roll_torque, rtol=1e-4))
+
+
+def test_calc_rod_mount_points_reduced_matches_batch_la(rig_la_w_I, pushrod_lengths_w_mount_locations):
+    pushrod1, pushrod2, rod_mount1, rod_mount2 = pushrod_lengths_w_mount_locations
+
+    rm = rig_la_w_I.rod_mount
+    points = (np.array([rm[0], rm[1], rm[2]]), np.array([rm[0], rm[1], -rm[2]]))
+    actual1, actual2, converged = rig_la_w_I._calc_rod_mount_points_reduced(pushrod1, pushrod2, points)
+    expected1, expected2, _ = rig_la_w_I._calc_rod_mount_points_batch(pushrod1, pushrod2, points)
+
+    assert np.all(converged)
+    assert np.all(np.isclose(actual1, expected1, rtol=0, atol=1e-9))
+    assert np.all(np.isclose(actual2, expected2, rtol=0, atol=1e-9))
+    assert np.all(np.isclose(actual1[0], rod_mount1, atol=1e-3))
+    assert np.all(np.isclose(actual2[0], rod_mount2, atol=1e-3))
+
+
+def test_calc_rod_mount_points_reduced_symmetric(rig_ctc_w_I):
+    rm = rig_ctc_w_I.rod_mount
+    points = (np.array([rm[0], rm[1], rm[2]]), np.array([rm[0], rm[1], -rm[2]]))
+    angles = np.radians([30., 45., 60.])
+
+    actual1, actual2, converged = rig_ctc_w_I._calc_rod_mount_points_reduced(angles, angles, points)
+    expected1, expected2, _ = rig_ctc_w_I._calc_rod_mount_points_batch(angles, angles, points)
+
+    assert np.all(converged)
+    assert np.all(np.isclose(actual1, expected1, rtol=0, atol=1e-9))
+    assert np.all(np.isclose(actual2, expected2, rtol=0, atol=1e-9))
+    assert np.all(np.isclose(actual1[:, 2], rm[2]))
+    assert np.all(np.isclose(actual1[:, :2], actual2[:, :2]))
+
+
+def test_solve_rod_mount_points_falls_back(rig_ctc_w_I, ctc_angles_w_rod_mount_locations):
+    ctc_angle1, ctc_angle2, expected_point1, expected_point2 = ctc_angles_w_rod_mount_locations
+
+    rm = rig_ctc_w_I.rod_mount
+    points = (np.array([rm[0], rm[1], rm[2]]), np.array([rm[0], rm[1], -rm[2]]))
+    failed = (np.zeros((1, 3)), np.zeros((1, 3)), np.array([False]))
+    with patch.object(rig_ctc_w_I, '_calc_rod_mount_points_reduced', return_value=failed):
+        actual_point1, actual_point2, converged = rig_ctc_w_I._solve_rod_mount_points(ctc_angle1, ctc_angle2, points)
+
+    assert np.all(converged)
+    assert np.all(np.isclose(expected_point1, actual_point1[0], atol=1e-3))
+    assert np.all(np.isclose(expected_point2, actual_point2[0], atol=1e-3))
+
+
+def test_calc_performance_plot_steps(rig_ctc_w_I, rig_ctc_inputs):
+    from rig import Rig
+
+    (rod_mount, motor_point,
+     motor_angle, motor_torque, motor_rpm,
+     ctc_length, ctc_rest_angle, ctc_total_rotation,
+     drive) = rig_ctc_inputs
+
+    coarse_rig = Rig(rod_mount, motor_point,
+                     motor_angle=motor_angle, motor_torque=motor_torque, motor_rpm=motor_rpm,
+                     ctc_length=ctc_length, ctc_neutral_angle=ctc_rest_angle, ctc_total_rotation=ctc_total_rotation,
+                     drive=drive, plot_steps=8)
+
+    coarse_rig._calc_performance()
+    rig_ctc_w_I._calc_performance()
+
+    assert len(coarse_rig.pitch) == 9 * 9
+    fine_pitch_torque = np.reshape(rig_ctc_w_I.pitch_torque, (17, 17))[::2, ::2]
+    assert np.all(np.isclose(np.reshape(coarse_rig.pitch_torque, (9, 9)), fine_pitch_torque))
+
+
+def test_calc_performance_adaptive(rig_la_w_I):
+    rig_la_w_I.plot_steps = 4
+    rig_la_w_I.grid_spacing = rig_la_w_I.linear_travel / 4
+    rig_la_w_I.adaptive = True
+    rig_la_w_I.max_points = 200
+
+    rig_la_w_I._calc_performance()
+
+    assert 25 < len(rig_la_w_I.pitch) <= 200
+    assert np.all(np.isfinite(rig_la_w_I.pitch_torque))
+    assert rig_la_w_I.pitch_roll_ratio > 0
+
+    positions1, positions2, rod_mounts1, rod_mounts2, _, _ = rig_la_w_I._solve_adaptive()
+    residuals = rig_la_w_I._calc_residuals(positions1, positions2, rod_mounts1, rod_mounts2)
+    assert len(set(zip(positions1, positions2))) == len(positions1)
+    assert np.all(residuals < 1e-9)
+
+
+def test_calc_performance_adaptive_parallel_matches_serial(rig_la_w_I):
+    rig_la_w_I.plot_steps = 4
+    rig_la_w_I.grid_spacing = rig_la_w_I.linear_travel / 4
+    rig_la_w_I.adaptive = True
+    rig_la_w_I.max_points = 200
+
+    rig_la_w_I._calc_performance()
+    expected = rig_la_w_I.results.data.copy()
+
+    rig_la_w_I.workers = 3
+    rig_la_w_I._calc_performance()
+
+    assert rig_la_w_I.results.data.shape == expected.shape
+    assert np.allclose(rig_la_w_I.results.data, expected, rtol=1e-9, equal_nan=True)
+
+
+def test_rig_results_fields_and_grid(rig_ctc_w_I):
+    from rig import RigResults
+
+    rig_ctc_w_I._calc_performance()
+    results = rig_ctc_w_I.results
+
+    assert isinstance(results, RigResults)
+    assert len(results) == 17 * 17
+    assert results.data.flags['C_CONTIGUOUS']
+    assert np.shares_memory(rig_ctc_w_I.pitch, results.data)
+    assert results['pitch_torque'] is results.pitch_torque
+    assert results.grid('roll').shape == (17, 17)
+    assert np.all(results.grid('pitch_omega')[1] == results.pitch_omega[17:34])
+    assert rig_ctc_w_I.max_pushrod_force == results.pushrod_force.max()
+
+
+def test_rig_results_not_grid():
+    from rig import RigResults
+    import pytest
+
+    results = RigResults(5)
+
+    with pytest.raises(ValueError):
+        results.grid('pitch')
+    with pytest.raises(KeyError):
+        results['data']
+
+
+def test_update_drive_rescales_without_solving(rig_ctc_w_I, rig_ctc_inputs):
+    from rig import Rig
+
+    (rod_mount, motor_point,
+     motor_angle, motor_torque, motor_rpm,
+     ctc_length, ctc_rest_angle, ctc_total_rotation,
+     drive) = rig_ctc_inputs
+
+    expected = Rig(rod_mount, motor_point,
+                   motor_angle=motor_angle, motor_torque=2 * motor_torque, motor_rpm=motor_rpm / 2,
+                   ctc_length=ctc_length, ctc_neutral_angle=ctc_rest_angle, ctc_total_rotation=ctc_total_rotation,
+                   i_pitch=10, i_roll=5, drive=drive)
+    expected.calculate()
+
+    rig_ctc_w_I.calculate()
+    assert rig_ctc_w_I.max_pitch_speed == -1
+    assert rig_ctc_w_I.geometry == expected.geometry
+
+    with patch.object(rig_ctc_w_I, '_calc_kinematics') as calc_kinematics:
+        rig_ctc_w_I.update_drive(motor_torque=2 * motor_torque, motor_rpm=motor_rpm / 2, i_pitch=10, i_roll=5)
+    calc_kinematics.assert_not_called()
+
+    assert np.all(np.isclose(rig_ctc_w_I.results.data, expected.results.data))
+    assert np.isclose(rig_ctc_w_I.max_pushrod_force, expected.max_pushrod_force)
+    assert np.isclose(rig_ctc_w_I.max_pitch_speed, expected.max_pitch_speed)
+    assert np.isclose(rig_ctc_w_I.pitch_roll_ratio, expected.pitch_roll_ratio)
+
+
+def test_calculate_with_kinematics_skips_end_stops(rig_ctc_w_I, rig_ctc_inputs):
+    (rod_mount, motor_point,
+     motor_angle, motor_torque, motor_rpm,
+     ctc_length, ctc_rest_angle, ctc_total_rotation,
+     drive) = rig_ctc_inputs
+
+    rig_ctc_w_I.calculate()
+    assert rig_ctc_w_I.kinematics.end_stop_angles == (rig_ctc_w_I.max_ctc_pushrod_angle,
+                                                      rig_ctc_w_I.min_ctc_pushrod_angle)
+
+    rig = Rig(rod_mount, motor_point,
+              motor_angle=motor_angle, motor_torque=2 * motor_torque, motor_rpm=motor_rpm,
+              ctc_length=ctc_length, ctc_neutral_angle=ctc_rest_angle, ctc_total_rotation=ctc_total_rotation,
+              drive=drive)
+    with patch.object(rig, '_calc_symmetric_pitch') as calc_symmetric_pitch:
+        rig.calculate(kinematics=rig_ctc_w_I.kinematics)
+    calc_symmetric_pitch.assert_not_called()
+
+    assert rig.max_ctc_pushrod_angle == rig_ctc_w_I.max_ctc_pushrod_angle
+    assert rig.min_ctc_pushrod_angle == rig_ctc_w_I.min_ctc_pushrod_angle
+
+
+def test_calc_performance_parallel_matches_serial(rig_la_w_I):
+    rig_la_w_I._calc_performance()
+    expected = rig_la_w_I.results.data.copy()
+
+    rig_la_w_I.workers = 3
+    rig_la_w_I._calc_performance()
+
+    assert rig_la_w_I.results.shape == (17, 17)
+    assert np.array_equal(rig_la_w_I.results.data, expected, equal_nan=True)
+
+
+def test_rod_mount_memo_bounded():
+    from rig import RodMountMemo
+
+    memo = RodMountMemo(max_size=2)
+    keys = memo.keys('rig', np.array([0., 1., 2.]), np.array([0., 0., 0.]))
+    memo.store(keys[:2], np.zeros((2, 3)), np.ones((2, 3)))
+    memo.lookup(keys[:1], np.empty((1, 3)), np.empty((1, 3)))
+    memo.store(keys[2:], np.zeros((1, 3)), np.ones((1, 3)))
+
+    missing = memo.lookup(keys, np.empty((3, 3)), np.empty((3, 3)))
+
+    assert missing.tolist() == [1]
+    assert memo.stats() == {'hits': 3, 'misses': 1, 'size': 2}
+
+
+def test_calc_performance_memoized(rig_ctc_w_I):
+    from rig import ROD_MOUNT_MEMO
+
+    ROD_MOUNT_MEMO.clear()
+    rig_ctc_w_I.memoize = False
+    rig_ctc_w_I._calc_performance()
+    expected = rig_ctc_w_I.results.data.copy()
+    assert len(ROD_MOUNT_MEMO) == 0
+
+    rig_ctc_w_I.memoize = True
+    rig_ctc_w_I._calc_performance()
+    misses = ROD_MOUNT_MEMO.misses
+    assert np.allclose(rig_ctc_w_I.results.data, expected, rtol=1e-9, equal_nan=True)
+    expected = rig_ctc_w_I.results.data.copy()
+
+    rig_ctc_w_I._calc_performance()
+    assert ROD_MOUNT_MEMO.misses == misses
+    assert ROD_MOUNT_MEMO.hits >= len(rig_ctc_w_I.results)
+    assert np.array_equal(rig_ctc_w_I.results.data, expected, equal_nan=True)
+
+
+def test_memo_hits_when_an_edit_is_undone(rig_ctc_inputs):
+    from rig import ROD_MOUNT_MEMO
+
+    (rod_mount, motor_point,
+     motor_angle, motor_torque, motor_rpm,
+     ctc_length, ctc_rest_angle, ctc_total_rotation,
+     drive) = rig_ctc_inputs
+
+    def make_rig(ctc_length):
+        return Rig(rod_mount, motor_point,
+                   motor_angle=motor_angle, motor_torque=motor_torque, motor_rpm=motor_rpm,
+                   ctc_length=ctc_length, ctc_neutral_angle=ctc_rest_angle, ctc_total_rotation=ctc_total_rotation,
+                   drive=drive, memoize=True)
+
+    ROD_MOUNT_MEMO.clear()
+    make_rig(ctc_length).calculate()
+    make_rig(ctc_length + 0.1).calculate()
+    stats = ROD_MOUNT_MEMO.stats()
+
+    rig = make_rig(ctc_length)
+    rig.calculate()
+
+    assert ROD_MOUNT_MEMO.misses == stats['misses']
+    assert ROD_MOUNT_MEMO.hits - stats['hits'] >= len(rig.results)
+    assert ROD_MOUNT_MEMO.stats()['size'] <= ROD_MOUNT_MEMO.max_size
+
+
+def test_memo_separates_neutral_angles(rig_ctc_inputs):
+    from rig import ROD_MOUNT_MEMO
+
+    (rod_mount, motor_point,
+     motor_angle, motor_torque, motor_rpm,
+     ctc_length, _, ctc_total_rotation,
+     drive) = rig_ctc_inputs
+
+    def make_rig(neutral_angle, memoize):
+        return Rig(rod_mount, motor_point,
+                   motor_angle=motor_angle, motor_torque=motor_torque, motor_rpm=motor_rpm,
+                   ctc_length=ctc_length, ctc_neutral_angle=neutral_angle, ctc_total_rotation=ctc_total_rotation,
+                   drive=drive, memoize=memoize)
+
+    # the grids overlap, so the second rig looks up points the first one solved
+    expected = make_rig(50.625, False)
+    expected.calculate()
+
+    ROD_MOUNT_MEMO.clear()
+    make_rig(45, True).calculate()
+    rig = make_rig(50.625, True)
+    rig.calculate()
+
+    assert np.allclose(rig.results.data, expected.results.data, rtol=1e-9, equal_nan=True)
+    residuals = rig._calc_residuals(rig.kinematics.positions1, rig.kinematics.positions2,
+                                    rig.kinematics.rod_mounts1, rig.kinematics.rod_mounts2)
+    assert np.max(residuals) < 1e-9 * rig.rod_mount_length ** 2
+
+
+def test_calculate_progressive(rig_la_w_I, rig_ctc_w_I):
+    for rig in (rig_la_w_I, rig_ctc_w_I):
+        rig.calculate()
+        expected = rig.results.data.copy()
+        expected_force = rig.max_pushrod_force
+
+        sizes = []
+        for steps in rig.calculate_progressive():
+            assert len(rig.results) == (steps + 1) ** 2
+            assert rig.results.shape == (steps + 1, steps + 1)
+            sizes.append(steps)
+
+        assert sizes == [4, 8, rig.plot_steps]
+        assert rig.progress is None
+        assert np.allclose(rig.results.data, expected, rtol=1e-6, equal_nan=True)
+        assert np.isclose(rig.max_pushrod_force, expected_force)
+
+
+def test_calculate_progressive_from_coarse(rig_ctc_w_I, rig_ctc_inputs):
+    (rod_mount, motor_point,
+     motor_angle, motor_torque, motor_rpm,
+     ctc_length, ctc_rest_angle, ctc_total_rotation,
+     drive) = rig_ctc_inputs
+
+    preview = Rig(rod_mount, motor_point,
+                  motor_angle=motor_angle, motor_torque=motor_torque, motor_rpm=motor_rpm,
+                  ctc_length=ctc_length, ctc_neutral_angle=ctc_rest_angle, ctc_total_rotation=ctc_total_rotation,
+                  drive=drive, plot_steps=4)
+    preview.calculate()
+    rig_ctc_w_I.calculate()
+    expected = rig_ctc_w_I.results.data.copy()
+
+    with patch.object(rig_ctc_w_I, '_solve_grid') as solve_grid:
+        sizes = list(rig_ctc_w_I.calculate_progressive(coarse=preview.kinematics))
+    solve_grid.assert_not_called()
+
+    assert sizes == [8, rig_ctc_w_I.plot_steps]
+    assert np.allclose(rig_ctc_w_I.results.data, expected, rtol=1e-6, equal_nan=True)
+
+
+def test_calculate_progressive_parallel_matches_serial(rig_ctc_w_I):
+    list(rig_ctc_w_I.calculate_progressive())
+    expected = rig_ctc_w_I.results.data.copy()
+
+    rig_ctc_w_I.workers = 3
+    sizes = list(rig_ctc_w_I.calculate_progressive())
+
+    assert sizes == [4, 8, rig_ctc_w_I.plot_steps]
+    assert np.array_equal(rig_ctc_w_I.results.data, expected, equal_nan=True)
+
+
+def test_inverse_kinematics_round_trip(rig_la_w_I, rig_ctc_w_I):
+    for rig in (rig_la_w_I, rig_ctc_w_I):
+        rig.calculate()
+        kinematics = rig.kinematics
+
+        positions1, positions2, torques1, torques2, reachable = rig.inverse_kinematics(rig.pitch, rig.roll)
+
+        assert reachable.all()
+        assert np.allclose(positions1, kinematics.positions1, atol=1e-9)
+        assert np.allclose(positions2, kinematics.positions2, atol=1e-9)
+        assert np.allclose(torques1, 0) and np.allclose(torques2, 0)
+
+
+def test_inverse_kinematics_torques(rig_la_w_I, rig_ctc_w_I):
+    for rig in (rig_la_w_I, rig_ctc_w_I):
+        rig.calculate()
+        # the neutral point, where the forward solve has both motors giving motor_torque
+        neutral = np.flatnonzero(np.isclose(rig.pitch, 0) & np.isclose(rig.roll, 0))
+
+        _, _, torques1, torques2, _ = rig.inverse_kinematics(rig.pitch[neutral], rig.roll[neutral],
+                                                              rig.pitch_torque[neutral], 0)
+
+        assert np.allclose(torques1, rig.motor_torque)
+        assert np.allclose(torques2, rig.motor_torque)
+
+
+def test_inverse_kinematics_unreachable(rig_la_w_I, rig_ctc_w_I):
+    for rig in (rig_la_w_I, rig_ctc_w_I):
+        positions1, positions2, torques1, torques2, reachable = rig.inverse_kinematics([0, 80], [0, 0], 1, 1)
+
+        assert reachable.tolist() == [True, False]
+        assert np.isfinite([positions1[0], positions2[0], torques1[0], torques2[0]]).all()
+        assert np.isnan([positions1[1], positions2[1], torques1[1], torques2[1]]).all()
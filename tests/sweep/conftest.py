@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture
+def sweep_base(ctc_kwargs):
+    return dict(ctc_kwargs, plot_steps=6)
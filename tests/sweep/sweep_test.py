@@ -0,0 +1,84 @@
+import csv
+
+import numpy as np
+import pytest
+
+from sweep import GRID, LATIN_HYPERCUBE, SUMMARY_FIELDS, latin_hypercube_samples, make_rig, sweep
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_latin_hypercube_samples():
+    ranges = {'ctc_length': (2., 3.), 'rod_mount_z': (6., 10.)}
+
+    designs = latin_hypercube_samples(ranges, 8, seed=3)
+
+    assert len(designs) == 8
+    for name, (low, high) in ranges.items():
+        bins = sorted(int((d[name] - low) / (high - low) * 8) for d in designs)
+        assert bins == list(range(8))
+    assert designs == latin_hypercube_samples(ranges, 8, seed=3)
+
+
+def test_make_rig(sweep_base):
+    rig = make_rig(sweep_base, {'rod_mount_z': 9., 'ctc_length': 3.})
+
+    np.testing.assert_allclose(rig.rod_mount, [23., 28., 9.])
+    assert rig.ctc_length == 3.
+    assert sweep_base['rod_mount'][2] == 8.5
+
+
+def test_sweep(sweep_base, tmp_path):
+    path = str(tmp_path / 'sweep.csv')
+
+    evaluated = sweep(sweep_base, {'ctc_length': (2., 3.), 'rod_mount_z': (7., 9.)}, 2,
+                      method=GRID, path=path, workers=1)
+
+    rows = read_rows(path)
+    assert evaluated == 4
+    assert [int(row['design']) for row in rows] == [0, 1, 2, 3]
+    assert all(row['error'] == '' for row in rows)
+    for row in rows:
+        rig = make_rig(sweep_base, {'ctc_length': float(row['ctc_length']),
+                                    'rod_mount_z': float(row['rod_mount_z'])})
+        rig.calculate()
+        for field, value in rig.summary().items():
+            assert float(row[field]) == pytest.approx(value)
+
+
+def test_sweep_failed_design(sweep_base, tmp_path):
+    path = str(tmp_path / 'sweep.csv')
+
+    sweep(sweep_base, {'ctc_total_rotation': (0., 0.)}, 1, method=GRID, path=path, workers=1)
+
+    row = read_rows(path)[0]
+    assert row['error'] != ''
+    assert all(np.isnan(float(row[field])) for field in SUMMARY_FIELDS)
+
+
+def test_sweep_resume(sweep_base, tmp_path):
+    path = str(tmp_path / 'sweep.csv')
+    ranges = {'ctc_length': (2., 3.)}
+    sweep(sweep_base, ranges, 4, method=LATIN_HYPERCUBE, path=path, workers=1)
+    complete = read_rows(path)
+
+    with open(path) as f:
+        lines = f.readlines()
+    with open(path, 'w') as f:
+        f.writelines(lines[:3] + [lines[3][:10]])
+
+    evaluated = sweep(sweep_base, ranges, 4, method=LATIN_HYPERCUBE, path=path, workers=1)
+
+    assert evaluated == 2
+    assert read_rows(path) == complete
+
+
+def test_sweep_resume_different_parameters(sweep_base, tmp_path):
+    path = str(tmp_path / 'sweep.csv')
+    sweep(sweep_base, {'ctc_length': (2., 3.)}, 2, path=path, workers=1)
+
+    with pytest.raises(ValueError):
+        sweep(sweep_base, {'motor_angle': (0., 10.)}, 2, path=path, workers=1)
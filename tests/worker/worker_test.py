@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+pytest.importorskip('PySide6')
+
+from rig import Rig
+from worker import CalculationWorker
+
+
+def run(worker):
+    emitted = {'progress': [], 'partial': [], 'finished': [], 'failed': []}
+    for name, calls in emitted.items():
+        getattr(worker.signals, name).connect(lambda *args, calls=calls: calls.append(args))
+    worker.run()
+    return emitted
+
+
+def test_worker_finishes(make_ctc_rig):
+    rig = make_ctc_rig()
+
+    emitted = run(CalculationWorker(3, rig))
+
+    assert emitted['finished'] == [(3, rig)]
+    assert emitted['failed'] == []
+    fractions = [fraction for _, fraction in emitted['progress']]
+    assert fractions == sorted(fractions) and fractions[-1] == 1
+    assert rig.progress is None
+
+
+def test_worker_emits_partial_results(make_ctc_rig):
+    rig = make_ctc_rig()
+
+    emitted = run(CalculationWorker(4, rig))
+
+    assert [run_id for run_id, _ in emitted['partial']] == [4]
+    assert [len(partial.results) for _, partial in emitted['partial']] == [5 * 5]
+    assert emitted['partial'][0][1] is not rig
+    assert emitted['partial'][0][1].geometry != rig.geometry
+    assert len(rig.results) == (rig.plot_steps + 1) ** 2
+
+
+def test_worker_reuses_previous_kinematics(make_ctc_rig):
+    previous = make_ctc_rig()
+    previous.calculate()
+    rig = make_ctc_rig(motor_torque=1)
+
+    expected = previous.results.data.copy()
+
+    with patch.object(Rig, 'calculate') as calculate:
+        emitted = run(CalculationWorker(1, rig, previous=previous))
+    calculate.assert_not_called()
+
+    assert emitted['partial'] == []
+    [(_, finished)] = emitted['finished']
+    assert finished is not previous
+    assert finished.kinematics is previous.kinematics
+    assert finished.motor_torque == 1
+    assert np.allclose(finished.pitch_torque * 40 * 12, previous.pitch_torque)
+    assert np.array_equal(previous.results.data, expected, equal_nan=True)
+    assert finished.max_ctc_pushrod_angle == previous.max_ctc_pushrod_angle
+
+
+def test_worker_starts_from_a_preview(make_ctc_rig):
+    preview = make_ctc_rig(plot_steps=2)
+    preview.calculate()
+    rig = make_ctc_rig()
+
+    with patch.object(Rig, '_solve_grid') as solve_grid:
+        emitted = run(CalculationWorker(1, rig, previous=preview))
+    solve_grid.assert_not_called()
+
+    assert [len(partial.results) for _, partial in emitted['partial']] == [5 * 5]
+    assert emitted['finished'] == [(1, rig)]
+    assert len(rig.results) == (rig.plot_steps + 1) ** 2
+
+
+def test_worker_cancelled(make_ctc_rig):
+    worker = CalculationWorker(1, make_ctc_rig())
+    worker.cancel()
+
+    emitted = run(worker)
+
+    assert emitted == {'progress': [], 'partial': [], 'finished': [], 'failed': []}
+
+
+def test_worker_failed(make_ctc_rig):
+    rig = make_ctc_rig()
+    rig.drive = 'neither'
+
+    emitted = run(CalculationWorker(2, rig))
+
+    assert emitted['finished'] == []
+    assert emitted['failed'][0][0] == 2
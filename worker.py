@@ -0,0 +1,121 @@
+"""
+Solves Rigs on a QThreadPool so the window stays responsive.
+"""
+
+import copy
+import threading
+import traceback
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from rig import DRIVE_VALUES
+
+
+class Cancelled(Exception):
+    """
+    Raised inside a cancelled calculation to stop it.
+    """
+
+
+class CalculationSignals(QObject):
+    # each signal carries the id of the run it's from, so results of stale runs can be ignored
+    progress = Signal(int, float)
+    partial = Signal(int, object)
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+
+class CalculationWorker(QRunnable):
+    def __init__(self, run_id, rig, previous=None):
+        """
+        :param int run_id: Identifies the run in the signals it emits.
+        :param Rig rig: The Rig to solve.
+        :param Rig previous: The last solved Rig. If its geometry is the same,
+        a copy of it with rig's drive values is emitted instead, which only
+        rescales its kinematics. Otherwise the Rig is solved coarse to fine and
+        a copy of it is emitted by partial after each grid but the last. If
+        the previous Rig only had fewer steps, such as a live preview, the
+        solve starts from its grid.
+        """
+
+        super().__init__()
+        self.run_id = run_id
+        self.rig = rig
+        self.previous = previous
+        self.signals = CalculationSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """
+        Stops the calculation the next time it reports progress. Nothing is
+        emitted after that.
+
+        :return: None
+        """
+
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def _progress(self, fraction):
+        if self._cancelled.is_set():
+            raise Cancelled()
+        self.signals.progress.emit(self.run_id, fraction)
+
+    def _snapshot(self, steps):
+        """
+        Copies the rig part way through a coarse to fine solve.
+
+        The rig's results are replaced, not changed in place, by the next grid,
+        so a shallow copy is safe to read from another thread. Its geometry is
+        that of the coarse grid, so it's never mistaken for the finished rig.
+
+        :param int steps: The steps of the grid that was just solved.
+        :return: The copy.
+        """
+
+        rig = copy.copy(self.rig)
+        rig.plot_steps = steps
+        rig.geometry = dict(rig.geometry, plot_steps=steps)
+        return rig
+
+    def _coarse_kinematics(self):
+        """
+        :return: The previous rig's kinematics if they're of the same geometry
+        with fewer steps, otherwise None.
+        """
+
+        if self.previous is None or self.previous.plot_steps >= self.rig.plot_steps:
+            return None
+
+        if dict(self.previous.geometry, plot_steps=self.rig.plot_steps) != self.rig.geometry:
+            return None
+
+        return getattr(self.previous, 'kinematics', None)
+
+    def run(self):
+        rescale = (self.previous is not None and self.previous.geometry == self.rig.geometry
+                   and getattr(self.previous, 'kinematics', None) is not None)
+
+        try:
+            if rescale:
+                # the previous rig's results are replaced, not changed in place, so it's still safe to read
+                rig = copy.copy(self.previous)
+                rig.update_drive(**{name: getattr(self.rig, name) for name in DRIVE_VALUES})
+                self.rig = rig
+                self._progress(1)
+            else:
+                for steps in self.rig.calculate_progressive(progress=self._progress,
+                                                            coarse=self._coarse_kinematics()):
+                    if steps < self.rig.plot_steps and not self._cancelled.is_set():
+                        self.signals.partial.emit(self.run_id, self._snapshot(steps))
+        except Cancelled:
+            return
+        except Exception:
+            if not self._cancelled.is_set():
+                self.signals.failed.emit(self.run_id, traceback.format_exc())
+            return
+
+        if not self._cancelled.is_set():
+            self.signals.finished.emit(self.run_id, self.rig)